@@ -0,0 +1,162 @@
+#!/usr/bin python3
+# benchmark.py
+# MR-Spagetty
+
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import clavis_mortis  # noqa: E402
+from level_generator import LevelGenerator, StandInGame  # noqa: E402
+
+# the number of random inputs replayed on each level
+REPLAY_INPUTS = 5000
+# the number of fixed timesteps the guards are run for
+GUARD_TICKS = 10 * clavis_mortis.TICK_RATE
+
+
+def timed(function: "function", *args) -> tuple[float, object]:
+    """runs a function and times how long it took
+
+    Args:
+        function (function): the function to run
+
+    Returns:
+        tuple: the time taken in seconds and what the function returned
+    """
+    started = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - started, result
+
+
+def bench_level(
+    folder: str, size: int, layers: int, seed: int, guards: int
+        ) -> dict:
+    """generates a level and measures loading it
+
+    Args:
+        folder (str): the folder to write the level to
+        size (int): the width and height of each layer
+        layers (int): the number of layers
+        seed (int): the seed of the level
+        guards (int): the number of guards wandering the level, small levels
+        fit fewer
+
+    Returns:
+        dict: the measurements
+    """
+    path = os.path.join(folder, f"bench_{size}_{layers}.json")
+    generator = LevelGenerator(
+        seed, size, size, layers, locks=layers // 2, guards=guards
+        )
+    generate_time, _ = timed(generator.save, path)
+
+    load_time, level = timed(clavis_mortis.Level, StandInGame(), path)
+    # measuring memory separately as tracing slows the load down a lot
+    del level
+    tracemalloc.start()
+    level = clavis_mortis.Level(StandInGame(), path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # switching between two levels that are both cached
+    manager = clavis_mortis.LevelManager()
+    manager.build("bench:big", clavis_mortis.LevelFile(path))
+    manager.build("bench:demo", clavis_mortis.LevelFile(
+        clavis_mortis.Level.get_path("cm:demo")
+        ))
+    switches = 1000
+    switch_time, _ = timed(lambda: [
+        manager.get(level_id) for _ in range(switches // 2)
+        for level_id in ("bench:big", "bench:demo")
+        ])
+
+    # taking and restoring a snapshot like an autosave would
+    game = clavis_mortis.Game(clavis_mortis.QMainWindow(), True)
+    game.levels = manager
+    game.load_level("bench:big")
+    snapshot_time, data = timed(lambda: game.snapshot().to_bytes())
+    restore_time, _ = timed(
+        game.restore, clavis_mortis.Snapshot.from_bytes(data)
+        )
+
+    # recording a random walk and replaying it as fast as possible
+    game = clavis_mortis.Game(
+        clavis_mortis.QMainWindow(), True, seed, headless=True
+        )
+    game.levels.build("bench:big", clavis_mortis.LevelFile(path))
+    game.recording = None
+    game.load_level("bench:big")
+    walk = random.Random(seed)
+    directions = (game.UP, game.DOWN, game.LEFT, game.RIGHT)
+    for _ in range(REPLAY_INPUTS):
+        game.move_player(walk.choice(directions))
+    replay = clavis_mortis.Replay(game.recording)
+    replayed = clavis_mortis.Game(
+        clavis_mortis.QMainWindow(), True, seed, headless=True
+        )
+    replayed.levels.build("bench:big", clavis_mortis.LevelFile(path))
+    replay_time, _ = timed(replay.run_headless, replayed)
+
+    # running the guards on their own, a tick has to fit in a frame
+    tick_time, _ = timed(
+        replayed.advance, replayed.entity_tick + GUARD_TICKS
+        )
+
+    # drawing the minimap of the first layer from scratch
+    minimap = clavis_mortis.Minimap(replayed)
+    minimap.refresh()
+    minimap_time, _ = timed(minimap.layer_image, next(iter(level.layers)))
+    return {
+        "level": f"{size}x{size}x{layers}",
+        "file MB": os.path.getsize(path) / 2**20,
+        "generate s": generate_time,
+        "load s": load_time,
+        "load peak MB": peak / 2**20,
+        "switch us": switch_time / switches * 10**6,
+        "save+load ms": (snapshot_time + restore_time) * 1000,
+        "input us": replay_time / REPLAY_INPUTS * 10**6,
+        "minimap ms": minimap_time * 1000,
+        "guards": len(replayed.entities),
+        "tick us": tick_time / GUARD_TICKS * 10**6,
+        "tiles": sum(width * height for width, height in level.sizes.values())
+    }
+
+
+def report(results: list[dict]):
+    """prints the measurements as a table
+
+    Args:
+        results (list): the measurements of each benchmark run
+    """
+    headings = list(results[0])
+    print("  ".join(f"{heading:>12}" for heading in headings))
+    for result in results:
+        print("  ".join(
+            f"{value:>12.3f}" if isinstance(value, float) else f"{value:>12}"
+            for value in result.values()
+            ))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="measures how long it takes to load generated levels"
+        )
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[16, 64, 256]
+        )
+    parser.add_argument("--layers", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--guards", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        report([
+            bench_level(folder, size, args.layers, args.seed, args.guards)
+            for size in args.sizes
+            ])
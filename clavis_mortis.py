@@ -6,11 +6,17 @@ try:
     from PySide6.QtWidgets import (
         QApplication, QMainWindow, QWidget,
         QSizePolicy, QGridLayout, QPushButton,
-        QTabWidget, QLabel, QDialog, QLineEdit,
-        QVBoxLayout, QHBoxLayout, QMessageBox
+        QTabWidget, QLabel, QLineEdit,
+        QVBoxLayout, QHBoxLayout, QListWidget, QListWidgetItem,
+        QComboBox, QSpinBox, QCheckBox
+    )
+    from PySide6.QtGui import (
+        QIcon, QPixmap, QScreen, QShortcut, QImage, QPainter, QColor
+    )
+    from PySide6.QtCore import (
+        Qt, QSize, QSizeF, QRect, QTimer, QElapsedTimer, QFileSystemWatcher,
+        QSaveFile, QIODevice
     )
-    from PySide6.QtGui import QIcon, QPixmap, QScreen, QShortcut
-    from PySide6.QtCore import Qt, QSize, QSizeF, QRect
 except ImportError as qt_er:
     raise ImportError("'PySide6' is required to run this game.") from qt_er
 
@@ -19,11 +25,38 @@ try:
 except ImportError as json_er:
     raise ImportError("'json' is required to run this game.") from json_er
 
+try:
+    import argparse
+except ImportError as args_er:
+    raise ImportError("'argparse' is required to run this game.") from args_er
+
 try:
     import random
 except ImportError as rand_er:
     raise ImportError("'random' is required to run this game.") from rand_er
 
+try:
+    from array import array
+except ImportError as array_er:
+    raise ImportError("'array' is required to run this game.") from array_er
+
+try:
+    import hashlib
+    import struct
+    from operator import getitem, mul
+except ImportError as save_er:
+    raise ImportError(
+        "'hashlib', 'struct' and 'operator' are required to run this game."
+        ) from save_er
+
+try:
+    from collections import OrderedDict, deque
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError as std_er:
+    raise ImportError(
+        "'collections' and 'concurrent' are required to run this game."
+        ) from std_er
+
 try:
     import os
     import sys
@@ -54,9 +87,36 @@ if sys.version_info < (3, 10, 0):
 # the maximum size of the display grid so i don't have to repeat it
 global MAX_SIZE
 MAX_SIZE = 16
+# the most pixels across the minimap of a layer, bigger layers are shrunk
+MINIMAP_SIZE = 256
+# the time between steps in ms when the player walks to a tile clicked on
+WALK_STEP = 60
+# how many tiles away the player can see when there is fog of war
+SIGHT_RADIUS = 8
+
+# the number of ticks in a second of the game clock
+TICK_RATE = 60
+# the time in ms between steps of the animation clock and the time each
+# frame of an animated texture is shown for unless its tiles.json says
+ANIMATION_STEP = 50
+FRAME_TIME = 250
+# roughly how many bytes Qt uses for an icon and for a widget, measured
+# with a lot of them on the offscreen platform
+ICON_BYTES = 300
+WIDGET_BYTES = 6 * 1024
+# the most bytes each of the game's caches should take up, the level
+# budgets are kept by the LevelManager. levels is every loaded level as
+# measured by its memory report, level tiles is the tile storage of any one
+# level as estimated from its file before it is built. The rest are caches
+# that can be emptied, the icons of the levels themselves are in levels
+BUDGETS = {"levels": 256 * 2**20, "level tiles": None,
+           "fog icons": 32 * 2**20, "caches": 64 * 2**20}
 
 
 class Texture(QPixmap):
+    # the frames of the texture if it is animated
+    animation = None
+
     def __init__(self, path: str | bytes) -> None:
         """the texture to be used by a tile or maybe even the players
 
@@ -67,7 +127,8 @@ class Texture(QPixmap):
 
     def get_path(full_texture_id: str):
         """Static method to get the path to the texture file
-        from the given full texture id.
+        from the given full texture id, for animated textures this is the
+        first frame.
 
         Args:
             full_texture_id (str): the full id of the texture
@@ -75,6 +136,20 @@ class Texture(QPixmap):
         Returns:
             str: the path to the texture file
         """
+        return Texture.get_frames(full_texture_id)[0][0]
+
+    def get_frames(full_texture_id: str) -> tuple[list[str], int]:
+        """Static method to get the paths to every frame of a texture. In a
+        tiles.json an animated texture is a list of files or
+        {"frames": [files], "ms": time each frame is shown}
+
+        Args:
+            full_texture_id (str): the full id of the texture
+
+        Returns:
+            tuple: the paths to the frames and the time in ms each frame is
+            shown for
+        """
         modid, texture_id = full_texture_id.split(':')
         infos = texture_id.split('.')
         if modid == "cm":
@@ -93,63 +168,208 @@ class Texture(QPixmap):
         for info in infos[:-1]:
             texture_path.append(info)
             navigator = navigator.copy()[info]
-        texture_path.append(navigator[infos[-1]])
-        return os.path.join(initial_folder, *texture_path)
+        frames = navigator[infos[-1]]
+        frame_time = FRAME_TIME
+        if isinstance(frames, dict):
+            frame_time = frames.get("ms", FRAME_TIME)
+            frames = frames["frames"]
+        elif isinstance(frames, str):
+            frames = [frames]
+        if not frames or frame_time < 1:
+            raise ValueError(f"{full_texture_id} has no frames to show")
+        return [
+            os.path.join(initial_folder, *texture_path, frame)
+            for frame in frames
+            ], frame_time
+
+
+class Animation:
+    def __init__(self, paths: list[str], frame_time: int):
+        """the frames of an animated texture, which frame is shown comes from
+        the game's animation clock so every tile with the texture is in step
+
+        Args:
+            paths (list): the paths to the frames
+            frame_time (int): the time in ms each frame is shown for
+        """
+        self.frames = tuple(QIcon(Texture(path)) for path in paths)
+        self.frame_time = frame_time
 
+    def index(self, time: int) -> int:
+        """
+        Args:
+            time (int): the time of the animation clock in ms
 
-class CodeDialog(QDialog):
-    def __init__(self, lock: "Lock"):
-        """a dialog for the player to enter a code into to unlock a lock
+        Returns:
+            int: the number of the frame shown at that time
+        """
+        return time // self.frame_time % len(self.frames)
 
+    def frame(self, time: int) -> QIcon:
+        """
         Args:
-            lock (Lock): the lock for the code to be attempted with
+            time (int): the time of the animation clock in ms
+
+        Returns:
+            QIcon: the frame shown at that time
         """
-        super(CodeDialog, self).__init__()
-        self.setWindowTitle("Enter code")
-        self.lock = lock
-        self.entry = QLineEdit()
-        self.submit = QPushButton("Submit")
+        return self.frames[self.index(time)]
+
+
+class Overlay(QWidget):
+    def __init__(self, parent: QWidget):
+        """a message or keypad drawn on top of the map, unlike a dialog it
+        doesn't stop the game while it is open so what the player chooses is
+        given to a callback instead of being returned
+
+        Args:
+            parent (QWidget): the widget holding the map displays
+        """
+        super(Overlay, self).__init__(parent)
+        self.setAutoFillBackground(True)
+        self.setStyleSheet("font-size: 20px")
         self.setLayout(QVBoxLayout())
+        # the messages and keypads waiting to be shown, each is
+        # (has a keypad, title, text, callback)
+        self.waiting = deque()
+        self.current = None
+
+        self.title = QLabel()
+        self.title.setStyleSheet("font-weight: bold")
+        self.text = QLabel()
+        self.text.setWordWrap(True)
+        self.entry = QLineEdit()
+        self.layout().addWidget(self.title)
+        self.layout().addWidget(self.text)
         self.layout().addWidget(self.entry)
-        self.layout().addWidget(self.submit)
-        self.submit.clicked.connect(self.on_submit)
 
-    def on_submit(self, *args):
-        """function to verify the code entered by the user
+        # creating the keypad for entering codes
+        self.keypad = QWidget()
+        self.keypad.setLayout(QGridLayout())
+        for number, char in enumerate("123456789C0"):
+            button = QPushButton(char)
+            # keeping the focus on the entry so the keyboard still works
+            button.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+            if char == "C":
+                button.clicked.connect(self.entry.clear)
+            else:
+                button.clicked.connect(
+                    lambda checked=False, char=char: self.press(char)
+                    )
+            self.keypad.layout().addWidget(button, number // 3, number % 3)
+        self.layout().addWidget(self.keypad)
+
+        self.ok = QPushButton("Ok")
+        self.ok.clicked.connect(self.confirm)
+        self.layout().addWidget(self.ok)
+        self.hide()
+
+    def is_open(self) -> bool:
         """
-        if self.entry.text() == self.lock.code:
-            # you got the code right
-            self.lock.state = False
-            QMessageBox(
-                QMessageBox.Icon.Information, "Accepted",
-                "the code you entered was correct\nthe lock is now unlocked",
-                QMessageBox.Ok
-            ).exec()
+        Returns:
+            bool: whether a message or keypad is being shown
+        """
+        return self.current is not None
+
+    def show_message(
+        self, title: str, text: str, on_close: "function" = None
+            ):
+        """shows a message once everything before it has been closed
+
+        Args:
+            title (str): the title of the message
+            text (str): the message
+            on_close (function, optional): called with no arguments when the
+            message is closed. Defaults to None.
+        """
+        self.waiting.append((False, title, text, on_close))
+        if not self.is_open():
+            self.show_next()
+
+    def ask_code(self, title: str, text: str, on_code: "function"):
+        """shows the keypad once everything before it has been closed
+
+        Args:
+            title (str): the title of the keypad
+            text (str): the message above the keypad
+            on_code (function): called with the code that was entered
+        """
+        self.waiting.append((True, title, text, on_code))
+        if not self.is_open():
+            self.show_next()
+
+    def show_next(self):
+        """shows the next message or keypad that is waiting
+        """
+        self.current = keypad, title, text, _ = self.waiting.popleft()
+        self.title.setText(title)
+        self.text.setText(text)
+        self.text.setVisible(bool(text))
+        self.entry.clear()
+        self.entry.setVisible(keypad)
+        self.keypad.setVisible(keypad)
+        self.ok.setText("Submit" if keypad else "Ok")
+        # sitting in the middle of the map
+        self.adjustSize()
+        parent = self.parentWidget().rect()
+        self.move(parent.center() - self.rect().center())
+        self.show()
+        self.raise_()
+        (self.entry if keypad else self.ok).setFocus()
+
+    def press(self, char: str):
+        """types a character into the code entry
+
+        Args:
+            char (str): the character of the key that was pressed
+        """
+        self.entry.insert(char)
+
+    def confirm(self):
+        """closes what is being shown and gives the result to its callback
+        """
+        if not self.is_open():
+            return
+        keypad, _, _, callback = self.current
+        code = self.entry.text()
+        self.current = None
+        self.hide()
+        if callback is not None:
+            if keypad:
+                callback(code)
+            else:
+                callback()
+        if self.waiting and not self.is_open():
+            self.show_next()
+
+    def keyPressEvent(self, event):
+        """lets enter close the message or submit the code
+
+        Args:
+            event (QKeyEvent): the key that was pressed
+        """
+        if event.key() in (Qt.Key.Key_Return, Qt.Key.Key_Enter):
+            self.confirm()
         else:
-            # you got the code wrong
-            reset = self.lock.increment_failures()
-            QMessageBox(
-                QMessageBox.Icon.Warning, "Denied",
-                # the dialog you will get if you failed to enter the code
-                # correctly and the code has been randomized
-                "the code you entered was incorrect\n"
-                "the lock is still locked\n"
-                "perhapse i should check the code again" if reset else
-                # the dialog you will get if you failed to enter the code
-                # correctly and the cdoe has NOT been randomized
-                "the code you entered was incorrect\n"
-                "the lock is still locked",
-                QMessageBox.Ok
-            ).exec()
-        self.close()
+            super(Overlay, self).keyPressEvent(event)
 
 
 class Lock:
     chars = "0123456789"
 
-    def __init__(self):
+    def __init__(self, lock_id: str = None, rng: random.Random = None):
         """creates a lock to be used by functional tiles such as doors
+
+        Args:
+            lock_id (str, optional): the id of the lock in its level.
+            Defaults to None.
+            rng (random.Random, optional): the random number generator the
+            codes are made with, giving each level its own seeded generator
+            keeps the codes the same when a game is replayed. Defaults to the
+            random module.
         """
+        self.id = lock_id
+        self.rng = random if rng is None else rng
         self.state = True
         self.code = None
         self.fails = 0
@@ -159,7 +379,23 @@ class Lock:
     def randomize_code(self):
         """randomizes the code
         """
-        self.code = "".join(random.sample(Lock.chars, 6))
+        self.code = "".join(self.rng.sample(Lock.chars, 6))
+
+    def try_code(self, code: str) -> str:
+        """tries to unlock the lock with a code
+
+        Args:
+            code (str): the code to try
+
+        Returns:
+            str: "accepted" if the code was right and the lock is now unlocked,
+            "reset" if it was wrong too many times and the code has been
+            randomized, otherwise "denied"
+        """
+        if code == self.code:
+            self.state = False
+            return "accepted"
+        return "reset" if self.increment_failures() else "denied"
 
     def increment_failures(self):
         """if the player inputs the code in wrong this method will keep track
@@ -245,6 +481,8 @@ class Coordinate:
 
 class Player:
     texture = Texture(Texture.get_path("cm:player"))
+    # tiles only ask the player for codes, save the game and end the level
+    is_player = True
 
     def __init__(self, game: "Game",
                  layer: str, x: int, y: int,
@@ -277,15 +515,19 @@ class Player:
             ammount (int, optional): the number of tiles to move the player.
             Defaults to 1.
         """
+        x, y = self.x, self.y
         match direction:
             case "up" | "north":
-                self.y -= ammount
+                y -= ammount
             case "right" | "east":
-                self.x += ammount
+                x += ammount
             case "down" | "south":
-                self.y += ammount
+                y += ammount
             case "left" | "west":
-                self.x -= ammount
+                x -= ammount
+        if self.blocked(self.layer, x, y):
+            return
+        self.x, self.y = x, y
         self.update()
 
     def teleport(self, new_coord: Coordinate):
@@ -295,18 +537,34 @@ class Player:
             new_coord (Coordinate): the position and layer to teleport the
             player to
         """
-        self.layer, self.x, self.y = new_coord()
+        layer, x, y = new_coord()
+        if self.blocked(layer, x, y):
+            return
+        self.layer, self.x, self.y = layer, x, y
+        self.game.visited_layers.add(self.layer)
         self.update()
 
+    def blocked(self, layer: str, x: int, y: int) -> bool:
+        """checks whether someone else is standing on a tile
+
+        Args:
+            layer (str): the layer of the tile
+            x (int): the x coordinate of the tile
+            y (int): the y coordinate of the tile
+
+        Returns:
+            bool: whether the player can't go there
+        """
+        entities = self.game.entities
+        return entities is not None and entities.at(layer, x, y) is not None
+
     def dialog(self, dialog: str):
         """prompts the player with a dialog
 
         Args:
             dialog (str): the message to haev in the dialog prompt
         """
-        QMessageBox(
-            QMessageBox.Icon.NoIcon, "Dialog", dialog
-            ).exec()
+        self.game.show_message("Dialog", dialog)
 
 
 class Tile:
@@ -333,6 +591,7 @@ class Tile:
             only applicable to locked doors. Defaults to None.
         """
         self.texture = QIcon(texture)
+        self.animation = texture.animation
         self.function = function
         self.function_arg = function_arg
         self.lock = lock
@@ -345,10 +604,12 @@ class Tile:
 
     def attempt_entry(self, player: Player, direction_attempted: str):
         """a method to tell the player what to do when the attempt to enter
-        this tile
+        this tile, guards go through here too but they can't enter codes,
+        don't save the game and can't end the level
 
         Args:
-            player (Player): the player to give the instruction too
+            player (Player | EntityActor): the player to give the instruction
+            too
             direction_attempted (str): the direction the player attemted to
             move to get into this tile
         """
@@ -364,14 +625,18 @@ class Tile:
                     # code of the lock if applicable otherwise just inform the
                     # user that they are unable to unlock it
                     # (locked from the other side)
-                    if self.lock:
-                        CodeDialog(self.lock).exec()
+                    if self.lock and player.is_player:
+                        player.game.enter_code(self.lock)
                     else:
                         player.dialog("The door is locked from the other side")
                 else:
                     # if the door is not locked it will teleport the player to
                     # the appropriate location
-                    player.teleport(Coordinate(self.function_arg))
+                    player.teleport(
+                        player.game.level.coordinate(self.function_arg)
+                        )
+                    if player.is_player:
+                        player.game.autosave()
             case "through-door":
                 # if the tile is a through door it will first check if it is
                 # locked
@@ -380,8 +645,8 @@ class Tile:
                     # code of the lock if applicable otherwise just inform the
                     # user that they are unable to unlock it
                     # (locked from the other side)
-                    if self.lock:
-                        CodeDialog(self.lock).exec()
+                    if self.lock and player.is_player:
+                        player.game.enter_code(self.lock)
                     else:
                         player.dialog("The door is locked from the other side")
                 else:
@@ -410,345 +675,4580 @@ class Tile:
                 # the obeject they just walked into is a wall
                 player.dialog("That is a wall.")
             case "end":
-                # if the tile is a end tile the level will end
-                player.game.level.end(player.game)
+                # if the tile is a end tile the level will end, the guards
+                # don't get to leave
+                if player.is_player:
+                    player.game.level.end(player.game)
 
 
-class Level:
-    def __init__(self, game: "Game", path: str | bytes):
-        """the constructor for any level of the game
+class LevelReader:
+    whitespace = " \t\n\r"
+
+    def __init__(self, path: str | bytes, chunk_size: int = 1 << 16):
+        """reads a level file a piece at a time so that big levels never
+        have to be held in memory all at once. Iterating over the reader
+        gives the parts of the level in the order they are in the file as
+        (kind, value) pairs:
+
+        ("tile_key", dict), ("row", (layer id, list of texture keys)),
+        ("wall", str), ("function", (location, dict)), ("start", str),
+        ("end", str)
+
+        anything else in the file is given as (name, value)
 
         Args:
-            game (Game): the game object that this level is being created in
-            path (str | bytes): the path to the file for this level
+            path (str | bytes): the path to the level file
+            chunk_size (int, optional): the number of characters to read from
+            the file at a time. Defaults to 65536.
         """
-        self.textures = {}
-        self.map = {}
-        self.locks = {
-            None: None, "": None
-            }
-        with open(path, 'r') as level:
-            data = json.load(level)
+        self.path = path
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.file = None
+        self.buffer = ""
+        self.pos = 0
 
-        # load all the textures needed by the level
-        self.load_textures(data["tile_key"])
+    def fill(self) -> bool:
+        """reads the next chunk of the file into the buffer throwing away
+        what has already been read
 
-        # seperate the level data from the texture data
-        level_data = data["level"]
-        # seperate the layers to their own variable for easier referencing
-        layers = level_data["layers"]
+        Returns:
+            bool: False if the end of the file has been reached
+        """
+        chunk = self.file.read(self.chunk_size)
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return bool(chunk)
 
-        self.start = Coordinate(level_data["start"])
-        end = Coordinate(level_data["end"])
+    def peek(self) -> str:
+        """skips any whitespace and returns the next character
+
+        Raises:
+            ValueError: if the file ends unexpectedly
 
-        self.construct_walls(level_data["walls"], layers)
-        self.assemble_functional_tiles(level_data["functions"], layers)
-        self.construct_map(layers)
+        Returns:
+            str: the next character in the file
+        """
+        while True:
+            while (self.pos < len(self.buffer)
+                   and self.buffer[self.pos] in self.whitespace):
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                raise ValueError(f"level file ({self.path}) ended early")
+
+    def expect(self, *chars: str) -> str:
+        """reads the next character checking that it is one of the expected
+        characters
 
-        self.setup_end(end, layers)
+        Raises:
+            ValueError: if the next character isn't one of the expected ones
 
-        game.create_player(self.start)
+        Returns:
+            str: the character that was read
+        """
+        char = self.peek()
+        if char not in chars:
+            raise ValueError(
+                f"expected {' or '.join(chars)} but found {char} "
+                f"in level file ({self.path})"
+                )
+        self.pos += 1
+        return char
 
-    def get_path(full_level_id: str):
-        """Static method to get the path to the level file
-        from the given full level id.
+    def value(self):
+        """reads the next complete json value, reading more of the file if
+        the value goes past the end of the buffer
 
-        Args:
-            full_level_id (str): the full id of the level
+        Raises:
+            ValueError: if the value is not valid json
 
         Returns:
-            str: the path to the level file
+            any: the value that was read
         """
-        modid, level_id = full_level_id.split(':')
-        infos = level_id.split('.')
-        if modid == "cm":
-            initial_folder = os.path.join(path_to_inside, "levels")
-        else:
-            initial_folder = os.path.join(
-                path_to_exe, "mods", modid, "levels"
-                )
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as error:
+                if not self.fill():
+                    raise ValueError(
+                        f"invalid level file ({self.path})"
+                        ) from error
+                continue
+            # a number right at the end of the buffer might carry on in the
+            # next chunk
+            if end < len(self.buffer) or not self.fill():
+                self.pos = end
+                return value
+
+    def members(self):
+        """steps through the object at the current position, the value of
+        each member must be read before the next key is asked for
+
+        Yields:
+            str: the key of each member of the object
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+            if self.expect(",", "}") == "}":
+                return
+
+    def elements(self):
+        """steps through the array at the current position, each element must
+        be read before the next one is asked for
+
+        Yields:
+            int: the index of each element in the array
+        """
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        index = 0
+        while True:
+            yield index
+            index += 1
+            if self.expect(",", "]") == "]":
+                return
+
+    def __iter__(self):
+        with open(self.path, "r") as self.file:
+            self.buffer = ""
+            self.pos = 0
+            for section in self.members():
+                if section != "level":
+                    yield section, self.value()
+                    continue
+                for part in self.members():
+                    match part:
+                        case "layers":
+                            for layer_id in self.members():
+                                for _ in self.elements():
+                                    yield "row", (layer_id, self.value())
+                        case "walls":
+                            for _ in self.elements():
+                                yield "wall", self.value()
+                        case "functions":
+                            for location in self.members():
+                                yield "function", (location, self.value())
+                        case other:
+                            yield part, self.value()
+
+
+class LevelFile:
+    def __init__(self, path: str | bytes):
+        """everything in a level file that doesn't need Qt, reading a level
+        file into one of these can be done off the main thread
 
-        with open(os.path.join(initial_folder, "levels.json")) as reference:
-            mod_tile_reference_sheet = json.load(reference)
-        tile_path = []
-        navigator = mod_tile_reference_sheet.copy()
-        # itterates through each part of the level id in the reference sheet
-        # to get the final path
-        for info in infos[:-1]:
-            tile_path.append(info)
-            navigator = navigator.copy()[info]
-        tile_path.append(navigator[infos[-1]])
-        return os.path.join(initial_folder, *tile_path)
+        Args:
+            path (str | bytes): the path to the level file
+        """
+        self.path = path
+        self.tile_key = {}
+        # layer: [array of texture numbers, ...] one array per row, this is
+        # the texture grid of the level file with each texture key swapped
+        # for its position in texture_keys
+        self.layers = {}
+        self.texture_keys = []
+        self.texture_numbers = {}
+        # layer: [bytearray, ...] one per row with a 1 for every wall tile
+        self.wall_masks = {}
+        # layer: (width, height) of every layer in the level
+        self.sizes = {}
+        self.max_coord = MAX_SIZE - 1
+        # [{"kind": ..., "at": coordinate}, ...] of everyone but the player
+        self.entities = []
+
+        walls, self.functions, self.start, self.end = self.read(path)
+        self.measure_layers()
+        self.construct_walls(walls)
+
+    def read(self, path: str | bytes) -> tuple[list, dict, str, str]:
+        """streams the level file in, building the texture grid a row at a
+        time as they are read
 
-    def load_textures(self, tile_key: dict):
-        """loads all the textures required by the level
+        Args:
+            path (str | bytes): the path to the level file
+
+        Returns:
+            tuple: the walls, functional tiles, start and end of the level
+        """
+        walls = []
+        functions = {}
+        points = {}
+        for kind, value in LevelReader(path):
+            match kind:
+                case "tile_key":
+                    self.tile_key.update(value)
+                case "row":
+                    self.add_row(*value)
+                case "wall":
+                    walls.append(value)
+                case "function":
+                    location, data = value
+                    functions[location] = data
+                case "start" | "end":
+                    points[kind] = value
+                case "entities":
+                    self.entities = value
+        return walls, functions, points["start"], points["end"]
+
+    def add_row(self, layer_id: str, row: list[str]):
+        """adds the next row of a layer to the texture grid
 
         Args:
-            tile_key (dict): the textures to be loaded and their keys that
-            they will be referenced as when constructing the map
+            layer_id (str): the layer the row is in
+            row (list): the texture keys of the row
         """
-        for key, texture_id in tile_key.items():
-            self.textures[key] = Texture(Texture.get_path(texture_id))
+        numbers = self.texture_numbers
+        for key in set(row).difference(numbers):
+            numbers[key] = len(self.texture_keys)
+            self.texture_keys.append(key)
+        self.layers.setdefault(layer_id, []).append(
+            array("H", map(numbers.__getitem__, row))
+            )
 
-    def fill_layer(self, layer_id: str):
-        """method to prep a layer to be filled with tiles if it does not
-        already exist
+    def measure_layers(self):
+        """works out the size of every layer in the level so that levels
+        aren't limited to the size of the display grid
+        """
+        for layer_id, layer in self.layers.items():
+            self.sizes[layer_id] = (len(layer[0]) if layer else 0, len(layer))
+        self.max_coord = max(
+            [MAX_SIZE - 1] + [max(size) - 1 for size in self.sizes.values()]
+            )
+
+    def coordinate(self, value: str) -> Coordinate:
+        """creates a coordinate that can reach any tile in this level
 
         Args:
-            layer_id (str): the id of the layer to be preped
+            value (str): the coordinate in the form
+            "<str layer>,<int x>x,<int y>y"
+
+        Returns:
+            Coordinate: the coordinate
         """
-        self.map[layer_id] = {y: {} for y in range(16)}
+        return Coordinate(value, 0, self.max_coord)
 
-    def setup_end(self,
-                  end_coord: Coordinate,
-                  layers: dict):
-        """sets up the end tile of the map
+    def tile_coordinate(self, value: str) -> Coordinate:
+        """creates a coordinate that has to be on a tile of this level
 
         Args:
-            end_coord (Coordinate): the location that the end tile will be
-            placed at
-            layers (dict): the data from which the texture for this tile will
-            be derived
+            value (str): the coordinate in the form
+            "<str layer>,<int x>x,<int y>y"
+
+        Raises:
+            ValueError: if the coordinate isn't inside one of the layers
+
+        Returns:
+            Coordinate: the coordinate
         """
-        lay, x, y = end_coord()
-        # creating the tile
-        self.map[lay][y][x] = Tile(
-            self.textures[layers[lay][y][x]], "end"
-        )
+        coordinate = self.coordinate(value)
+        width, height = self.sizes.get(coordinate.layer, (0, 0))
+        if coordinate.x >= width or coordinate.y >= height:
+            raise ValueError(f"{value} isn't inside one of the layers")
+        return coordinate
+
+    def memory_estimate(self) -> int:
+        """roughly works out how much memory the level will take up once it
+        is built, without its textures, by counting a map reference, a
+        texture number and a wall mask byte for every tile
+
+        Returns:
+            int: the estimated size in bytes
+        """
+        tiles = sum(width * height for width, height in self.sizes.values())
+        return tiles * (8 + 2 + 1)
 
-    def construct_walls(self, walls_data: list, layers: dict):
-        """constructs the walls that are within the level
+    def construct_walls(self, walls_data: list):
+        """rasterizes the walls that are within the level into a mask for
+        each layer, every wall fills its rows with a single slice assignment
+        and overlapping walls just set the same bytes again
 
         Args:
             walls_data (list): a list of the walls in the level
-            layers (dict): the data from which the textures for these tiles
-            can be derived
 
         Raises:
             ValueError: if a wall does not start and end on the same layer
+            or goes outside of its layer
         """
+        self.wall_masks = {
+            layer_id: [bytearray(width) for _ in range(height)]
+            for layer_id, (width, height) in self.sizes.items()
+            }
         for wall in walls_data:
             start, end = wall.split(":")
-            s_lay, s_x, s_y = Coordinate(start)()
-            e_lay, e_x, e_y = Coordinate(end)()
+            s_lay, s_x, s_y = self.coordinate(start)()
+            e_lay, e_x, e_y = self.coordinate(end)()
             if s_lay != e_lay:
                 raise ValueError(
                     f"start and end points of wall ({wall}) "
                     "are not in same layer"
                     )
-            elif s_lay not in self.map:
-                self.fill_layer(s_lay)
-            for x in range(min(s_x, e_x),
-                           max(s_x, e_x) + 1):
-                for y in range(min(s_y, e_y),
-                               max(s_y, e_y) + 1):
-                    self.map[s_lay][y][x] = Tile(
-                        self.textures[layers[s_lay][y][x]],
-                        "wall"
-                    )
+            width, height = self.sizes.get(s_lay, (0, 0))
+            left, right = min(s_x, e_x), max(s_x, e_x) + 1
+            top, bottom = min(s_y, e_y), max(s_y, e_y) + 1
+            if right > width or bottom > height:
+                raise ValueError(f"wall ({wall}) goes outside of its layer")
+            span = b"\x01" * (right - left)
+            for row in self.wall_masks[s_lay][top:bottom]:
+                row[left:right] = span
 
-    def assemble_functional_tiles(self, functions: dict, layers: dict):
-        """assembles all the functinoal tiles in the level
 
-        Args:
-            functions (dict): the functional tiles to setup
-            layers (dict): the data from which the textures for these tiles
-            can be derived
+class MemoryReport:
+    def __init__(self):
+        """how many bytes and objects each part of the game takes up. Python
+        objects are measured with sys.getsizeof, Qt objects are counted and
+        given the rough sizes ICON_BYTES and WIDGET_BYTES plus their pixels
         """
-        global MAX_SIZE
-        for location, data in functions.items():
-            lay, x, y = Coordinate(location)()
-            # filling in the layer if it doent already exist
-            if lay not in self.map:
-                self.fill_layer(lay)
+        # subsystem: [bytes, objects]
+        self.parts = {}
 
-            # deciding the arg naem depending on hte function type
-            match data["type"]:
-                case "door":
-                    arg_name = "goes_to"
-                case "dialog":
-                    arg_name = "text"
-                case "code":
-                    arg_name = "lock_id"
-                case other:
-                    arg_name = "arg"
+    def add(self, subsystem: str, size: int, count: int = 1):
+        """adds some memory to a subsystem
 
-            # sorting out the lock
-            lock_id = data.get("lock_id", None)
-            if lock_id not in self.locks:
-                self.locks[lock_id] = Lock()
-
-            # creating the tile
-            self.map[lay][y][x] = Tile(
-                self.textures[layers[lay][y][x]],
-                data["type"], data.get(arg_name, None),
-                data.get("locked", False), self.locks[lock_id]
-            )
+        Args:
+            subsystem (str): the part of the game using the memory
+            size (int): the number of bytes
+            count (int, optional): the number of objects. Defaults to 1.
+        """
+        part = self.parts.setdefault(subsystem, [0, 0])
+        part[0] += size
+        part[1] += count
 
-    def construct_map(self, layers: dict):
-        """constructs the map as plain tiles with the textures specified in
-        the level data
+    def add_objects(self, subsystem: str, objects):
+        """adds python objects to a subsystem
 
         Args:
-            layers (dict): the level data to get the texture keys from
+            subsystem (str): the part of the game using the memory
+            objects (Iterable): the objects
         """
-        global MAX_SIZE
-        # itterating through each layer in the level data
-        for layer_id, layer in layers.items():
-            if layer_id not in self.map:
-                # setting up layers that do not already exist
-                self.fill_layer(layer_id)
-            # itterating through the x and y coords the map
-            for y in range(MAX_SIZE):
-                for x in range(MAX_SIZE):
-                    # creating the tile
-                    if self.map[layer_id][y].get(x) is None:
-                        self.map[layer_id][y][x] = Tile(
-                            Texture(
-                                self.textures[layer[y][x]]
-                                )
-                        )
+        sizes = list(map(sys.getsizeof, objects))
+        self.add(subsystem, sum(sizes), len(sizes))
 
-    def end(self, game: "Game"):
-        """method for when the player complete the level
+    def merge(self, other: "MemoryReport"):
+        """adds everything in another report to this one
 
         Args:
-            game (Game): the game object the level is running in
+            other (MemoryReport): the report to add
         """
-        if game.demo_mode:
-            end_dialog = QMessageBox(
-                QMessageBox.Icon.NoIcon, "Level_complete",
-                "Congrats you completed the demo",
-                QMessageBox.Close
-            )
-            end_dialog.exec()
-            sys.exit()
+        for subsystem, (size, count) in other.parts.items():
+            self.add(subsystem, size, count)
 
+    def bytes(self, subsystem: str = None) -> int:
+        """
+        Args:
+            subsystem (str, optional): the subsystem. Defaults to all of them.
 
-class Game:
-    #     x, y, name
-    UP = (0, 1, "up")
-    DOWN = (0, -1, "down")
-    LEFT = (-1, 0, "left")
-    RIGHT = (1, 0, "right")
+        Returns:
+            int: the number of bytes used
+        """
+        if subsystem is not None:
+            return self.parts.get(subsystem, (0, 0))[0]
+        return sum(size for size, _ in self.parts.values())
 
-    def __init__(self, window: QMainWindow, demo_mode: bool = False):
-        """constructor class of the game
+    def over(self, budgets: dict) -> list[str]:
+        """finds the subsystems using more than their budget
 
         Args:
-            window (QMainWindow): the window the game is running in
+            budgets (dict): subsystem: the most bytes it should use, None for
+            no limit
+
+        Returns:
+            list: the subsystems over budget
         """
-        self.displays = {
-            y: {} for y in range(MAX_SIZE)
-        }
-        self.level = None
-        self.player = None
+        return [
+            subsystem for subsystem, budget in budgets.items()
+            if budget is not None and self.bytes(subsystem) > budget
+            ]
 
-        # adding a reference to the parent window to be used later
-        self.window = window
+    def table(self) -> str:
+        """
+        Returns:
+            str: the bytes and objects of each subsystem as a table
+        """
+        lines = [f"{'subsystem':<16}{'KiB':>12}{'objects':>10}"]
+        for subsystem, (size, count) in sorted(self.parts.items()):
+            lines.append(f"{subsystem:<16}{size / 1024:>12.1f}{count:>10}")
+        lines.append(f"{'total':<16}{self.bytes() / 1024:>12.1f}{'':>10}")
+        return "\n".join(lines)
 
-        # storing whether the game is in demo mode
-        self.demo_mode = demo_mode
 
-        # creating the up key and binding it to the move method
-        self.up_key = QShortcut(window)
-        self.up_key.setKey('w')
-        self.up_key.activated.connect(lambda: self.move_player(self.UP))
+class Level:
+    def __init__(
+        self, game: "Game", path: str | bytes, level_file: LevelFile = None,
+        rng: random.Random = None
+            ):
+        """the constructor for any level of the game
 
-        # creating the down key and binding it to the move method
-        self.down_key = QShortcut(window)
-        self.down_key.setKey('s')
-        self.down_key.activated.connect(lambda: self.move_player(self.DOWN))
+        Args:
+            game (Game): the game object that this level is being created in,
+            if None the player is left where they are
+            path (str | bytes): the path to the file for this level
+            level_file (LevelFile, optional): the level file if it has already
+            been read. Defaults to None.
+            rng (random.Random, optional): the random number generator for the
+            codes of the level's locks. Defaults to an unseeded one.
+        """
+        if level_file is None:
+            level_file = LevelFile(path)
+        self.path = path
+        self.file = level_file
+        self.rng = random.Random() if rng is None else rng
+        self.textures = {}
+        # key: (texture path, modification time) of every loaded texture
+        self.texture_stamps = {}
+        self.tile_key = {}
+        self.map = {}
+        # (texture key, is a wall): the tile shared by every plain or wall
+        # tile with that texture
+        self.shared_tiles = {}
+        # (layer, x, y): data of every functional tile
+        self.function_cells = {}
+        self.end_cell = None
+        self.layers = level_file.layers
+        self.texture_keys = level_file.texture_keys
+        self.wall_masks = level_file.wall_masks
+        self.sizes = level_file.sizes
+        self.max_coord = level_file.max_coord
+        self.entities = level_file.entities
+        self.locks = {
+            None: None, "": None
+            }
 
-        # creating the left key and binding it to the move method
-        self.left_key = QShortcut(window)
-        self.left_key.setKey('a')
-        self.left_key.activated.connect(lambda: self.move_player(self.LEFT))
+        # load all the textures needed by the level
+        self.load_textures(level_file.tile_key)
 
-        # creating the right key and binding it to the move method
-        self.right_key = QShortcut(window)
-        self.right_key.setKey('d')
-        self.right_key.activated.connect(lambda: self.move_player(self.RIGHT))
+        self.start = self.coordinate(level_file.start)
+        end = self.coordinate(level_file.end)
 
-        # determining the the game is in demo mode and if so running the demo
-        # level
-        if demo_mode:
-            self.load_level("cm:demo")
-        else:
-            # only a demo has been made at this point in time so you can't
-            # play the non demo
-            raise RuntimeError("You're not allowed to do that")
+        self.construct_map()
+        self.assemble_functional_tiles(level_file.functions)
 
-    def load_level(self, level_id: str):
-        """loads the level with the specified id
+        self.setup_end(end)
 
-        Args:
-            level_id (str): the id of the level to load
-        """
-        level_path = Level.get_path(level_id)
-        self.level = Level(self, level_path)
+        if game is not None:
+            game.create_player(self.start)
 
-    def add_display_ref(self, display: QPushButton, y: int, x: int):
-        """adds a reference ot a display in the window to the game object
+    def texture_at(self, layer_id: str, x: int, y: int) -> Texture:
+        """gets the texture the level file gives a tile
 
         Args:
-            display (QPushButton): the display to add a reference to
-            y (int): the row the display is on in the display matrix
-            x (int): the column the display is on in the display matrix
-        """
-        self.displays[y][x] = display
+            layer_id (str): the layer the tile is in
+            x (int): the x coordinate of the tile
+            y (int): the y coordinate of the tile
 
-    def update_displays(self):
-        """updates the tile displays to show the correct texture
+        Returns:
+            Texture: the texture of the tile
         """
-        layer = self.player.layer
-        for y in range(MAX_SIZE):
-            for x in range(MAX_SIZE):
-                self.displays[y][x].setIcon(
-                    self.level.map[layer][y][x].texture
-                )
-        self.displays[self.player.y][self.player.x].setIcon(Player.texture)
+        return self.textures[self.texture_keys[self.layers[layer_id][y][x]]]
 
-    def create_player(self, location: Coordinate):
-        """creates the player at the given location
+    def levels_folder(modid: str) -> str:
+        """Static method to get the folder the levels of the game or of a mod
+        are in.
+
+        Args:
+            modid (str): the id of the mod, cm for the game
+
+        Returns:
+            str: the path to the folder
+        """
+        if modid == "cm":
+            return os.path.join(path_to_inside, "levels")
+        return os.path.join(path_to_exe, "mods", modid, "levels")
+
+    def get_campaign_path(full_campaign_id: str) -> str:
+        """Static method to get the path to a campaign manifest, they are
+        kept in the campaigns folder next to the levels rather than listed
+        with them so they are never mistaken for a level.
+
+        Args:
+            full_campaign_id (str): the full id of the campaign, like
+            cm:campaign for levels/campaigns/campaign.json
+
+        Returns:
+            str: the path to the manifest
+        """
+        modid, campaign_id = full_campaign_id.split(':')
+        return os.path.join(
+            Level.levels_folder(modid), "campaigns", f"{campaign_id}.json"
+            )
+
+    def get_path(full_level_id: str):
+        """Static method to get the path to the level file
+        from the given full level id.
+
+        Args:
+            full_level_id (str): the full id of the level
+
+        Returns:
+            str: the path to the level file
+        """
+        modid, level_id = full_level_id.split(':')
+        infos = level_id.split('.')
+        initial_folder = Level.levels_folder(modid)
+
+        with open(os.path.join(initial_folder, "levels.json")) as reference:
+            mod_tile_reference_sheet = json.load(reference)
+        tile_path = []
+        navigator = mod_tile_reference_sheet.copy()
+        # itterates through each part of the level id in the reference sheet
+        # to get the final path
+        for info in infos[:-1]:
+            tile_path.append(info)
+            navigator = navigator.copy()[info]
+        tile_path.append(navigator[infos[-1]])
+        return os.path.join(initial_folder, *tile_path)
+
+    def level_ids():
+        """Static method to get the full id of every level listed in the
+        levels.json of the game and of every mod.
+
+        Returns:
+            list: the full ids of the levels
+        """
+        folders = [("cm", os.path.join(path_to_inside, "levels"))]
+        mods = os.path.join(path_to_exe, "mods")
+        if os.path.isdir(mods):
+            folders.extend(
+                (modid, os.path.join(mods, modid, "levels"))
+                for modid in sorted(os.listdir(mods))
+                )
+        level_ids = []
+        for modid, folder in folders:
+            try:
+                with open(os.path.join(folder, "levels.json")) as reference:
+                    mod_level_reference_sheet = json.load(reference)
+            except (OSError, ValueError):
+                continue
+            # going through the nested parts of the reference sheet the same
+            # way get_path follows a level id through them
+            navigators = [([], mod_level_reference_sheet)]
+            while navigators:
+                infos, navigator = navigators.pop(0)
+                for info, value in navigator.items():
+                    if isinstance(value, dict):
+                        navigators.append((infos + [info], value))
+                    else:
+                        level_ids.append(f"{modid}:{'.'.join(infos + [info])}")
+        return level_ids
+
+    def coordinate(self, value: str) -> Coordinate:
+        """creates a coordinate that can reach any tile in this level
+
+        Args:
+            value (str): the coordinate in the form
+            "<str layer>,<int x>x,<int y>y"
+
+        Returns:
+            Coordinate: the coordinate
+        """
+        return Coordinate(value, 0, self.max_coord)
+
+    def memory_estimate(self) -> int:
+        """roughly works out how much memory the level takes up
+
+        Returns:
+            int: the estimated size of the level in bytes
+        """
+        return self.memory_report().bytes()
+
+    def memory_report(self) -> MemoryReport:
+        """works out how much memory each part of the level takes up, the
+        tiles are counted a row at a time and shared tiles only once
+
+        Returns:
+            MemoryReport: the bytes and objects of the level's tile storage,
+            locks, texture pixels and icons
+        """
+        report = MemoryReport()
+        for grid in (self.map, self.layers, self.wall_masks):
+            for rows in grid.values():
+                report.add_objects("tile storage", [rows, *rows])
+        tiles = list(self.shared_tiles.values())
+        tiles.extend(
+            self.map[lay][y][x] for lay, x, y in self.function_cells
+            if lay in self.map
+            )
+        if self.end_cell is not None:
+            lay, x, y = self.end_cell
+            tiles.append(self.map[lay][y][x])
+        report.add_objects("tile storage", tiles)
+        report.add_objects(
+            "tile storage", [tile.__dict__ for tile in tiles]
+            )
+        report.add_objects("tile storage", self.function_cells.values())
+        locks = [lock for lock in self.locks.values() if lock is not None]
+        report.add_objects("locks", locks + [lock.__dict__ for lock in locks])
+        report.add("icons", len(tiles) * ICON_BYTES, len(tiles))
+        for texture in self.textures.values():
+            report.add(
+                "texture pixels",
+                texture.width() * texture.height() * texture.depth() // 8
+                )
+            if texture.animation is not None:
+                frames = texture.animation.frames
+                report.add("icons", len(frames) * ICON_BYTES, len(frames))
+                for frame in frames:
+                    size = frame.availableSizes()[0]
+                    report.add(
+                        "texture pixels", size.width() * size.height() * 4
+                        )
+        return report
+
+    def read_textures(self, tile_key: dict) -> dict:
+        """reads textures without adding them to the level
+
+        Args:
+            tile_key (dict): the keys of the textures and their full ids
+
+        Returns:
+            dict: key: (Texture, texture stamp) of every texture
+        """
+        textures = {}
+        for key, texture_id in tile_key.items():
+            paths, frame_time = Texture.get_frames(texture_id)
+            texture = Texture(paths[0])
+            if len(paths) > 1:
+                texture.animation = Animation(paths, frame_time)
+            textures[key] = texture, self.texture_stamp(paths)
+        return textures
+
+    def load_textures(self, tile_key: dict, textures: dict = None):
+        """loads all the textures required by the level
+
+        Args:
+            tile_key (dict): the textures to be loaded and their keys that
+            they will be referenced as when constructing the map
+            textures (dict, optional): the textures already read by
+            read_textures. Defaults to reading them now.
+        """
+        if textures is None:
+            textures = self.read_textures(tile_key)
+        self.tile_key.update(tile_key)
+        for key, (texture, stamp) in textures.items():
+            self.textures[key] = texture
+            self.texture_stamps[key] = stamp
+            # tiles made with the old texture can't be shared any more
+            self.shared_tiles.pop((key, False), None)
+            self.shared_tiles.pop((key, True), None)
+
+    def texture_stamp(self, paths: list[str]) -> tuple[tuple, tuple]:
+        """
+        Args:
+            paths (list): the paths to the frames of a texture
+
+        Returns:
+            tuple: the paths and when each of them was last changed
+        """
+        return tuple(paths), tuple(map(self.modified_time, paths))
+
+    def animated(self) -> bool:
+        """
+        Returns:
+            bool: whether any of the level's textures are animated
+        """
+        return any(
+            texture.animation is not None
+            for texture in self.textures.values()
+            )
+
+    def modified_time(self, path: str) -> int | None:
+        """gets when a file was last changed
+
+        Args:
+            path (str): the path to a file
+
+        Returns:
+            int | None: when the file was last changed or None if it doesn't
+            exist
+        """
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    def setup_end(self, end_coord: Coordinate):
+        """sets up the end tile of the map
+
+        Args:
+            end_coord (Coordinate): the location that the end tile will be
+            placed at
+        """
+        self.end_cell = lay, x, y = end_coord()
+        # creating the tile
+        self.map[lay][y][x] = Tile(self.texture_at(lay, x, y), "end")
+
+    def assemble_functional_tiles(self, functions: dict):
+        """assembles all the functinoal tiles in the level
+
+        Args:
+            functions (dict): the functional tiles to setup
+        """
+        for location, data in functions.items():
+            lay, x, y = self.coordinate(location)()
+            self.function_cells[lay, x, y] = data
+            self.map[lay][y][x] = self.function_tile(lay, x, y, data)
+
+    def function_tile(self, lay: str, x: int, y: int, data: dict) -> Tile:
+        """creates a functional tile
+
+        Args:
+            lay (str): the layer the tile is in
+            x (int): the x coordinate of the tile
+            y (int): the y coordinate of the tile
+            data (dict): the data of the tile from the level file
+
+        Returns:
+            Tile: the tile
+        """
+        # deciding the arg naem depending on hte function type
+        match data["type"]:
+            case "door":
+                arg_name = "goes_to"
+            case "dialog":
+                arg_name = "text"
+            case "code":
+                arg_name = "lock_id"
+            case other:
+                arg_name = "arg"
+
+        # sorting out the lock
+        lock_id = data.get("lock_id", None)
+        if lock_id not in self.locks:
+            self.locks[lock_id] = Lock(lock_id, self.rng)
+
+        # creating the tile
+        return Tile(
+            self.texture_at(lay, x, y),
+            data["type"], data.get(arg_name, None),
+            data.get("locked", False), self.locks[lock_id]
+        )
+
+    def shared_tile(self, key: str, wall: bool) -> Tile:
+        """gets the tile shared by every plain or wall tile with a texture
+
+        Args:
+            key (str): the texture key of the tile
+            wall (bool): whether the tile is a wall
+
+        Returns:
+            Tile: the shared tile
+        """
+        tile = self.shared_tiles.get((key, wall))
+        if tile is None:
+            tile = self.shared_tiles[key, wall] = Tile(
+                self.textures[key], "wall" if wall else None
+                )
+        return tile
+
+    def construct_map(self, layer_ids: list[str] = None):
+        """constructs the map from the texture grid a whole row at a time.
+        Plain tiles and wall tiles have nothing about them but their texture
+        so every tile with the same texture shares the same tile object
+
+        Args:
+            layer_ids (list, optional): the layers to construct. Defaults to
+            every layer.
+        """
+        plain_tiles = [
+            self.shared_tile(key, False) for key in self.texture_keys
+            ]
+        wall_tiles = [
+            self.shared_tile(key, True) for key in self.texture_keys
+            ]
+        # indexed by the wall mask so each cell picks its tile list
+        tile_lists = (plain_tiles, wall_tiles)
+        for layer_id in self.layers if layer_ids is None else layer_ids:
+            rows = []
+            for numbers, walls in zip(
+                    self.layers[layer_id], self.wall_masks[layer_id]):
+                if any(walls):
+                    rows.append(list(map(
+                        getitem, map(tile_lists.__getitem__, walls), numbers
+                        )))
+                else:
+                    rows.append(list(map(plain_tiles.__getitem__, numbers)))
+            self.map[layer_id] = rows
+
+    def rebuild_tile(self, lay: str, x: int, y: int):
+        """rebuilds a single tile of the map from the level data
+
+        Args:
+            lay (str): the layer the tile is in
+            x (int): the x coordinate of the tile
+            y (int): the y coordinate of the tile
+        """
+        if (lay, x, y) == self.end_cell:
+            tile = Tile(self.texture_at(lay, x, y), "end")
+        elif (lay, x, y) in self.function_cells:
+            tile = self.function_tile(
+                lay, x, y, self.function_cells[lay, x, y]
+                )
+        else:
+            tile = self.shared_tile(
+                self.texture_keys[self.layers[lay][y][x]],
+                bool(self.wall_masks[lay][y][x])
+                )
+        self.map[lay][y][x] = tile
+
+    def cells_with_textures(self, keys: set[str]) -> set[tuple[str, int, int]]:
+        """finds every tile that has one of the given textures
+
+        Args:
+            keys (set): the texture keys to look for
+
+        Returns:
+            set: the (layer, x, y) of every tile with one of the textures
+        """
+        numbers = {
+            number for number, key in enumerate(self.texture_keys)
+            if key in keys
+            }
+        cells = set()
+        if not numbers:
+            return cells
+        for layer_id, layer in self.layers.items():
+            for y, row in enumerate(layer):
+                if numbers.isdisjoint(row):
+                    continue
+                cells.update(
+                    (layer_id, x, y) for x, number in enumerate(row)
+                    if number in numbers
+                    )
+        return cells
+
+    def reload(self, level_file: LevelFile) -> set[tuple[str, int, int]]:
+        """brings the level up to date with a changed version of its file,
+        only the tiles that are different are rebuilt and the locks keep
+        their state
+
+        Args:
+            level_file (LevelFile): the changed level file
+
+        Raises:
+            ValueError: if a functional tile, the start or the end isn't on
+            a tile of the level or a functional tile has no type
+            KeyError: if a texture the level uses can't be found
+
+        Returns:
+            set: the (layer, x, y) of every tile that was rebuilt
+        """
+        old = self.file
+        dirty = set()
+
+        # the whole of the new file is checked and its textures read before
+        # the level is changed so a reload that fails leaves it as it was
+        new_functions = {}
+        for location, data in level_file.functions.items():
+            if "type" not in data:
+                raise ValueError(f"the tile at {location} has no type")
+            new_functions[level_file.tile_coordinate(location)()] = data
+        start = level_file.tile_coordinate(level_file.start)
+        end_cell = level_file.tile_coordinate(level_file.end)()
+        unknown = set(level_file.texture_keys) - level_file.tile_key.keys()
+        if unknown:
+            raise KeyError(f"no texture for {', '.join(sorted(unknown))}")
+        # the textures whose key now points somewhere else
+        changed_keys = {
+            key for key, texture_id in level_file.tile_key.items()
+            if old.tile_key.get(key) != texture_id
+            }
+        changed_ids = {key: level_file.tile_key[key] for key in changed_keys}
+        textures = self.read_textures(changed_ids)
+
+        # layers that changed size or were added are rebuilt whole, the rest
+        # are compared a row at a time
+        rebuilt = {
+            layer_id for layer_id in level_file.layers
+            if old.sizes.get(layer_id) != level_file.sizes[layer_id]
+            }
+        # the old texture numbers in the new numbering
+        translate = array("H", [
+            level_file.texture_numbers.get(key, 0xFFFF)
+            for key in old.texture_keys
+            ])
+        changed_numbers = {
+            level_file.texture_numbers[key] for key in changed_keys
+            if key in level_file.texture_numbers
+            }
+        for layer_id, layer in level_file.layers.items():
+            if layer_id in rebuilt:
+                continue
+            rows = zip(
+                old.layers[layer_id], layer,
+                old.wall_masks[layer_id], level_file.wall_masks[layer_id]
+                )
+            for y, (old_row, row, old_walls, walls) in enumerate(rows):
+                old_row = array("H", map(translate.__getitem__, old_row))
+                if (old_row == row and old_walls == walls
+                        and changed_numbers.isdisjoint(row)):
+                    continue
+                dirty.update(
+                    (layer_id, x, y) for x in range(len(row))
+                    if old_row[x] != row[x] or old_walls[x] != walls[x]
+                    or row[x] in changed_numbers
+                    )
+
+        # functional tiles that were added, removed or changed and the end
+        old_functions = {
+            old.coordinate(location)(): data
+            for location, data in old.functions.items()
+            }
+        dirty.update(
+            cell for cell in old_functions.keys() | new_functions.keys()
+            if old_functions.get(cell) != new_functions.get(cell)
+            )
+        if self.end_cell != end_cell:
+            dirty.update((self.end_cell, end_cell))
+
+        # swapping the new level data in
+        for key in old.tile_key.keys() - level_file.tile_key.keys():
+            self.textures.pop(key, None)
+            self.tile_key.pop(key, None)
+        self.load_textures(changed_ids, textures)
+        self.end_cell = end_cell
+        self.file = level_file
+        self.layers = level_file.layers
+        self.texture_keys = level_file.texture_keys
+        self.wall_masks = level_file.wall_masks
+        self.sizes = level_file.sizes
+        self.max_coord = level_file.max_coord
+        self.entities = level_file.entities
+        self.start = start
+        self.function_cells = new_functions
+
+        for layer_id in old.layers.keys() - level_file.layers.keys():
+            del self.map[layer_id]
+        self.construct_map(rebuilt)
+        for layer_id in rebuilt:
+            width, height = self.sizes[layer_id]
+            dirty.update(
+                (layer_id, x, y) for y in range(height) for x in range(width)
+                )
+        dirty = {cell for cell in dirty if cell[0] in self.layers}
+        for cell in dirty:
+            self.rebuild_tile(*cell)
+
+        # locks that nothing uses any more are thrown away
+        used = {data.get("lock_id") for data in new_functions.values()}
+        used.update((None, ""))
+        for lock_id in self.locks.keys() - used:
+            del self.locks[lock_id]
+        return dirty
+
+    def lock_cells(self, lock_id: str) -> set[tuple[str, int, int]]:
+        """finds the tiles that use a lock
+
+        Args:
+            lock_id (str): the id of the lock
+
+        Returns:
+            set: the (layer, x, y) of every tile using the lock
+        """
+        return {
+            cell for cell, data in self.function_cells.items()
+            if data.get("lock_id") == lock_id
+            }
+
+    def reload_textures(self) -> set[tuple[str, int, int]]:
+        """reloads any textures whose file has changed or that now point to
+        a different file because a tiles.json changed
+
+        Returns:
+            set: the (layer, x, y) of every tile that was rebuilt
+        """
+        changed = {}
+        for key, texture_id in self.tile_key.items():
+            try:
+                paths, _ = Texture.get_frames(texture_id)
+            except (KeyError, OSError, ValueError, TypeError):
+                # a tiles.json in the middle of being edited
+                continue
+            if self.texture_stamps.get(key) != self.texture_stamp(paths):
+                changed[key] = texture_id
+        self.load_textures(changed)
+        dirty = self.cells_with_textures(changed.keys())
+        for cell in dirty:
+            self.rebuild_tile(*cell)
+        return dirty
+
+    def wall_rects(self, layer_id: str) -> list[tuple[int, int, int, int]]:
+        """works out walls that cover the wall mask of a layer, runs of
+        wall on a row are joined with the same run on the rows below
+
+        Args:
+            layer_id (str): the layer to find the walls of
+
+        Returns:
+            list: the (left, top, right, bottom) of each wall, inclusive
+        """
+        rects = []
+        # (left, right): the row the run started on
+        runs = {}
+        masks = self.wall_masks[layer_id]
+        for y, mask in enumerate(masks + [bytearray()]):
+            row_runs = set()
+            start = mask.find(1)
+            while start != -1:
+                end = mask.find(0, start)
+                if end == -1:
+                    end = len(mask)
+                row_runs.add((start, end - 1))
+                start = mask.find(1, end)
+            for run in sorted(runs.keys() - row_runs):
+                rects.append((run[0], runs.pop(run), run[1], y - 1))
+            for run in row_runs:
+                runs.setdefault(run, y)
+        return rects
+
+    def write(self, stream):
+        """writes the level back out in the level file format a row at a
+        time, the walls are written as rectangles covering the wall masks
+
+        Args:
+            stream (TextIO): the stream to write the level to
+        """
+        write = stream.write
+        keys = [json.dumps(key) for key in self.texture_keys]
+        write('{"tile_key": ')
+        write(json.dumps(self.tile_key))
+        write(', "level": {"layers": {')
+        for index, (layer_id, layer) in enumerate(self.layers.items()):
+            write(", " if index else "")
+            write(json.dumps(layer_id))
+            write(": [")
+            for y, row in enumerate(layer):
+                write(",[" if y else "[")
+                write(",".join(map(keys.__getitem__, row)))
+                write("]")
+            write("]")
+        write('}, "walls": [')
+        write(", ".join(
+            f'"{lay},{left}x,{top}y:{lay},{right}x,{bottom}y"'
+            for lay in self.layers
+            for left, top, right, bottom in self.wall_rects(lay)
+            ))
+        write('], "functions": {')
+        write(", ".join(
+            f'"{lay},{x}x,{y}y": {json.dumps(data)}'
+            for (lay, x, y), data in self.function_cells.items()
+            ))
+        write("}, ")
+        if self.entities:
+            write('"entities": ')
+            write(json.dumps(self.entities))
+            write(", ")
+        start = "{},{}x,{}y".format(*self.start())
+        end = "{},{}x,{}y".format(*self.end_cell)
+        write(f'"start": "{start}", "end": "{end}"')
+        write("}}")
+
+    def save(self, path: str = None):
+        """saves the level to a level file, the file is only replaced once
+        the whole level has been written
+
+        Args:
+            path (str, optional): the path to save the level to. Defaults to
+            the file the level was loaded from.
+        """
+        path = self.path if path is None else path
+        # written to a temporary file first so a half written level is never
+        # loaded, even by the hot reloader
+        temporary = f"{path}.tmp"
+        with open(temporary, "w") as level_file:
+            self.write(level_file)
+        os.replace(temporary, path)
+
+    def end(self, game: "Game"):
+        """method for when the player complete the level
+
+        Args:
+            game (Game): the game object the level is running in
+        """
+        next_level = game.levels.next_level(game.level_id)
+        if game.demo_mode:
+            game.finished = True
+            game.show_message(
+                "Level_complete", "Congrats you completed the demo",
+                game.quit
+                )
+        elif next_level is None:
+            game.finished = True
+            game.show_message(
+                "Campaign_complete", "Congrats you completed the campaign",
+                game.quit
+                )
+        else:
+            try:
+                game.load_level(next_level)
+            except MemoryError as error:
+                game.show_message("Level too big", str(error))
+
+
+class LevelManager:
+    def __init__(
+        self, campaign_id: str = None, memory_limit: int = 256 * 2**20,
+        seed: int = None, tile_limit: int = None
+            ):
+        """keeps recently played levels loaded so going back to them doesn't
+        mean reading the level file again, and reads the next level of the
+        campaign in the background while the current one is being played
+
+        Args:
+            campaign_id (str, optional): the full id of the campaign manifest,
+            a json file in the campaigns folder next to the levels that holds
+            the full ids of the campaign's levels in order. Defaults to None.
+            memory_limit (int, optional): roughly how many bytes the loaded
+            levels can take up before the least recently played ones are
+            unloaded. Defaults to 256MiB.
+            seed (int, optional): the seed the random number generator of
+            each level is made from along with the level's id, so a level's
+            codes don't depend on when it was loaded. Defaults to None.
+            tile_limit (int, optional): roughly how many bytes the tile
+            storage of a single level can take up, as estimated from its
+            file before it is built, bigger levels aren't loaded. Defaults to
+            no limit.
+        """
+        self.seed = seed
+        self.order = []
+        if campaign_id is not None:
+            with open(Level.get_campaign_path(campaign_id)) as manifest:
+                self.order = json.load(manifest)["levels"]
+        self.memory_limit = memory_limit
+        self.tile_limit = tile_limit
+        # level id: Level, the least recently played level is first
+        self.levels = OrderedDict()
+        # level id: {lock id: (state, code, fails)} of unloaded levels
+        self.lock_states = {}
+        # level id: random number generator state of unloaded levels
+        self.rng_states = {}
+        # level id: Future of the LevelFile being read in the background,
+        # building the level needs the main thread so it is left until the
+        # level is played rather than stalling the level being played now
+        self.preloads = {}
+        self.current = None
+        self.executor = ThreadPoolExecutor(max_workers=1)
+
+    def get(self, level_id: str) -> Level:
+        """gets a level, loading it if it isn't already loaded
+
+        Args:
+            level_id (str): the full id of the level
+
+        Raises:
+            MemoryError: if the level's tiles would take up more than the
+            tile limit
+
+        Returns:
+            Level: the level
+        """
+        previous, self.current = self.current, level_id
+        if level_id in self.levels:
+            self.levels.move_to_end(level_id)
+            return self.levels[level_id]
+        if level_id in self.preloads:
+            # waiting for the background read to finish
+            level_file = self.preloads.pop(level_id).result()
+        else:
+            level_file = LevelFile(Level.get_path(level_id))
+        try:
+            return self.build(level_id, level_file)
+        except MemoryError:
+            # the level being played is still the current one
+            self.current = previous
+            raise
+
+    def build(self, level_id: str, level_file: LevelFile) -> Level:
+        """builds a level from its level file and adds it to the loaded
+        levels, putting back the state of its locks if it has been played
+        before
+
+        Args:
+            level_id (str): the full id of the level
+            level_file (LevelFile): the read level file
+
+        Raises:
+            MemoryError: if the level's tiles would take up more than the
+            tile limit
+
+        Returns:
+            Level: the level
+        """
+        if (self.tile_limit is not None
+                and level_file.memory_estimate() > self.tile_limit):
+            raise MemoryError(
+                f"the tiles of {level_id} need about "
+                f"{level_file.memory_estimate() / 2**20:.1f}MiB but a level "
+                f"can only use {self.tile_limit / 2**20:.1f}MiB for them"
+                )
+        rng = random.Random(
+            None if self.seed is None else f"{self.seed}:{level_id}"
+            )
+        if level_id in self.rng_states:
+            rng.setstate(self.rng_states.pop(level_id))
+        level = Level(None, level_file.path, level_file, rng)
+        for lock_id, (state, code, fails) in self.lock_states.pop(
+                level_id, {}).items():
+            lock = level.locks.get(lock_id)
+            if lock is not None:
+                lock.state, lock.code, lock.fails = state, code, fails
+        self.levels[level_id] = level
+        self.evict()
+        return level
+
+    def evict(self):
+        """unloads the least recently played levels until the loaded levels
+        fit in the memory limit, the current level is never unloaded
+        """
+        for level_id in list(self.levels):
+            if self.memory_used() <= self.memory_limit:
+                return
+            if level_id == self.current:
+                continue
+            level = self.levels.pop(level_id)
+            self.rng_states[level_id] = level.rng.getstate()
+            self.lock_states[level_id] = {
+                lock_id: (lock.state, lock.code, lock.fails)
+                for lock_id, lock in level.locks.items() if lock is not None
+                }
+
+    def memory_used(self) -> int:
+        """
+        Returns:
+            int: roughly how many bytes the loaded levels take up
+        """
+        return sum(level.memory_estimate() for level in self.levels.values())
+
+    def memory_report(self) -> MemoryReport:
+        """
+        Returns:
+            MemoryReport: what every loaded level takes up together
+        """
+        report = MemoryReport()
+        for level in self.levels.values():
+            report.merge(level.memory_report())
+        return report
+
+    def lock_snapshot(self) -> dict:
+        """
+        Returns:
+            dict: {level id: {lock id: (state, code, fails)}} of every level
+            that has been played
+        """
+        locks = {
+            level_id: dict(states)
+            for level_id, states in self.lock_states.items()
+            }
+        for level_id, level in self.levels.items():
+            locks[level_id] = {
+                lock_id: (lock.state, lock.code, lock.fails)
+                for lock_id, lock in level.locks.items() if lock is not None
+                }
+        return locks
+
+    def rng_snapshot(self) -> dict:
+        """
+        Returns:
+            dict: {level id: random number generator state} of every level
+            that has been played
+        """
+        rngs = dict(self.rng_states)
+        for level_id, level in self.levels.items():
+            rngs[level_id] = level.rng.getstate()
+        return rngs
+
+    def set_states(self, locks: dict, rngs: dict):
+        """puts the locks and random number generators of the levels back to
+        how they were in a lock_snapshot and rng_snapshot
+
+        Args:
+            locks (dict): {level id: {lock id: (state, code, fails)}}
+            rngs (dict): {level id: random number generator state}
+        """
+        for level_id, states in locks.items():
+            if level_id in self.levels:
+                level_locks = self.levels[level_id].locks
+                for lock_id, (state, code, fails) in states.items():
+                    lock = level_locks.get(lock_id)
+                    if lock is not None:
+                        lock.state, lock.code, lock.fails = state, code, fails
+            else:
+                self.lock_states[level_id] = dict(states)
+        for level_id, rng_state in rngs.items():
+            if level_id in self.levels:
+                self.levels[level_id].rng.setstate(rng_state)
+            else:
+                self.rng_states[level_id] = rng_state
+
+    def next_level(self, level_id: str) -> str | None:
+        """gets the level that comes after a level in the campaign
+
+        Args:
+            level_id (str): the full id of the level
+
+        Returns:
+            str | None: the full id of the next level or None if there isn't
+            one
+        """
+        if level_id not in self.order:
+            return None
+        index = self.order.index(level_id) + 1
+        return self.order[index] if index < len(self.order) else None
+
+    def preload(self, level_id: str | None):
+        """starts reading a level file in the background so only the level
+        has to be built from it when the player gets to it
+
+        Args:
+            level_id (str | None): the full id of the level, None does nothing
+        """
+        if (level_id is None or level_id in self.levels
+                or level_id in self.preloads):
+            return
+        self.preloads[level_id] = self.executor.submit(
+            LevelFile, Level.get_path(level_id)
+            )
+
+
+class Thumbnails:
+    # the gap between the layers of a thumbnail in pixels
+    gap = 2
+
+    def __init__(
+        self, size: int = 96, folder: str = None, workers: int = None
+            ):
+        """draws previews of levels on background threads straight from the
+        texture grid of the level file, no Level or Tile objects are made.
+        Every layer of the level is drawn side by side and the finished
+        thumbnail is saved under the hash of the level file so it only has
+        to be drawn again when the level changes
+
+        Args:
+            size (int, optional): the width and height in pixels of the
+            largest layer of a level. Defaults to 96.
+            folder (str, optional): the folder to keep the thumbnails in.
+            Defaults to the cache/thumbnails folder next to the game.
+            workers (int, optional): the number of thumbnails drawn at once.
+            Defaults to as many as ThreadPoolExecutor thinks is sensible.
+        """
+        self.size = size
+        if folder is None:
+            folder = os.path.join(path_to_exe, "cache", "thumbnails")
+        self.folder = folder
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        # level id: (Future of the thumbnail's path, callback)
+        self.pending = {}
+
+        # pixmaps can only be made on the main thread so the finished
+        # thumbnails are checked for while there are any
+        self.timer = QTimer()
+        self.timer.setInterval(50)
+        self.timer.timeout.connect(self.finish)
+
+    def request(self, level_id: str, callback: "function"):
+        """starts getting the thumbnail of a level in the background
+
+        Args:
+            level_id (str): the full id of the level
+            callback (function): called with the level id and the thumbnail
+            as a QPixmap, or None if the level couldn't be drawn
+        """
+        self.pending[level_id] = (
+            self.executor.submit(self.render_cached, Level.get_path(level_id)),
+            callback
+            )
+        self.timer.start()
+
+    def finish(self):
+        """gives the thumbnails that are ready to their callbacks
+        """
+        for level_id, (future, callback) in list(self.pending.items()):
+            if not future.done():
+                continue
+            del self.pending[level_id]
+            path = future.result() if future.exception() is None else None
+            callback(level_id, None if path is None else QPixmap(path))
+        if not self.pending:
+            self.timer.stop()
+
+    def cache_path(self, path: str | bytes) -> str:
+        """works out where the thumbnail of a level file is kept
+
+        Args:
+            path (str | bytes): the path to the level file
+
+        Returns:
+            str: the path to the thumbnail
+        """
+        digest = hashlib.sha1()
+        with open(path, "rb") as level_file:
+            for chunk in iter(lambda: level_file.read(1 << 20), b""):
+                digest.update(chunk)
+        return os.path.join(
+            self.folder, f"{digest.hexdigest()}_{self.size}.png"
+            )
+
+    def render_cached(self, path: str | bytes) -> str | None:
+        """gets the thumbnail of a level file from the cache, drawing and
+        saving it first if it isn't there
+
+        Args:
+            path (str | bytes): the path to the level file
+
+        Returns:
+            str | None: the path to the thumbnail or None if the file isn't a
+            level that can be drawn
+        """
+        try:
+            cached = self.cache_path(path)
+        except OSError:
+            return None
+        if os.path.exists(cached):
+            return cached
+        try:
+            image = self.render(path)
+        except (ValueError, KeyError, OSError):
+            # like a json file that isn't a level
+            return None
+        os.makedirs(self.folder, exist_ok=True)
+        # written to a temporary file first so a half written thumbnail is
+        # never in the cache
+        cache_file = QSaveFile(cached)
+        cache_file.open(QIODevice.OpenModeFlag.WriteOnly)
+        image.save(cache_file, "PNG")
+        cache_file.commit()
+        return cached
+
+    def render(self, path: str | bytes) -> QImage:
+        """draws the thumbnail of a level file, layers that fit in the
+        thumbnail are drawn with their textures and bigger layers with one
+        pixel per few tiles coloured by the average colour of the texture,
+        the pixels are put together as bytes a whole row at a time
+
+        Args:
+            path (str | bytes): the path to the level file
+
+        Returns:
+            QImage: the thumbnail
+        """
+        level_file = LevelFile(path)
+        longest = max(max(size) for size in level_file.sizes.values())
+        cell = self.size // longest
+        if cell > 1:
+            step = 1
+            # every pixel row of every texture shrunk to the size of a cell
+            textures = [
+                self.texture_rows(level_file.tile_key[key], cell)
+                for key in level_file.texture_keys
+                ]
+        else:
+            cell = 1
+            step = longest / self.size
+            textures = [
+                self.texture_rows(level_file.tile_key[key], 1)[0]
+                for key in level_file.texture_keys
+                ]
+
+        # the rows of pixels of every layer as bytes
+        layers = []
+        for layer_id, layer in level_file.layers.items():
+            width, height = level_file.sizes[layer_id]
+            if step == 1:
+                rows = [
+                    b"".join(map(getitem, map(textures.__getitem__, row),
+                                 [line] * width))
+                    for row in layer for line in range(cell)
+                    ]
+            else:
+                # picking every few tiles and swapping them for their colour
+                xs = [int(x * step) for x in range(int(width / step))]
+                rows = [
+                    b"".join(map(textures.__getitem__, map(
+                        layer[int(y * step)].__getitem__, xs
+                        )))
+                    for y in range(int(height / step))
+                    ]
+            if rows and rows[0]:
+                layers.append(rows)
+
+        # putting the layers side by side with a transparent gap between
+        gap = bytes(self.gap * 4)
+        widths = [len(rows[0]) for rows in layers]
+        height = max(len(rows) for rows in layers)
+        data = bytearray()
+        for y in range(height):
+            data += gap.join(
+                rows[y] if y < len(rows) else bytes(width)
+                for rows, width in zip(layers, widths)
+                )
+        line = sum(widths) + len(gap) * (len(layers) - 1)
+        return QImage(
+            bytes(data), line // 4, height, line, QImage.Format.Format_ARGB32
+            ).copy()
+
+    def texture_rows(self, texture_id: str, cell: int) -> list[bytes]:
+        """shrinks a texture down to the size of a cell of the thumbnail
+
+        Args:
+            texture_id (str): the full id of the texture
+            cell (int): the width and height of a cell in pixels
+
+        Returns:
+            list: the rows of pixels of the shrunk texture as bytes
+        """
+        texture = QImage(Texture.get_path(texture_id))
+        if texture.isNull():
+            return [bytes(cell * 4)] * cell
+        texture = texture.scaled(
+            cell, cell, Qt.AspectRatioMode.IgnoreAspectRatio,
+            Qt.TransformationMode.SmoothTransformation
+            ).convertToFormat(QImage.Format.Format_ARGB32)
+        pixels = bytes(texture.constBits())
+        line = texture.bytesPerLine()
+        return [
+            pixels[y * line:y * line + cell * 4] for y in range(cell)
+            ]
+
+
+class Snapshot:
+    magic = b"CMSV"
+    version = 1
+
+    def __init__(
+        self, level_id: str, layer: str, x: int, y: int,
+        visited_layers: list[str], locks: dict
+            ):
+        """everything needed to put a game back the way it was, the level
+        itself isn't stored so restoring only needs the level to be loaded
+
+        Args:
+            level_id (str): the full id of the level being played
+            layer (str): the layer the player is on
+            x (int): the x coordinate of the player
+            y (int): the y coordinate of the player
+            visited_layers (list): the layers of the level the player has been
+            on
+            locks (dict): {level id: {lock id: (state, code, fails)}} for
+            every level the player has played
+        """
+        self.level_id = level_id
+        self.layer = layer
+        self.x = x
+        self.y = y
+        self.visited_layers = visited_layers
+        self.locks = locks
+
+    def to_bytes(self) -> bytes:
+        """packs the snapshot into a compact binary form, strings are stored
+        as their length followed by their utf-8 bytes
+
+        Returns:
+            bytes: the packed snapshot
+        """
+        def text(value: str) -> bytes:
+            encoded = value.encode()
+            return struct.pack("<H", len(encoded)) + encoded
+
+        parts = [
+            struct.pack("<4sB", self.magic, self.version),
+            text(self.level_id), text(self.layer),
+            struct.pack("<IIH", self.x, self.y, len(self.visited_layers))
+            ]
+        parts.extend(text(layer) for layer in self.visited_layers)
+        parts.append(struct.pack("<H", len(self.locks)))
+        for level_id, locks in self.locks.items():
+            parts.append(text(level_id))
+            parts.append(struct.pack("<H", len(locks)))
+            for lock_id, (state, code, fails) in locks.items():
+                parts.extend((
+                    text(lock_id), struct.pack("<?B", state, fails), text(code)
+                    ))
+        return b"".join(parts)
+
+    def from_bytes(data: bytes) -> "Snapshot":
+        """Static method to unpack a snapshot packed by to_bytes
+
+        Args:
+            data (bytes): the packed snapshot
+
+        Raises:
+            ValueError: if the data isn't a snapshot this version of the game
+            can read
+
+        Returns:
+            Snapshot: the unpacked snapshot
+        """
+        offset = 0
+
+        def unpack(layout: str) -> tuple:
+            nonlocal offset
+            values = struct.unpack_from(layout, data, offset)
+            offset += struct.calcsize(layout)
+            return values
+
+        def text() -> str:
+            nonlocal offset
+            length, = unpack("<H")
+            offset += length
+            if offset > len(data):
+                raise ValueError("the snapshot is corrupted")
+            return data[offset - length:offset].decode()
+
+        try:
+            magic, version = unpack("<4sB")
+            if magic != Snapshot.magic or version != Snapshot.version:
+                raise ValueError("not a snapshot this game can read")
+            level_id, layer = text(), text()
+            x, y, visited_count = unpack("<IIH")
+            visited_layers = [text() for _ in range(visited_count)]
+            locks = {}
+            for _ in range(unpack("<H")[0]):
+                level_locks = locks[text()] = {}
+                for _ in range(unpack("<H")[0]):
+                    lock_id = text()
+                    state, fails = unpack("<?B")
+                    level_locks[lock_id] = (state, text(), fails)
+        except (struct.error, UnicodeDecodeError) as error:
+            raise ValueError("the snapshot is corrupted") from error
+        return Snapshot(level_id, layer, x, y, visited_layers, locks)
+
+
+class Recording:
+    magic = b"CMRC"
+    version = 2
+    # the inputs that can be recorded, stored as their position in here
+    inputs = ("up", "down", "left", "right", "code")
+
+    # a random number generator state, its version, the Mersenne Twister's
+    # words and position and whether it has a gauss value waiting and what
+    rng_layout = "<B625I?d"
+
+    def __init__(
+        self, seed: int, level_id: str, demo_mode: bool = False,
+        locks: dict = None, rngs: dict = None
+            ):
+        """a recording of every input of a game along with the seed and the
+        state of the levels needed to play it back exactly the same
+
+        Args:
+            seed (int): the seed the game was started with
+            level_id (str): the full id of the level the recording starts on
+            demo_mode (bool, optional): whether the game was in demo mode.
+            Defaults to False.
+            locks (dict, optional): {level id: {lock id: (state, code,
+            fails)}} of the levels played before the recording started.
+            Defaults to none.
+            rngs (dict, optional): {level id: random number generator state}
+            of the levels played before the recording started. Defaults to
+            none.
+        """
+        self.seed = seed
+        self.level_id = level_id
+        self.demo_mode = demo_mode
+        self.locks = {} if locks is None else locks
+        self.rngs = {} if rngs is None else rngs
+        self.ticks = array("I")
+        self.inputs_made = array("B")
+        # (lock id, code) of every code input in the order they were made
+        self.codes = []
+
+    def record(self, tick: int, made: str, code: tuple[str, str] = None):
+        """adds an input to the recording
+
+        Args:
+            tick (int): the tick of the game clock the input was made on
+            made (str): the input that was made, one of Recording.inputs
+            code (tuple, optional): the lock id and code of a code input.
+            Defaults to None.
+        """
+        self.ticks.append(tick)
+        self.inputs_made.append(self.inputs.index(made))
+        if code is not None:
+            self.codes.append(code)
+
+    def __len__(self) -> int:
+        return len(self.ticks)
+
+    def __iter__(self):
+        codes = iter(self.codes)
+        for tick, made in zip(self.ticks, self.inputs_made):
+            made = self.inputs[made]
+            yield tick, made, next(codes) if made == "code" else None
+
+    def to_bytes(self) -> bytes:
+        """packs the recording into a compact binary form, the ticks and
+        inputs are stored as raw arrays so each input takes five bytes. The
+        locks the recording starts with are stored as a snapshot, followed by
+        the random number generators
+
+        Returns:
+            bytes: the packed recording
+        """
+        level_id = self.level_id.encode()
+        codes = "\n".join(
+            f"{lock_id}\t{code}" for lock_id, code in self.codes
+            ).encode()
+        locks = Snapshot(self.level_id, "", 0, 0, [], self.locks).to_bytes()
+        rngs = [struct.pack("<H", len(self.rngs))]
+        for rng_level_id, (version, words, gauss) in self.rngs.items():
+            encoded = rng_level_id.encode()
+            rngs.append(struct.pack("<H", len(encoded)) + encoded)
+            rngs.append(struct.pack(
+                self.rng_layout, version, *words, gauss is not None,
+                gauss or 0.0
+                ))
+        rngs = b"".join(rngs)
+        return b"".join((
+            struct.pack(
+                "<4sBQ?HIIII", self.magic, self.version, self.seed,
+                self.demo_mode, len(level_id), len(self), len(codes),
+                len(locks), len(rngs)
+                ),
+            level_id, self.ticks.tobytes(), self.inputs_made.tobytes(), codes,
+            locks, rngs
+            ))
+
+    def unpack_rngs(data: bytes) -> dict:
+        """Static method to unpack the random number generators packed by
+        to_bytes
+
+        Args:
+            data (bytes): the packed random number generators
+
+        Raises:
+            struct.error: if the data is cut short
+
+        Returns:
+            dict: {level id: random number generator state}
+        """
+        count, = struct.unpack_from("<H", data)
+        offset = 2
+        rngs = {}
+        for _ in range(count):
+            length, = struct.unpack_from("<H", data, offset)
+            offset += 2
+            level_id = data[offset:offset + length].decode()
+            offset += length
+            version, *words, has_gauss, gauss = struct.unpack_from(
+                Recording.rng_layout, data, offset
+                )
+            offset += struct.calcsize(Recording.rng_layout)
+            rngs[level_id] = (
+                version, tuple(words), gauss if has_gauss else None
+                )
+        if offset != len(data):
+            raise struct.error("the random number generators are corrupted")
+        return rngs
+
+    def from_bytes(data: bytes) -> "Recording":
+        """Static method to unpack a recording packed by to_bytes
+
+        Args:
+            data (bytes): the packed recording
+
+        Raises:
+            ValueError: if the data isn't a recording this version of the
+            game can read
+
+        Returns:
+            Recording: the unpacked recording
+        """
+        layout = "<4sBQ?HIIII"
+        try:
+            (
+                magic, version, seed, demo_mode, id_length, count,
+                codes_length, locks_length, rngs_length
+            ) = struct.unpack_from(layout, data)
+        except struct.error as error:
+            raise ValueError("the recording is corrupted") from error
+        if magic != Recording.magic or version != Recording.version:
+            raise ValueError("not a recording this game can read")
+        offset = struct.calcsize(layout)
+        ticks_size = count * array("I").itemsize
+        if len(data) != (offset + id_length + ticks_size + count
+                         + codes_length + locks_length + rngs_length):
+            raise ValueError("the recording is corrupted")
+
+        level_id = data[offset:offset + id_length].decode()
+        recording = Recording(seed, level_id, demo_mode)
+        offset += id_length
+        recording.ticks.frombytes(data[offset:offset + ticks_size])
+        offset += ticks_size
+        recording.inputs_made.frombytes(data[offset:offset + count])
+        offset += count
+        if codes_length:
+            recording.codes = [
+                tuple(line.split("\t", 1)) for line in
+                data[offset:offset + codes_length].decode().split("\n")
+                ]
+        offset += codes_length
+        recording.locks = Snapshot.from_bytes(
+            data[offset:offset + locks_length]
+            ).locks
+        offset += locks_length
+        try:
+            recording.rngs = Recording.unpack_rngs(data[offset:])
+        except (struct.error, UnicodeDecodeError) as error:
+            raise ValueError("the recording is corrupted") from error
+        return recording
+
+    def save(self, path: str):
+        """writes the recording to a file
+
+        Args:
+            path (str): the path of the file
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "wb") as recording_file:
+            recording_file.write(self.to_bytes())
+
+    def load(path: str) -> "Recording":
+        """Static method to read a recording from a file
+
+        Args:
+            path (str): the path of the file
+
+        Returns:
+            Recording: the recording
+        """
+        with open(path, "rb") as recording_file:
+            return Recording.from_bytes(recording_file.read())
+
+
+class PathFinder:
+    # the most distance fields kept at once
+    cache_size = 8
+    # the distance of tiles that can't be reached
+    unreached = 0xFFFFFFFF
+    # what the tiles of the passability grid can be
+    BLOCKED, OPEN, THROUGH = 0, 1, 2
+
+    def __init__(self):
+        """finds the shortest path for the player to walk to a tile. The
+        distance to a tile from every tile of its layer is worked out once
+        and kept until the tiles the player can walk on change, such as when
+        the lock of a through door is unlocked
+        """
+        self.level = None
+        # layer: bytearray with one of BLOCKED, OPEN or THROUGH for each tile
+        # a row at a time
+        self.passable = {}
+        # (layer, index of the target tile): array of distances to the
+        # target, the least recently used is first
+        self.fields = OrderedDict()
+
+    def invalidate(self, layer_ids: set[str] = None):
+        """forgets what is known about layers whose tiles have changed
+
+        Args:
+            layer_ids (set, optional): the layers that changed. Defaults to
+            every layer.
+        """
+        if layer_ids is None:
+            self.passable.clear()
+            self.fields.clear()
+            return
+        for layer_id in layer_ids:
+            self.passable.pop(layer_id, None)
+        for key in [key for key in self.fields if key[0] in layer_ids]:
+            del self.fields[key]
+
+    def passability(self, layer_id: str) -> bytearray:
+        """gets which tiles of a layer the player can walk on
+
+        Args:
+            layer_id (str): the layer
+
+        Returns:
+            bytearray: the passability of each tile a row at a time
+        """
+        if layer_id in self.passable:
+            return self.passable[layer_id]
+        level = self.level
+        width, _ = level.sizes[layer_id]
+        # every tile that isn't a wall is open apart from functional tiles
+        grid = bytearray().join(level.wall_masks[layer_id]).translate(
+            bytes.maketrans(b"\x00\x01", b"\x01\x00")
+            )
+        cells = list(level.function_cells) + [level.end_cell]
+        for lay, x, y in cells:
+            if lay != layer_id:
+                continue
+            tile = level.map[lay][y][x]
+            if tile.function == "through-door" and not tile.locked():
+                grid[y * width + x] = self.THROUGH
+            else:
+                grid[y * width + x] = self.BLOCKED
+        self.passable[layer_id] = grid
+        return grid
+
+    def moves(self, grid: bytearray, width: int, index: int):
+        """the tiles the player can get to in one step
+
+        Args:
+            grid (bytearray): the passability of the layer
+            width (int): the width of the layer
+            index (int): the index of the tile the player is on
+
+        Yields:
+            tuple: the direction name and the index of the tile they end up
+            on
+        """
+        x = index % width
+        for name, step, room in (
+                ("right", 1, width - 1 - x), ("left", -1, x),
+                ("down", width, len(grid)), ("up", -width, len(grid))):
+            if room < 1:
+                continue
+            next_index = index + step
+            if not 0 <= next_index < len(grid):
+                continue
+            if grid[next_index] == self.OPEN:
+                yield name, next_index
+            elif grid[next_index] == self.THROUGH and room >= 2:
+                # through doors take the player to the tile past them
+                beyond = next_index + step
+                if 0 <= beyond < len(grid) and grid[beyond] == self.OPEN:
+                    yield name, beyond
+
+    def field(
+        self, layer_id: str, target: int, until: int = None
+            ) -> array:
+        """gets the distance field of a tile, the number of steps from every
+        tile to the tile or next to it if it can't be walked onto. The field
+        is only worked out as far as it needs to be and carries on from
+        there the next time it is needed
+
+        Args:
+            layer_id (str): the layer of the tile
+            target (int): the index of the tile
+            until (int, optional): the index of the tile whose distance is
+            wanted. Defaults to the whole layer.
+
+        Returns:
+            array: the distances of every tile a row at a time
+        """
+        key = (layer_id, target)
+        grid = self.passability(layer_id)
+        width, _ = self.level.sizes[layer_id]
+        if key in self.fields:
+            self.fields.move_to_end(key)
+        else:
+            distances = array("I", [self.unreached]) * len(grid)
+            if grid[target] == self.OPEN:
+                sources = [target]
+            else:
+                sources = [
+                    index for name, index in self.moves(grid, width, target)
+                    if index - target in (1, -1, width, -width)
+                    ]
+            for index in sources:
+                distances[index] = 0
+            # the distances, the furthest tiles reached so far and how far
+            # they are
+            self.fields[key] = [distances, sources, 0]
+            if len(self.fields) > self.cache_size:
+                self.fields.popitem(last=False)
+        entry = self.fields[key]
+        distances, ring, distance = entry
+
+        # every move can be made backwards so searching out from the target
+        # gives the distance from every tile to it, a whole ring of tiles at
+        # a time. The moves are written out here rather than using moves as
+        # this is run for every tile of the layer
+        unreached, OPEN, THROUGH = self.unreached, self.OPEN, self.THROUGH
+        size = len(grid)
+        while ring and (until is None or distances[until] == unreached):
+            distance += 1
+            next_ring = []
+            for index in ring:
+                x = index % width
+                for step, room in (
+                        (1, width - 1 - x), (-1, x),
+                        (width, size), (-width, size)):
+                    next_index = index + step
+                    if room < 1 or not 0 <= next_index < size:
+                        continue
+                    kind = grid[next_index]
+                    if kind == THROUGH and room >= 2:
+                        next_index += step
+                        if not 0 <= next_index < size:
+                            continue
+                        kind = grid[next_index]
+                    elif kind == THROUGH:
+                        continue
+                    if kind == OPEN and distances[next_index] == unreached:
+                        distances[next_index] = distance
+                        next_ring.append(next_index)
+            ring = next_ring
+        entry[1:] = ring, distance
+        return distances
+
+    def path(
+        self, level: "Level", layer_id: str, start: tuple[int, int],
+        target: tuple[int, int]
+            ) -> list[str] | None:
+        """finds the shortest way for the player to walk to a tile, if the
+        tile can't be walked onto the last step is into it so it does
+        whatever it does
+
+        Args:
+            level (Level): the level being played
+            layer_id (str): the layer the player is on
+            start (tuple): the x and y of the player
+            target (tuple): the x and y of the tile to walk to
+
+        Returns:
+            list | None: the direction names of each step or None if the tile
+            can't be reached
+        """
+        if level is not self.level:
+            self.level = level
+            self.invalidate()
+        width, height = level.sizes[layer_id]
+        if not (0 <= target[0] < width and 0 <= target[1] < height):
+            return None
+        target_index = target[1] * width + target[0]
+        index = start[1] * width + start[0]
+        distances = self.field(layer_id, target_index, index)
+        if distances[index] == self.unreached:
+            return None
+        grid = self.passability(layer_id)
+        names = []
+        # following the distances down to the target
+        while distances[index]:
+            for name, next_index in self.moves(grid, width, index):
+                if distances[next_index] == distances[index] - 1:
+                    names.append(name)
+                    index = next_index
+                    break
+        if index != target_index:
+            names.append({
+                1: "right", -1: "left", width: "down", -width: "up"
+                }[target_index - index])
+        return names
+
+    def memory_report(self) -> MemoryReport:
+        """
+        Returns:
+            MemoryReport: the passability grids and distance fields kept
+        """
+        report = MemoryReport()
+        report.add_objects("caches", self.passable.values())
+        report.add_objects("caches", self.fields.values())
+        return report
+
+
+class FogOfWar:
+    # the octants around the player, each as the multipliers that turn the
+    # distance along and across the octant into x and y
+    octants = (
+        (1, 0, 0, 1), (0, 1, 1, 0), (0, -1, 1, 0), (-1, 0, 0, 1),
+        (-1, 0, 0, -1), (0, -1, -1, 0), (0, 1, -1, 0), (1, 0, 0, -1)
+        )
+    # what a tile can be to the player
+    HIDDEN, EXPLORED, VISIBLE = 0, 1, 2
+
+    def __init__(self, radius: int = SIGHT_RADIUS):
+        """hides the parts of a level the player hasn't seen, walls block the
+        player's sight. What the player can see is worked out by
+        shadowcasting from where they are every time they move so only the
+        tiles within sight of the player are looked at
+
+        Args:
+            radius (int, optional): how many tiles away the player can see.
+            Defaults to SIGHT_RADIUS.
+        """
+        self.radius = radius
+        self.level = None
+        # (level id, layer): bytearray with a 1 for every tile that has been
+        # seen a row at a time
+        self.explored = {}
+        # layer: bytearray with a 1 for every wall a row at a time
+        self.opaque = {}
+        # the layer and the indices of the tiles the player can see now
+        self.visible_layer = None
+        self.visible = set()
+        # QIcon cache key: the darker icon of a tile that isn't in sight
+        self.dimmed = {}
+
+    def invalidate(self, layer_ids: set[str] = None):
+        """forgets where the walls of layers are after they have changed
+
+        Args:
+            layer_ids (set, optional): the layers that changed. Defaults to
+            every layer.
+        """
+        if layer_ids is None:
+            self.opaque.clear()
+        else:
+            for layer_id in layer_ids:
+                self.opaque.pop(layer_id, None)
+
+    def update(
+        self, level_id: str, level: "Level", layer_id: str, x: int, y: int
+            ) -> set[tuple[str, int, int]]:
+        """works out what the player can see from where they are
+
+        Args:
+            level_id (str): the full id of the level
+            level (Level): the level
+            layer_id (str): the layer the player is on
+            x (int): the x coordinate of the player
+            y (int): the y coordinate of the player
+
+        Returns:
+            set: the (layer, x, y) of the tiles of the player's layer that
+            came into or went out of sight
+        """
+        if level is not self.level:
+            self.level = level
+            self.invalidate()
+            self.visible = set()
+        width, height = level.sizes[layer_id]
+        if layer_id not in self.opaque:
+            self.opaque[layer_id] = bytearray().join(
+                level.wall_masks[layer_id]
+                )
+        key = (level_id, layer_id)
+        if len(self.explored.get(key, b"")) != width * height:
+            self.explored[key] = bytearray(width * height)
+        explored = self.explored[key]
+
+        visible = {y * width + x}
+        for octant in self.octants:
+            self.cast(
+                self.opaque[layer_id], width, height, x, y, 1, 1.0, 0.0,
+                octant, visible
+                )
+        if layer_id != self.visible_layer:
+            changed = visible
+        else:
+            changed = visible.symmetric_difference(self.visible)
+        self.visible_layer = layer_id
+        self.visible = visible
+        for index in visible:
+            explored[index] = 1
+        return {
+            (layer_id, index % width, index // width) for index in changed
+            }
+
+    def cast(
+        self, opaque: bytearray, width: int, height: int, origin_x: int,
+        origin_y: int, row: int, start: float, end: float,
+        octant: tuple[int, int, int, int], visible: set[int]
+            ):
+        """finds the tiles the player can see in one octant, the rows of the
+        octant are gone through moving out from the player and the parts of
+        the octant behind a wall are looked at separately
+
+        Args:
+            opaque (bytearray): the walls of the layer
+            width (int): the width of the layer
+            height (int): the height of the layer
+            origin_x (int): the x coordinate of the player
+            origin_y (int): the y coordinate of the player
+            row (int): the distance of the first row to look at
+            start (float): the slope the part of the octant being looked at
+            starts at
+            end (float): the slope it ends at
+            octant (tuple): the multipliers of the octant
+            visible (set): the indices of the tiles that can be seen, added
+            to as they are found
+        """
+        if start < end:
+            return
+        xx, xy, yx, yy = octant
+        radius_squared = self.radius * self.radius
+        new_start = start
+        for distance in range(row, self.radius + 1):
+            across = -distance - 1
+            along = -distance
+            blocked = False
+            while across <= 0:
+                across += 1
+                x = origin_x + across * xx + along * xy
+                y = origin_y + across * yx + along * yy
+                left_slope = (across - 0.5) / (along + 0.5)
+                right_slope = (across + 0.5) / (along - 0.5)
+                if start < right_slope:
+                    continue
+                if end > left_slope:
+                    break
+                inside = 0 <= x < width and 0 <= y < height
+                if inside and across * across + along * along < radius_squared:
+                    visible.add(y * width + x)
+                wall = not inside or opaque[y * width + x]
+                if blocked:
+                    if wall:
+                        new_start = right_slope
+                    else:
+                        blocked = False
+                        start = new_start
+                elif wall and distance < self.radius:
+                    # the part of the octant past the wall is looked at on
+                    # its own
+                    blocked = True
+                    self.cast(
+                        opaque, width, height, origin_x, origin_y,
+                        distance + 1, start, left_slope, octant, visible
+                        )
+                    new_start = right_slope
+            if blocked:
+                break
+
+    def state(self, level_id: str, layer_id: str, x: int, y: int) -> int:
+        """gets whether a tile is hidden, has been seen or can be seen
+
+        Args:
+            level_id (str): the full id of the level
+            layer_id (str): the layer the tile is in
+            x (int): the x coordinate of the tile
+            y (int): the y coordinate of the tile
+
+        Returns:
+            int: one of HIDDEN, EXPLORED or VISIBLE
+        """
+        width = self.level.sizes[layer_id][0]
+        index = y * width + x
+        if layer_id == self.visible_layer and index in self.visible:
+            return self.VISIBLE
+        explored = self.explored.get((level_id, layer_id))
+        if explored is not None and explored[index]:
+            return self.EXPLORED
+        return self.HIDDEN
+
+    def dim(self, icon: QIcon) -> QIcon:
+        """gets a darker version of an icon for tiles that have been seen
+        but aren't in sight
+
+        Args:
+            icon (QIcon): the icon of the tile
+
+        Returns:
+            QIcon: the darker icon
+        """
+        key = icon.cacheKey()
+        if key not in self.dimmed:
+            sizes = icon.availableSizes()
+            pixmap = icon.pixmap(sizes[0] if sizes else QSize(32, 32))
+            painter = QPainter(pixmap)
+            painter.fillRect(pixmap.rect(), QColor(0, 0, 0, 150))
+            painter.end()
+            self.dimmed[key] = QIcon(pixmap)
+        return self.dimmed[key]
+
+    def memory_report(self) -> MemoryReport:
+        """
+        Returns:
+            MemoryReport: the explored and wall grids and the darker icons
+        """
+        report = MemoryReport()
+        report.add_objects("fog of war", self.explored.values())
+        report.add_objects("fog of war", self.opaque.values())
+        for icon in self.dimmed.values():
+            size = icon.availableSizes()[0]
+            report.add(
+                "fog icons", ICON_BYTES + size.width() * size.height() * 4
+                )
+        return report
+
+
+class EntityActor:
+    __slots__ = ("entities", "game", "index")
+    # tiles only ask the player for codes, save the game and end the level
+    is_player = False
+
+    def __init__(self, entities: "Entities"):
+        """stands in for whichever entity is taking its step so tiles can
+        treat it the same way they treat the player
+
+        Args:
+            entities (Entities): the entities the actor moves
+        """
+        self.entities = entities
+        self.game = entities.game
+        self.index = 0
+
+    def move(self, direction: str, ammount: int = 1):
+        """moves the entity in the specified direction if nobody is there
+
+        Args:
+            direction (str): the direction to move the entity
+            ammount (int, optional): the number of tiles to move the entity.
+            Defaults to 1.
+        """
+        entities = self.entities
+        index = self.index
+        d_x, d_y = entities.offsets[direction]
+        entities.place(
+            index, entities.layers[index],
+            entities.xs[index] + d_x * ammount,
+            entities.ys[index] + d_y * ammount
+            )
+
+    def teleport(self, new_coord: Coordinate):
+        """moves the entity to the specified coordinate if nobody is there
+
+        Args:
+            new_coord (Coordinate): the position and layer to move the entity
+            to
+        """
+        self.entities.place(self.index, *new_coord())
+
+    def dialog(self, dialog: str):
+        """the guards can't read
+
+        Args:
+            dialog (str): the message the player would have been shown
+        """
+        pass
+
+
+class Entities:
+    KINDS = ("guard",)
+    # screen directions, y = 0 is at the top
+    headings = ("up", "right", "down", "left")
+    offsets = {
+        "up": (0, -1), "right": (1, 0), "down": (0, 1), "left": (-1, 0)
+        }
+    # the number of ticks between the steps of an entity, the entities take
+    # it in turns so only one in every period of them moves on a tick
+    period = TICK_RATE // 4
+    # the chance of an entity picking a new direction after a step
+    turn_chance = 0.1
+    texture = None
+
+    def __init__(self, game: "Game", rng: random.Random):
+        """everyone in the level but the player, stored as arrays rather
+        than an object each so there can be hundreds of them
+
+        Args:
+            game (Game): the game the entities are in, its level says where
+            they start
+            rng (random.Random): decides where the entities wander
+        """
+        if Entities.texture is None:
+            Entities.texture = Entities.tinted(
+                Player.texture, QColor(192, 57, 43, 150)
+                )
+        self.game = game
+        self.rng = rng
+        self.spawns = game.level.entities
+        self.kinds = array("B")
+        self.layers = []
+        self.xs = array("i")
+        self.ys = array("i")
+        self.facing = array("B")
+        # the spatial hash, layer: {y * width + x: entity} of every tile
+        # someone is standing on
+        self.occupancy = {
+            layer_id: {} for layer_id in game.level.sizes
+            }
+        self.widths = {
+            layer_id: size[0] for layer_id, size in game.level.sizes.items()
+            }
+        # the (layer, x, y) of every tile an entity left or entered since
+        # they were last drawn
+        self.changed = set()
+        self.ticks = 0
+        self.actor = EntityActor(self)
+
+        level = game.level
+        for spawn in self.spawns:
+            layer, x, y = level.coordinate(spawn["at"])()
+            self.add(spawn.get("kind", "guard"), layer, x, y)
+        self.changed.clear()
+
+    def __len__(self) -> int:
+        return len(self.xs)
+
+    def tinted(pixmap: QPixmap, colour: QColor) -> QIcon:
+        """Static method to get a copy of a texture with a colour laid over
+        it
+
+        Args:
+            pixmap (QPixmap): the texture to tint
+            colour (QColor): the colour to lay over the texture
+
+        Returns:
+            QIcon: the tinted texture
+        """
+        pixmap = QPixmap(pixmap)
+        painter = QPainter(pixmap)
+        painter.setCompositionMode(
+            QPainter.CompositionMode.CompositionMode_SourceAtop
+            )
+        painter.fillRect(pixmap.rect(), colour)
+        painter.end()
+        return QIcon(pixmap)
+
+    def add(self, kind: str, layer: str, x: int, y: int) -> int | None:
+        """adds an entity to the level
+
+        Args:
+            kind (str): what the entity is, one of KINDS
+            layer (str): the layer the entity starts on
+            x (int): the x coordinate the entity starts at
+            y (int): the y coordinate the entity starts at
+
+        Raises:
+            ValueError: if the kind isn't known
+
+        Returns:
+            int | None: the index of the entity or None if someone was already
+            standing there
+        """
+        if kind not in self.KINDS:
+            raise ValueError(f"there is no kind of entity called {kind!r}")
+        if not self.free(layer, x, y):
+            return None
+        index = len(self.xs)
+        self.kinds.append(self.KINDS.index(kind))
+        self.layers.append(layer)
+        self.xs.append(x)
+        self.ys.append(y)
+        self.facing.append(self.rng.randrange(4))
+        self.occupancy[layer][y * self.widths[layer] + x] = index
+        self.changed.add((layer, x, y))
+        return index
+
+    def at(self, layer: str, x: int, y: int) -> int | None:
+        """finds who is standing on a tile
+
+        Args:
+            layer (str): the layer of the tile
+            x (int): the x coordinate of the tile
+            y (int): the y coordinate of the tile
+
+        Returns:
+            int | None: the index of the entity on the tile or None
+        """
+        cells = self.occupancy.get(layer)
+        if cells is None:
+            return None
+        return cells.get(y * self.widths[layer] + x)
+
+    def free(self, layer: str, x: int, y: int) -> bool:
+        """checks whether an entity could stand on a tile
+
+        Args:
+            layer (str): the layer of the tile
+            x (int): the x coordinate of the tile
+            y (int): the y coordinate of the tile
+
+        Returns:
+            bool: whether nobody, not even the player, is on the tile
+        """
+        player = self.game.player
+        if (player is not None and player.layer == layer
+                and player.x == x and player.y == y):
+            return False
+        return self.at(layer, x, y) is None
+
+    def place(self, index: int, layer: str, x: int, y: int) -> bool:
+        """moves an entity to a tile if nobody is there
+
+        Args:
+            index (int): the index of the entity
+            layer (str): the layer of the tile
+            x (int): the x coordinate of the tile
+            y (int): the y coordinate of the tile
+
+        Returns:
+            bool: whether the entity moved
+        """
+        if not self.free(layer, x, y):
+            return False
+        old_layer = self.layers[index]
+        old_x, old_y = self.xs[index], self.ys[index]
+        del self.occupancy[old_layer][old_y * self.widths[old_layer] + old_x]
+        self.occupancy[layer][y * self.widths[layer] + x] = index
+        self.layers[index], self.xs[index], self.ys[index] = layer, x, y
+        self.changed.add((old_layer, old_x, old_y))
+        self.changed.add((layer, x, y))
+        return True
+
+    def tick(self):
+        """runs one fixed timestep, the entities whose turn it is try to
+        step the way they are facing through the same tiles the player uses
+        and pick a new direction when they bump into something
+        """
+        level = self.game.level
+        actor = self.actor
+        headings = self.headings
+        offsets = self.offsets
+        layers, xs, ys, facing = self.layers, self.xs, self.ys, self.facing
+        chance = self.rng.random
+        for index in range(self.ticks % self.period, len(xs), self.period):
+            layer, x, y = layers[index], xs[index], ys[index]
+            heading = headings[facing[index]]
+            d_x, d_y = offsets[heading]
+            width, height = level.sizes[layer]
+            if 0 <= x + d_x < width and 0 <= y + d_y < height:
+                actor.index = index
+                level.map[layer][y + d_y][x + d_x].attempt_entry(
+                    actor, heading
+                    )
+            if ((xs[index], ys[index], layers[index]) == (x, y, layer)
+                    or chance() < self.turn_chance):
+                facing[index] = self.rng.randrange(4)
+        self.ticks += 1
+
+    def cells(self) -> set[tuple[str, int, int]]:
+        """
+        Returns:
+            set: the (layer, x, y) of every tile someone is standing on
+        """
+        return set(zip(self.layers, self.xs, self.ys))
+
+    def take_changed(self) -> set[tuple[str, int, int]]:
+        """
+        Returns:
+            set: the (layer, x, y) of every tile an entity left or entered
+            since this was last called
+        """
+        changed = self.changed
+        self.changed = set()
+        return changed
+
+    def memory_report(self) -> MemoryReport:
+        """
+        Returns:
+            MemoryReport: the arrays of the entities and their spatial hash
+        """
+        report = MemoryReport()
+        report.add_objects("entities", (
+            self.kinds, self.layers, self.xs, self.ys, self.facing
+            ))
+        report.add_objects("entities", self.occupancy.values())
+        return report
+
+
+class Game:
+    #     x, y, name
+    UP = (0, 1, "up")
+    DOWN = (0, -1, "down")
+    LEFT = (-1, 0, "left")
+    RIGHT = (1, 0, "right")
+    DIRECTIONS = {
+        direction[2]: direction for direction in (UP, DOWN, LEFT, RIGHT)
+        }
+
+    def __init__(
+        self, window: QMainWindow, demo_mode: bool = False,
+        seed: int = None, headless: bool = False
+            ):
+        """constructor class of the game
+
+        Args:
+            window (QMainWindow): the window the game is running in
+            demo_mode (bool, optional): whether to play the demo instead of
+            the campaign. Defaults to False.
+            seed (int, optional): the seed for the random parts of the game,
+            like the codes of locks. Defaults to a random seed.
+            headless (bool, optional): whether the game is being run without
+            anyone watching it, such as when replaying a recording as fast as
+            possible, no dialogs are shown and the keys work even when the
+            game tab isn't open. Defaults to False.
+        """
+        self.displays = {
+            y: {} for y in range(MAX_SIZE)
+        }
+        self.level = None
+        self.level_id = None
+        self.player = None
+        self.visited_layers = set()
+
+        self.seed = random.randrange(2**32) if seed is None else seed
+        self.headless = headless
+        self.show_dialogs = not headless
+        self.finished = False
+        # the game clock that inputs are recorded against
+        self.clock = QElapsedTimer()
+        self.clock.start()
+        self.recording = None
+        # turned off while a recording is being replayed
+        self.record_inputs = True
+        # the messages and keypad shown over the map, set by the window
+        self.overlay = None
+        # the minimap of the player's layer, set by the window
+        self.minimap = None
+        # the level, layer and camera origin the displays were last drawn
+        # with and where the player was drawn
+        self.view = None
+        self.drawn_player = None
+        # (column, row): the icon each display is showing, a display isn't
+        # given its icon again if it is already showing it
+        self.shown = {}
+        # while the steps of a walk are taken only what changed is noted and
+        # it is all drawn at once at the end of the frame
+        self.hold_drawing = False
+        self.undrawn = set()
+
+        # walking to the tile that was clicked on
+        self.paths = PathFinder()
+        # hides what the player hasn't seen when turned on
+        self.fog = None
+        self.walk = deque()
+        self.walk_timer = QTimer()
+        self.walk_timer.setInterval(WALK_STEP)
+        self.walk_timer.timeout.connect(self.walk_next)
+        # watches the files of the level for changes when hot reloading
+        self.reloader = None
+        # paints onto the level when it is being edited, set by the window
+        self.editor = None
+
+        # the guards wandering the level, they are moved in fixed timesteps
+        # of the game clock so a replay moves them the same way
+        self.entities = None
+        self.entity_tick = 0
+        # a tick the entities can't be moved past yet, set while a replay
+        # is waiting to make the input recorded on that tick
+        self.hold_tick = None
+        self.frame_timer = QTimer()
+        self.frame_timer.setInterval(1000 // TICK_RATE)
+        self.frame_timer.timeout.connect(self.frame)
+
+        # the one clock every animated tile takes its frame from, it only
+        # runs while the game tab is open and the level has animations
+        self.animating = False
+        self.animation_time = 0
+        self.animation_timer = QTimer()
+        self.animation_timer.setInterval(ANIMATION_STEP)
+        self.animation_timer.timeout.connect(self.animate)
+
+        # adding a reference to the parent window to be used later
+        self.window = window
+
+        # storing whether the game is in demo mode
+        self.demo_mode = demo_mode
+
+        # the most bytes each part of the game should take up, checked
+        # every time a level is loaded
+        self.budgets = dict(BUDGETS)
+
+        # creating the up key and binding it to the move method
+        self.up_key = QShortcut(window)
+        self.up_key.setKey('w')
+        self.up_key.activated.connect(lambda: self.move_player(self.UP))
+
+        # creating the down key and binding it to the move method
+        self.down_key = QShortcut(window)
+        self.down_key.setKey('s')
+        self.down_key.activated.connect(lambda: self.move_player(self.DOWN))
+
+        # creating the left key and binding it to the move method
+        self.left_key = QShortcut(window)
+        self.left_key.setKey('a')
+        self.left_key.activated.connect(lambda: self.move_player(self.LEFT))
+
+        # creating the right key and binding it to the move method
+        self.right_key = QShortcut(window)
+        self.right_key.setKey('d')
+        self.right_key.activated.connect(lambda: self.move_player(self.RIGHT))
+
+        # creating the quick save and quick load keys
+        self.save_key = QShortcut(window)
+        self.save_key.setKey('F5')
+        self.save_key.activated.connect(lambda: self.save("quicksave"))
+        self.load_key = QShortcut(window)
+        self.load_key.setKey('F9')
+        self.load_key.activated.connect(lambda: self.load_save("quicksave"))
+
+        # creating the key to save the recording of the game
+        self.record_key = QShortcut(window)
+        self.record_key.setKey('F6')
+        self.record_key.activated.connect(self.save_recording)
+
+        # determining the the game is in demo mode and if so running the demo
+        # level otherwise running the campaign
+        limits = {
+            "memory_limit": self.budgets["levels"],
+            "tile_limit": self.budgets["level tiles"]
+            }
+        if demo_mode:
+            self.levels = LevelManager(seed=self.seed, **limits)
+            self.load_level("cm:demo")
+        else:
+            self.levels = LevelManager(
+                "cm:campaign", seed=self.seed, **limits
+                )
+            self.load_level(self.levels.order[0])
+
+    def load_level(self, level_id: str):
+        """loads the level with the specified id, the player starts at the
+        start of the level and the next level of the campaign starts loading
+        in the background
+
+        Args:
+            level_id (str): the id of the level to load
+
+        Raises:
+            MemoryError: if the level is too big for the level tiles budget,
+            the current level keeps being played
+        """
+        level = self.levels.get(level_id)
+        self.stop_walking()
+        self.level_id = level_id
+        self.level = level
+        if self.recording is None and self.record_inputs:
+            # the level may have been played before so the recording starts
+            # from the locks and random number generators as they are now
+            self.recording = Recording(
+                self.seed, level_id, self.demo_mode,
+                self.levels.lock_snapshot(), self.levels.rng_snapshot()
+                )
+            # the recording's ticks count from the start of its level
+            self.clock.restart()
+            self.entity_tick = 0
+        self.create_player(self.level.start)
+        self.visited_layers = {self.player.layer}
+        self.spawn_entities()
+        self.update_animation()
+        if self.editor is not None:
+            self.editor.reset()
+        if self.reloader is not None:
+            self.reloader.watch()
+        self.levels.preload(self.levels.next_level(level_id))
+        self.enforce_budgets()
+        self.update_displays()
+
+    def snapshot(self) -> Snapshot:
+        """takes a snapshot of the game
+
+        Returns:
+            Snapshot: the state of the player and of every lock the player
+            has come across
+        """
+        return Snapshot(
+            self.level_id, self.player.layer, self.player.x, self.player.y,
+            sorted(self.visited_layers), self.levels.lock_snapshot()
+            )
+
+    def restore(self, snapshot: Snapshot):
+        """puts the game back to how it was when a snapshot was taken, the
+        level is taken from the level manager so it is only read from its
+        file if it has been unloaded
+
+        Args:
+            snapshot (Snapshot): the snapshot to restore
+
+        Raises:
+            MemoryError: if the snapshot's level is too big for the level
+            tiles budget, nothing is restored
+        """
+        # got first so a level that can't be loaded leaves the game as it was
+        level = self.levels.get(snapshot.level_id)
+        self.levels.set_states(snapshot.locks, {})
+        self.level_id = snapshot.level_id
+        self.level = level
+        self.create_player(self.level.coordinate(
+            f"{snapshot.layer},{snapshot.x}x,{snapshot.y}y"
+            ))
+        self.visited_layers = set(snapshot.visited_layers)
+        # where the guards were isn't saved so they start over
+        self.spawn_entities()
+        self.update_animation()
+        if self.editor is not None:
+            self.editor.reset()
+        # the recording can't be replayed past a restore so a new one is
+        # started from the next level that is loaded
+        self.recording = None
+        self.levels.preload(self.levels.next_level(snapshot.level_id))
+        # the locks may have changed so nothing worked out from them can be
+        # kept
+        self.stop_walking()
+        self.paths.invalidate()
+        if self.minimap is not None:
+            self.minimap.reset()
+        self.enforce_budgets()
+        self.update_displays()
+
+    def memory_report(self) -> MemoryReport:
+        """works out how much memory each part of the game takes up
+
+        Returns:
+            MemoryReport: the loaded levels, the widgets of the window and
+            the caches, guards and history of the level being played
+        """
+        report = self.levels.memory_report()
+        widgets = len(self.window.findChildren(QWidget))
+        report.add("widgets", widgets * WIDGET_BYTES, widgets)
+        report.merge(self.paths.memory_report())
+        if self.minimap is not None:
+            for image, _ in self.minimap.images.values():
+                report.add("caches", image.sizeInBytes())
+        for part in (self.fog, self.entities, self.editor):
+            if part is not None:
+                report.merge(part.memory_report())
+        return report
+
+    def enforce_budgets(self) -> list[str]:
+        """empties the caches of the parts of the game that take up more
+        than their budget, they are filled again as they are needed
+
+        Returns:
+            list: the subsystems that were over budget
+        """
+        over = self.memory_report().over({
+            subsystem: budget for subsystem, budget in self.budgets.items()
+            if subsystem not in ("levels", "level tiles")
+            })
+        if "fog icons" in over and self.fog is not None:
+            self.fog.dimmed.clear()
+        if "caches" in over:
+            self.paths.invalidate()
+            if self.minimap is not None:
+                self.minimap.reset()
+        return over
+
+    def save_path(self, name: str) -> str:
+        """gets the path of a save file
+
+        Args:
+            name (str): the name of the save
+
+        Returns:
+            str: the path to the save file
+        """
+        return os.path.join(path_to_exe, "saves", f"{name}.cms")
+
+    def save(self, name: str):
+        """saves a snapshot of the game, the file is swapped in whole so a
+        save that gets cut off never replaces a good one
+
+        Args:
+            name (str): the name of the save
+        """
+        path = self.save_path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".tmp", "wb") as save_file:
+            save_file.write(self.snapshot().to_bytes())
+        os.replace(path + ".tmp", path)
+
+    def load_save(self, name: str):
+        """restores the game from a save if there is one
+
+        Args:
+            name (str): the name of the save
+        """
+        path = self.save_path(name)
+        if os.path.exists(path):
+            with open(path, "rb") as save_file:
+                snapshot = Snapshot.from_bytes(save_file.read())
+            try:
+                self.restore(snapshot)
+            except MemoryError as error:
+                self.show_message("Level too big", str(error))
+
+    def autosave(self):
+        """saves the game to the autosave, this happens every time the player
+        goes through a door, headless games never autosave so replays don't
+        overwrite the player's autosave
+        """
+        if self.headless:
+            return
+        try:
+            self.save("autosave")
+        except OSError:
+            # not being able to autosave shouldn't stop the game
+            pass
+
+    def add_display_ref(self, display: QPushButton, y: int, x: int):
+        """adds a reference ot a display in the window to the game object
+
+        Args:
+            display (QPushButton): the display to add a reference to
+            y (int): the row the display is on in the display matrix
+            x (int): the column the display is on in the display matrix
+        """
+        self.displays[y][x] = display
+        self.shown.pop((x, y), None)
+
+    def camera_origin(self) -> tuple[int, int]:
+        """works out which tile of the player's layer is shown in the top left
+        display, on layers bigger than the display grid the view follows the
+        player
+
+        Returns:
+            tuple: the x and y of the tile in the top left display
+        """
+        width, height = self.level.sizes[self.player.layer]
+        left = min(max(self.player.x - MAX_SIZE // 2, 0),
+                   max(width - MAX_SIZE, 0))
+        top = min(max(self.player.y - MAX_SIZE // 2, 0),
+                  max(height - MAX_SIZE, 0))
+        return left, top
+
+    def update_displays(self):
+        """updates the tile displays to show the correct texture, if the view
+        hasn't moved only the tiles the player left and entered are drawn and
+        if it has only the displays whose icon is different. While drawing is
+        held the fog is still updated but nothing is drawn
+        """
+        if self.minimap is not None:
+            self.minimap.refresh()
+        # the displays don't exist until the window has set them up
+        if not self.displays[0]:
+            return
+        layer = self.player.layer
+        width, height = self.level.sizes[layer]
+        # only the tiles that came into or went out of sight change
+        if self.fog is not None:
+            changed = self.fog.update(
+                self.level_id, self.level, layer, self.player.x, self.player.y
+                )
+            if changed and self.minimap is not None:
+                self.minimap.patch(changed)
+            self.undrawn |= changed
+        if self.hold_drawing:
+            return
+        changed, self.undrawn = self.undrawn, set()
+        left, top = self.camera_origin()
+        view = (self.level, layer, left, top)
+        if view == self.view:
+            changed.add((layer, *self.drawn_player))
+            self.draw_cells(changed)
+        else:
+            empty = QIcon()
+            for y in range(MAX_SIZE):
+                for x in range(MAX_SIZE):
+                    if top + y < height and left + x < width:
+                        texture = self.tile_texture(layer, left + x, top + y)
+                    else:
+                        # layers smaller than the display grid leave some of
+                        # the displays empty
+                        texture = empty
+                    self.show_icon(x, y, texture)
+            self.view = view
+        self.show_icon(
+            self.player.x - left, self.player.y - top, Player.texture
+            )
+        self.drawn_player = (self.player.x, self.player.y)
+
+    def show_icon(self, column: int, row: int, icon: QIcon):
+        """sets the icon of a display unless it is already showing it
+
+        Args:
+            column (int): the column of the display
+            row (int): the row of the display
+            icon (QIcon): the icon to show
+        """
+        if self.shown.get((column, row)) is not icon:
+            self.shown[column, row] = icon
+            self.displays[row][column].setIcon(icon)
+
+    def tile_texture(self, layer_id: str, x: int, y: int) -> QIcon:
+        """gets what a display showing a tile should show, with fog of war
+        tiles out of sight are darker, tiles never seen are empty and only
+        the guards in sight are shown
+
+        Args:
+            layer_id (str): the layer the tile is in
+            x (int): the x coordinate of the tile
+            y (int): the y coordinate of the tile
+
+        Returns:
+            QIcon: the icon to show
+        """
+        tile = self.level.map[layer_id][y][x]
+        if tile.animation is None:
+            texture = tile.texture
+        else:
+            texture = tile.animation.frame(self.animation_time)
+        state = FogOfWar.VISIBLE
+        if self.fog is not None:
+            state = self.fog.state(self.level_id, layer_id, x, y)
+        if state == FogOfWar.VISIBLE:
+            if self.entities.at(layer_id, x, y) is not None:
+                return Entities.texture
+            return texture
+        if state == FogOfWar.EXPLORED:
+            return self.fog.dim(texture)
+        return QIcon()
+
+    def draw_cells(self, cells: set[tuple[str, int, int]]):
+        """draws the tiles that are on the displays again
+
+        Args:
+            cells (set): the (layer, x, y) of the tiles
+        """
+        layer = self.player.layer
+        left, top = self.camera_origin()
+        for lay, x, y in cells:
+            if (lay != layer or not 0 <= x - left < MAX_SIZE
+                    or not 0 <= y - top < MAX_SIZE):
+                continue
+            if (x, y) == (self.player.x, self.player.y):
+                texture = Player.texture
+            else:
+                texture = self.tile_texture(layer, x, y)
+            self.show_icon(x - left, y - top, texture)
+
+    def enable_fog(self, radius: int = SIGHT_RADIUS):
+        """turns on fog of war
+
+        Args:
+            radius (int, optional): how many tiles away the player can see.
+            Defaults to SIGHT_RADIUS.
+        """
+        self.fog = FogOfWar(radius)
+        self.view = None
+        if self.minimap is not None:
+            self.minimap.reset()
+        self.update_displays()
+
+    def repaint_cells(self, cells: set[tuple[str, int, int]]):
+        """updates only the displays showing the given tiles
+
+        Args:
+            cells (set): the (layer, x, y) of the tiles that have changed
+        """
+        if self.minimap is not None:
+            self.minimap.patch(cells)
+        if self.displays[0]:
+            self.draw_cells(cells)
+
+    def after_reload(self, cells: set[tuple[str, int, int]]):
+        """shows the changes made by reloading the level, if the player is
+        no longer somewhere they could be they are sent back to the start
+
+        Args:
+            cells (set): the (layer, x, y) of the tiles that were rebuilt
+        """
+        self.paths.invalidate({cell[0] for cell in cells})
+        if self.fog is not None:
+            self.fog.invalidate({cell[0] for cell in cells})
+        layer, x, y = self.player.layer, self.player.x, self.player.y
+        width, height = self.level.sizes.get(layer, (0, 0))
+        moved = (
+            x >= width or y >= height
+            or self.level.map[layer][y][x].function == "wall"
+            )
+        if moved:
+            self.stop_walking()
+            self.create_player(self.level.start)
+            self.visited_layers.add(self.player.layer)
+        # the layers may have changed under the guards so they start over,
+        # the tiles they were on are drawn again if they still exist
+        left = self.entities.cells()
+        self.spawn_entities()
+        cells = cells | {
+            (lay, x, y) for lay, x, y in left | self.entities.cells()
+            if x < self.level.sizes.get(lay, (0, 0))[0]
+            and y < self.level.sizes[lay][1]
+            }
+        # textures may have started or stopped being animated
+        self.update_animation()
+        # the rows of the history belong to the old version of the file
+        if self.editor is not None:
+            self.editor.reset()
+        if moved:
+            # the whole view is drawn again
+            self.view = None
+            self.update_displays()
+        else:
+            self.repaint_cells(cells)
+
+    def set_animating(self, animating: bool):
+        """starts or stops the animation clock, it is stopped whenever the
+        game tab isn't open so a paused game uses no time on it
+
+        Args:
+            animating (bool): whether tiles should be animated
+        """
+        self.animating = animating
+        self.update_animation()
+
+    def update_animation(self):
+        """runs the animation clock only if something can be animated
+        """
+        if (self.animating and not self.headless and self.level is not None
+                and self.level.animated()):
+            if not self.animation_timer.isActive():
+                self.animation_timer.start()
+        else:
+            self.animation_timer.stop()
+
+    def animate(self):
+        """moves the animation clock on a step and draws the tiles on the
+        displays whose frame changed
+        """
+        before = self.animation_time
+        self.animation_time = now = before + ANIMATION_STEP
+        if not self.displays[0] or self.view is None:
+            return
+        layer = self.player.layer
+        width, height = self.level.sizes[layer]
+        left, top = self.camera_origin()
+        rows = self.level.map[layer]
+        changed = set()
+        for y in range(top, min(top + MAX_SIZE, height)):
+            row = rows[y]
+            for x in range(left, min(left + MAX_SIZE, width)):
+                animation = row[x].animation
+                if (animation is not None
+                        and animation.index(before) != animation.index(now)):
+                    changed.add((layer, x, y))
+        if changed:
+            self.draw_cells(changed)
+
+    def create_player(self, location: Coordinate):
+        """creates the player at the given location
 
         Args:
             location (Coordinate): the location to create the player at
         """
-        self.player = Player(
-            self, *location(),
-            self.update_displays
+        self.player = Player(
+            self, *location(),
+            self.update_displays
+            )
+
+    def move_player(self, direction: tuple[int, int, str]):
+        """method to move the player when a direction key is pressed
+
+        Args:
+            direction (tuple): a tuple of the relative coordinates and name of
+            the direction from the player in the format (x, y, name)
+        """
+        # pressing a key stops the player walking to where they clicked
+        self.stop_walking()
+        self.take_step(direction)
+
+    def take_step(self, direction: tuple[int, int, str]) -> bool:
+        """moves the player a step if they are able to make a move and
+        records it
+
+        Args:
+            direction (tuple): a tuple of the relative coordinates and name of
+            the direction from the player in the format (x, y, name)
+
+        Returns:
+            bool: whether the step was taken
+        """
+        if self.overlay is not None and self.overlay.is_open():
+            # the player is reading a message or entering a code
+            return False
+        if self.editor is not None:
+            # the editor moves the view over anything and isn't recorded
+            width, height = self.level.sizes[self.player.layer]
+            self.player.x = min(
+                max(self.player.x + direction[0], 0), width - 1
+                )
+            self.player.y = min(
+                max(self.player.y - direction[1], 0), height - 1
+                )
+            self.player.update()
+            return True
+        if self.headless or self.window.centralWidget().currentIndex() == 1:
+            # the guards catch up first so the step is recorded on the tick
+            # it was made against
+            self.advance(self.current_tick())
+            if self.recording is not None:
+                self.recording.record(self.entity_tick, direction[2])
+            self.step(direction)
+            return True
+        return False
+
+    def click_display(self, column: int, row: int):
+        """walks the player to the tile shown by a display or uses the
+        editor's tool on it when the level is being edited
+
+        Args:
+            column (int): the column of the display
+            row (int): the row of the display
+        """
+        left, top = self.camera_origin()
+        if self.editor is not None:
+            self.editor.click(left + column, top + row)
+        else:
+            self.walk_to(left + column, top + row)
+
+    def walk_to(self, x: int, y: int):
+        """walks the player along the shortest path to a tile of their layer,
+        a step every WALK_STEP ms or all at once when headless
+
+        Args:
+            x (int): the x coordinate of the tile
+            y (int): the y coordinate of the tile
+        """
+        self.stop_walking()
+        path = self.paths.path(
+            self.level, self.player.layer,
+            (self.player.x, self.player.y), (x, y)
+            )
+        if not path:
+            return
+        self.walk.extend(path)
+        if self.headless:
+            self.walk_next(len(path))
+        else:
+            self.walk_timer.start()
+
+    def walk_next(self, steps: int = 1):
+        """takes the next steps of the walk and draws them as one frame, the
+        walk ends early if the player can't move, is blocked or ends up on
+        another layer
+
+        Args:
+            steps (int, optional): how many steps to take before drawing.
+            Defaults to 1.
+        """
+        self.hold_drawing = True
+        try:
+            for _ in range(steps):
+                layer, x, y = self.player.layer, self.player.x, self.player.y
+                if (not self.walk
+                        or not self.take_step(
+                            self.DIRECTIONS[self.walk.popleft()]
+                            )
+                        or self.player.layer != layer or not self.walk
+                        or (self.player.x, self.player.y) == (x, y)):
+                    # a guard in the way stops the walk too
+                    self.stop_walking()
+                    break
+        finally:
+            self.hold_drawing = False
+        self.update_displays()
+
+    def stop_walking(self):
+        """stops the player walking to where they clicked
+        """
+        self.walk.clear()
+        self.walk_timer.stop()
+
+    def show_layer(self, layer_id: str):
+        """moves the player to another layer of the level while it is being
+        edited, keeping them as close to where they were as possible
+
+        Args:
+            layer_id (str): the layer to show
+        """
+        width, height = self.level.sizes[layer_id]
+        self.player.layer = layer_id
+        self.player.x = min(self.player.x, width - 1)
+        self.player.y = min(self.player.y, height - 1)
+        self.visited_layers.add(layer_id)
+        self.player.update()
+
+    def step(self, direction: tuple[int, int, str]):
+        """tells the tile next to the player that the player is trying to
+        enter it
+
+        Args:
+            direction (tuple): a tuple of the relative coordinates and name of
+            the direction from the player in the format (x, y, name)
+        """
+        dir_x, dir_y, dir_name = direction
+        x = self.player.x + dir_x  # y coords must be subtracted due
+        y = self.player.y - dir_y  # to y = 0 being at the top
+        width, height = self.level.sizes[self.player.layer]
+        if not (0 <= x < width and 0 <= y < height):
+            # off the edge of the layer is like a wall, negative coordinates
+            # would wrap around to the other side
+            return
+        # telling the tile at the location to that the player is
+        # attempting to enter the tile in the specified direction
+        self.level.map[self.player.layer][y][x].attempt_entry(
+            self.player, dir_name
+            )
+
+    def enter_code(self, lock: Lock):
+        """asks the player for the code of a lock, when dialogs aren't shown
+        the code comes from whatever is running the game instead
+
+        Args:
+            lock (Lock): the lock the code is for
+        """
+        if self.show_dialogs and self.overlay is not None:
+            self.overlay.ask_code(
+                "Enter code", "",
+                lambda code: self.code_entered(lock.id, code)
+                )
+
+    def code_entered(self, lock_id: str, code: str):
+        """tries the code the player entered and tells them how it went
+
+        Args:
+            lock_id (str): the id of the lock the code is for
+            code (str): the code the player entered
+        """
+        self.advance(self.current_tick())
+        result = self.submit_code(lock_id, code)
+        if result == "accepted":
+            # you got the code right
+            self.show_message(
+                "Accepted",
+                "the code you entered was correct\nthe lock is now unlocked"
+                )
+        elif result == "reset":
+            # the message you will get if you failed to enter the code
+            # correctly and the code has been randomized
+            self.show_message(
+                "Denied",
+                "the code you entered was incorrect\n"
+                "the lock is still locked\n"
+                "perhapse i should check the code again"
+                )
+        else:
+            # the message you will get if you failed to enter the code
+            # correctly and the cdoe has NOT been randomized
+            self.show_message(
+                "Denied",
+                "the code you entered was incorrect\n"
+                "the lock is still locked"
+                )
+
+    def show_message(
+        self, title: str, text: str, on_close: "function" = None
+            ):
+        """shows the player a message over the map without stopping the game,
+        when dialogs aren't shown the message is skipped
+
+        Args:
+            title (str): the title of the message
+            text (str): the message
+            on_close (function, optional): called when the player closes the
+            message. Defaults to None.
+        """
+        if self.show_dialogs and self.overlay is not None:
+            self.overlay.show_message(title, text, on_close)
+
+    def quit(self):
+        """closes the game window which ends the game once the event loop
+        has nothing left to do
+        """
+        self.window.close()
+
+    def submit_code(self, lock_id: str, code: str) -> str:
+        """tries a code on one of the current level's locks
+
+        Args:
+            lock_id (str): the id of the lock
+            code (str): the code to try
+
+        Returns:
+            str: the result of Lock.try_code
+        """
+        if self.recording is not None:
+            self.recording.record(self.entity_tick, "code", (lock_id, code))
+        result = self.level.locks[lock_id].try_code(code)
+        cells = self.level.lock_cells(lock_id)
+        if result == "accepted":
+            # through doors with the lock can now be walked through
+            self.paths.invalidate({cell[0] for cell in cells})
+        if self.minimap is not None:
+            self.minimap.patch(cells)
+        return result
+
+    def spawn_entities(self):
+        """puts the guards of the level where they start, they are moved
+        by the frame timer unless the game is headless
+        """
+        self.entities = Entities(
+            self, random.Random(f"{self.seed}:{self.level_id}")
+            )
+        if len(self.entities) and not self.headless:
+            self.frame_timer.start()
+        else:
+            self.frame_timer.stop()
+
+    def advance(self, tick: int):
+        """runs the fixed timesteps of the entities up to a tick of the
+        game clock and draws the tiles they left and entered
+
+        Args:
+            tick (int): the tick to run up to
+        """
+        entities = self.entities
+        if not len(entities):
+            self.entity_tick = max(self.entity_tick, tick)
+            return
+        while self.entity_tick < tick:
+            entities.tick()
+            self.entity_tick += 1
+        changed = entities.take_changed()
+        if changed and self.displays[0]:
+            self.draw_cells(changed)
+
+    def frame(self):
+        """moves the entities on to the current tick of the game clock
+        """
+        tick = self.current_tick()
+        if self.hold_tick is not None:
+            tick = min(tick, self.hold_tick)
+        self.advance(tick)
+
+    def current_tick(self) -> int:
+        """
+        Returns:
+            int: the number of ticks since the game started
+        """
+        return self.clock.elapsed() * TICK_RATE // 1000
+
+    def save_recording(self):
+        """saves the recording of the game so it can be replayed later
+        """
+        if self.recording is not None:
+            self.recording.save(os.path.join(
+                path_to_exe, "recordings", f"{self.recording.seed}.cmr"
+                ))
+
+    def start(self):
+        """starts the level
+        """
+        self.player.update()
+
+
+class Replay:
+    directions = {
+        "up": Game.UP, "down": Game.DOWN,
+        "left": Game.LEFT, "right": Game.RIGHT
+        }
+
+    def __init__(self, recording: Recording):
+        """plays a recording back either as fast as possible without a window
+        or in real time in a game window
+
+        Args:
+            recording (Recording): the recording to play back
+        """
+        self.recording = recording
+        self.game = None
+        self.inputs = None
+        self.pending = None
+        self.timer = None
+
+    def apply(self, tick: int, made: str, code: tuple[str, str] | None):
+        """makes a recorded input in the game once the entities have caught
+        up to the tick it was made on
+
+        Args:
+            tick (int): the tick the input was made on
+            made (str): the input that was made
+            code (tuple | None): the lock id and code of a code input
+        """
+        self.game.advance(tick)
+        if made == "code":
+            self.game.submit_code(*code)
+        else:
+            self.game.step(self.directions[made])
+
+    def start(self, game: Game):
+        """gets a game ready to have the recording played back in it, the
+        game must have been created with the recording's seed
+
+        Args:
+            game (Game): the game to play the recording in
+        """
+        self.game = game
+        game.show_dialogs = False
+        # the replay itself shouldn't be recorded
+        game.recording = None
+        game.record_inputs = False
+        game.load_level(self.recording.level_id)
+        # the levels are put back to how they were when recording started,
+        # after the level is loaded so building it doesn't use up its rng
+        game.levels.set_states(self.recording.locks, self.recording.rngs)
+        game.paths.invalidate()
+        if game.minimap is not None:
+            game.minimap.reset()
+        # the recorded ticks count from the start of the level
+        game.entity_tick = 0
+
+    def run_headless(self, game: Game = None) -> Game:
+        """plays the whole recording back as fast as possible
+
+        Args:
+            game (Game, optional): the game to play the recording in.
+            Defaults to a new headless game.
+
+        Returns:
+            Game: the game after the recording has been played
+        """
+        if game is None:
+            game = Game(
+                QMainWindow(), self.recording.demo_mode,
+                self.recording.seed, headless=True
+                )
+        self.start(game)
+        for tick, made, code in self.recording:
+            if game.finished:
+                break
+            self.apply(tick, made, code)
+        return game
+
+    def play(self, game: Game):
+        """plays the recording back in real time, each input is made on the
+        same tick of the game clock that it was recorded on
+
+        Args:
+            game (Game): the game to play the recording in
+        """
+        self.start(game)
+        game.clock.restart()
+        self.inputs = iter(self.recording)
+        self.timer = QTimer()
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.play_next)
+        self.play_next()
+
+    def play_next(self):
+        """makes the input that was waiting for its tick and then every input
+        whose tick has come around, then waits for the next one
+        """
+        if self.pending is not None:
+            self.apply(*self.pending)
+            self.pending = None
+        for tick, made, code in self.inputs:
+            if self.game.finished:
+                return
+            wait = tick * 1000 // TICK_RATE - self.game.clock.elapsed()
+            if wait > 0:
+                self.pending = (tick, made, code)
+                # the frame timer mustn't run the guards past the input
+                self.game.hold_tick = tick
+                self.timer.start(wait)
+                return
+            self.apply(tick, made, code)
+        self.game.hold_tick = None
+
+
+class HotReloader:
+    # how long to wait for a burst of saves to finish before reloading, in ms
+    delay = 100
+
+    def __init__(self, game: Game):
+        """watches the files of the current level and its textures and
+        reloads them while the game is running, only the tiles that changed
+        are rebuilt and redrawn
+
+        Args:
+            game (Game): the game to reload the level of
+        """
+        self.game = game
+        self.watcher = QFileSystemWatcher()
+        self.watcher.fileChanged.connect(self.on_changed)
+        self.level_changed = False
+        self.textures_changed = False
+        # the stamp of the level file as the editor last saved it
+        self.own_save = None
+        # waiting for the editor to finish saving before reloading
+        self.timer = QTimer()
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(self.delay)
+        self.timer.timeout.connect(self.reload)
+        game.reloader = self
+        self.watch()
+
+    def paths(self) -> tuple[str, set[str]]:
+        """works out which files the current level depends on
+
+        Returns:
+            tuple: the path to the level file and the paths to the tiles.json
+            files and textures it uses
+        """
+        level = self.game.level
+        texture_paths = {
+            path for paths, _ in level.texture_stamps.values()
+            for path in paths
+            }
+        for texture_id in level.tile_key.values():
+            modid = texture_id.split(':')[0]
+            if modid == "cm":
+                folder = os.path.join(path_to_inside, "tiles")
+            else:
+                folder = os.path.join(path_to_exe, "mods", modid, "tiles")
+            texture_paths.add(os.path.join(folder, "tiles.json"))
+        return level.path, texture_paths
+
+    def watch(self):
+        """starts watching the files of the current level, editors that save
+        by replacing the file stop it from being watched so this is called
+        again after every reload
+        """
+        level_path, texture_paths = self.paths()
+        self.level_path = os.path.abspath(level_path)
+        wanted = {self.level_path} | set(map(os.path.abspath, texture_paths))
+        watched = set(self.watcher.files())
+        if watched - wanted:
+            self.watcher.removePaths(list(watched - wanted))
+        missing = [
+            path for path in wanted - watched if os.path.exists(path)
+            ]
+        if missing:
+            self.watcher.addPaths(missing)
+
+    def stamp(path: str) -> tuple[int, int] | None:
+        """Static method to get when a file was last changed and its size
+
+        Args:
+            path (str): the path to a file
+
+        Returns:
+            tuple | None: the modified time and size of the file or None if
+            it doesn't exist
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def ignore_save(self):
+        """notes that the editor has just saved the level, the level already
+        matches the file so the change isn't reloaded and the editor keeps
+        its history
+        """
+        self.own_save = HotReloader.stamp(self.level_path)
+
+    def on_changed(self, path: str):
+        """notes which kind of file changed and restarts the wait
+
+        Args:
+            path (str): the file that changed
+        """
+        if os.path.abspath(path) == self.level_path:
+            if (self.own_save is not None
+                    and HotReloader.stamp(path) == self.own_save):
+                # saving replaces the file so it has to be watched again
+                self.watch()
+                return
+            self.level_changed = True
+        else:
+            self.textures_changed = True
+        self.timer.start()
+
+    def reload(self):
+        """reloads what changed, if the level file can't be read it is left
+        as it was so a half finished edit doesn't break the game
+        """
+        game = self.game
+        dirty = set()
+        try:
+            if self.textures_changed:
+                dirty.update(game.level.reload_textures())
+            if self.level_changed:
+                dirty.update(game.level.reload(LevelFile(game.level.path)))
+        except (ValueError, TypeError, KeyError, OSError) as error:
+            # a bad coordinate is a TypeError
+            game.show_message(
+                "Couldn't reload", f"{game.level.path}: {error}"
+                )
+        finally:
+            self.level_changed = self.textures_changed = False
+            game.after_reload(dirty)
+            self.watch()
+
+
+class Minimap(QWidget):
+    # the colour of doors that are locked
+    locked_colour = 0xFFC0392B
+
+    def __init__(self, game: Game, size: int = 200):
+        """a small map of the whole of the player's layer, each layer is drawn
+        once from the texture grid at one pixel per few tiles and after that
+        only the pixels of tiles that change are drawn again
+
+        Args:
+            game (Game): the game to show the map of
+            size (int, optional): the width and height of the widget in
+            pixels. Defaults to 200.
+        """
+        super(Minimap, self).__init__()
+        self.game = game
+        self.setFixedSize(size, size)
+        self.level = None
+        self.texture_keys = None
+        # layer: (image, tiles per pixel)
+        self.images = {}
+        # texture key: (texture, average colour)
+        self.colours = {}
+
+    def reset(self):
+        """forgets the drawn layers so they are drawn again from the level
+        """
+        self.level = self.game.level
+        self.texture_keys = self.level.texture_keys
+        self.images = {}
+
+    def refresh(self):
+        """redraws the widget, called whenever the player moves
+        """
+        if (self.game.level is not self.level
+                or self.game.level.texture_keys is not self.texture_keys):
+            self.reset()
+        self.update()
+
+    def colour(self, key: str) -> int:
+        """gets the average colour of a texture
+
+        Args:
+            key (str): the texture key of the texture
+
+        Returns:
+            int: the colour as 0xAARRGGBB
+        """
+        texture = self.level.textures[key]
+        cached = self.colours.get(key)
+        if cached is None or cached[0] is not texture:
+            cached = self.colours[key] = (texture, texture.toImage().scaled(
+                1, 1, Qt.AspectRatioMode.IgnoreAspectRatio,
+                Qt.TransformationMode.SmoothTransformation
+                ).pixel(0, 0))
+        return cached[1]
+
+    def tile_colour(self, layer_id: str, x: int, y: int) -> int:
+        """gets the colour a tile is shown as
+
+        Args:
+            layer_id (str): the layer the tile is in
+            x (int): the x coordinate of the tile
+            y (int): the y coordinate of the tile
+
+        Returns:
+            int: the colour as 0xAARRGGBB
+        """
+        fog = self.game.fog
+        if (fog is not None and fog.state(self.game.level_id, layer_id, x, y)
+                == FogOfWar.HIDDEN):
+            return 0
+        tile = self.level.map[layer_id][y][x]
+        if tile.function in ("door", "through-door") and tile.locked():
+            return self.locked_colour
+        return self.colour(
+            self.level.texture_keys[self.level.layers[layer_id][y][x]]
             )
 
-    def move_player(self, direction: tuple[int, int, str]):
-        """method to move the player when a direction key is pressed
+    def layer_image(self, layer_id: str) -> tuple[QImage, int]:
+        """gets the image of a layer, drawing it if it hasn't been yet
 
         Args:
-            direction (tuple): a tuple of the relative coordinates and name of
-            the direction from the player in the format (x, y, name)
+            layer_id (str): the layer
+
+        Returns:
+            tuple: the image and how many tiles across each pixel is
         """
-        if self.window.centralWidget().currentIndex() == 1:
-            dir_x, dir_y, dir_name = direction
-            x = self.player.x + dir_x  # y coords must be subtracted due
-            y = self.player.y - dir_y  # to y = 0 being at the top
-            # telling the tile at the location to that the player is
-            # attempting to enter the tile in the specified direction
-            self.level.map[self.player.layer][y][x].attempt_entry(
-                self.player, dir_name
+        if layer_id in self.images:
+            return self.images[layer_id]
+        level = self.level
+        width, height = level.sizes[layer_id]
+        step = -(-max(width, height) // MINIMAP_SIZE)
+        colours = array("I", map(self.colour, level.texture_keys))
+        # picking every few tiles and swapping them for their colour a whole
+        # row at a time
+        pixels = array("I")
+        for row in level.layers[layer_id][::step]:
+            pixels.extend(map(colours.__getitem__, row[::step]))
+        columns = -(-width // step)
+        fog = self.game.fog
+        if fog is not None:
+            # tiles that haven't been seen are left empty
+            explored = fog.explored.get(
+                (self.game.level_id, layer_id), bytearray(width * height)
+                )
+            seen = bytearray().join(
+                explored[y * width:(y + 1) * width:step]
+                for y in range(0, height, step)
                 )
+            pixels = array("I", map(mul, pixels, seen))
+        image = QImage(
+            pixels.tobytes(), columns, len(pixels) // columns, columns * 4,
+            QImage.Format.Format_ARGB32
+            ).copy()
+        self.images[layer_id] = image, step
+        # the blocks with doors in are worked out again so that a locked
+        # door anywhere in a block shows even if it wasn't the tile picked
+        self.patch({
+            cell for cell in level.function_cells if cell[0] == layer_id
+            })
+        return image, step
+
+    def patch(self, cells: set[tuple[str, int, int]]):
+        """draws the tiles that have changed again
 
-    def start(self):
-        """starts the level
+        Args:
+            cells (set): the (layer, x, y) of the tiles
         """
-        self.player.update()
+        if (self.game.level is not self.level
+                or self.game.level.texture_keys is not self.texture_keys):
+            # a different level or one with new texture keys is drawn again
+            # the next time it is shown
+            self.reset()
+        for layer_id, x, y in cells:
+            if layer_id not in self.images:
+                continue
+            image, step = self.images[layer_id]
+            image.setPixel(
+                x // step, y // step,
+                self.block_colour(layer_id, x // step, y // step, step)
+                )
+        self.update()
+
+    def block_colour(self, layer_id: str, column: int, row: int,
+                     step: int) -> int:
+        """gets the colour of a pixel of a layer's image, a pixel shows the
+        top left tile of its block of tiles unless there is a locked door
+        anywhere in the block so doors are never lost when shrinking
+
+        Args:
+            layer_id (str): the layer the pixel is of
+            column (int): the x coordinate of the pixel
+            row (int): the y coordinate of the pixel
+            step (int): how many tiles across each pixel is
+
+        Returns:
+            int: the colour as 0xAARRGGBB
+        """
+        left, top = column * step, row * step
+        if step > 1:
+            width, height = self.level.sizes[layer_id]
+            rows = self.level.map[layer_id]
+            for y in range(top, min(top + step, height)):
+                for x in range(left, min(left + step, width)):
+                    tile = rows[y][x]
+                    if (tile.function in ("door", "through-door")
+                            and tile.locked()
+                            and self.tile_colour(layer_id, x, y)
+                            == self.locked_colour):
+                        return self.locked_colour
+        return self.tile_colour(layer_id, left, top)
+
+    def paintEvent(self, event):
+        """draws the layer the player is on with the player and the part of
+        the layer the displays show marked on it
+
+        Args:
+            event (QPaintEvent): the paint event
+        """
+        if self.level is None:
+            return
+        player = self.game.player
+        image, step = self.layer_image(player.layer)
+        # fitting the layer in the widget without stretching it
+        scale = min(
+            self.width() / image.width(), self.height() / image.height()
+            )
+        tile = scale / step
+        painter = QPainter(self)
+        painter.drawImage(QRect(
+            0, 0, int(image.width() * scale), int(image.height() * scale)
+            ), image)
+        left, top = self.game.camera_origin()
+        painter.setPen(QColor(255, 255, 255))
+        painter.drawRect(
+            int(left * tile), int(top * tile),
+            int(MAX_SIZE * tile), int(MAX_SIZE * tile)
+            )
+        marker = max(int(tile), 3)
+        painter.fillRect(
+            int(player.x * tile), int(player.y * tile), marker, marker,
+            QColor(255, 0, 0)
+            )
+        painter.end()
+
+
+class LevelSelect(QListWidget):
+    def __init__(self, game: Game, thumbnails: Thumbnails = None):
+        """a list of every level in the game and its mods with a thumbnail of
+        each, the thumbnails are only made once the list is first shown
+
+        Args:
+            game (Game): the game to play the chosen level in
+            thumbnails (Thumbnails, optional): where the thumbnails come
+            from. Defaults to the thumbnail cache next to the game.
+        """
+        super(LevelSelect, self).__init__()
+        self.game = game
+        self.thumbnails = Thumbnails() if thumbnails is None else thumbnails
+        size = self.thumbnails.size
+        self.setIconSize(QSize(size * 4, size))
+        self.setStyleSheet("font-size: 20px")
+        # level id: the item listing the level
+        self.items = {}
+        self.itemActivated.connect(self.on_activated)
+
+    def showEvent(self, event):
+        """fills in the list the first time it is shown
+
+        Args:
+            event (QShowEvent): the show event
+        """
+        if not self.items:
+            for level_id in Level.level_ids():
+                item = QListWidgetItem(level_id)
+                item.setData(Qt.ItemDataRole.UserRole, level_id)
+                self.addItem(item)
+                self.items[level_id] = item
+                self.thumbnails.request(level_id, self.on_thumbnail)
+        super(LevelSelect, self).showEvent(event)
+
+    def on_thumbnail(self, level_id: str, thumbnail: QPixmap | None):
+        """shows a thumbnail once it is ready
+
+        Args:
+            level_id (str): the full id of the level
+            thumbnail (QPixmap | None): the thumbnail, None if the file isn't
+            a level
+        """
+        item = self.items[level_id]
+        if thumbnail is None:
+            self.takeItem(self.row(item))
+        else:
+            item.setIcon(QIcon(thumbnail))
+
+    def on_activated(self, item: QListWidgetItem):
+        """starts playing the chosen level, a recording can't follow the
+        player to another level so a new one is started from it
+
+        Args:
+            item (QListWidgetItem): the item of the level
+        """
+        game = self.game
+        recording = game.recording
+        if game.record_inputs:
+            game.recording = None
+        try:
+            game.load_level(item.data(Qt.ItemDataRole.UserRole))
+        except MemoryError as error:
+            # still playing the level the recording is of
+            game.recording = recording
+            game.show_message("Level too big", str(error))
+        game.window.centralWidget().setCurrentIndex(1)
+
+
+class EditorVersion:
+    __slots__ = ("layers", "walls", "functions", "start", "end")
+
+    def __init__(
+        self, layers: dict, walls: dict, functions: dict,
+        start: Coordinate, end: tuple[str, int, int]
+            ):
+        """one step of the editor's history, nothing in a version is ever
+        changed so versions share every block of rows they have in common
+
+        Args:
+            layers (dict): layer: tuple of blocks, each a tuple of rows of
+            texture numbers
+            walls (dict): layer: tuple of blocks, each a tuple of wall masks
+            functions (dict): (layer, x, y): data of every functional tile
+            start (Coordinate): the start of the level
+            end (tuple): the (layer, x, y) of the end of the level
+        """
+        self.layers = layers
+        self.walls = walls
+        self.functions = functions
+        self.start = start
+        self.end = end
+
+
+class LevelEditor:
+    # the number of rows in each block of the history
+    block = 32
+    # the most versions kept for undoing
+    history_size = 200
+    TEXTURES = 0
+    WALLS = 1
+    tools = (
+        "tile", "wall", "floor", "door", "through-door", "code", "dialog",
+        "erase", "start", "end"
+        )
+
+    def __init__(self, game: "Game"):
+        """paints tiles, walls, doors, locks and the start and end onto the
+        level being played. The rows of the level are never changed once a
+        stroke is finished, a stroke copies the rows it changes so the
+        history only holds the rows that were edited
+
+        Args:
+            game (Game): the game whose level is edited
+        """
+        self.game = game
+        self.level = None
+        self.versions = []
+        self.position = 0
+        # (kind, layer, y) of the rows copied by the current stroke
+        self.copied = set()
+        self.functions_copied = False
+        # (layer, x, y) of the tiles changed but not yet drawn
+        self.dirty = set()
+        # called after the editor starts over on a new level
+        self.on_reset = None
+
+        # the tool used when a tile is clicked and its settings
+        self.tool = "tile"
+        self.key = None
+        self.brush = 1
+        self.rectangle = False
+        self.corner = None
+        self.goes_to = ""
+        self.lock_id = ""
+        self.text = ""
+        self.reset()
+
+    def reset(self):
+        """starts the history over from the level as it is now
+        """
+        level = self.level = self.game.level
+        self.versions = [EditorVersion(
+            {lay: self.blocks(rows) for lay, rows in level.layers.items()},
+            {lay: self.blocks(rows) for lay, rows in level.wall_masks.items()},
+            level.function_cells, level.start, level.end_cell
+            )]
+        self.position = 0
+        self.copied = set()
+        self.functions_copied = False
+        self.dirty = set()
+        self.corner = None
+        if self.key not in level.tile_key:
+            self.key = next(iter(level.tile_key), None)
+        if self.on_reset is not None:
+            self.on_reset()
+
+    def blocks(self, rows: list) -> tuple[tuple, ...]:
+        """
+        Args:
+            rows (list): the rows of a layer
+
+        Returns:
+            tuple: the rows split into blocks
+        """
+        return tuple(
+            tuple(rows[top:top + self.block])
+            for top in range(0, len(rows), self.block)
+            )
+
+    def row(self, kind: int, lay: str, y: int) -> array | bytearray:
+        """gets a row of the level that the current stroke can change, the
+        row is copied the first time so older versions keep theirs
+
+        Args:
+            kind (int): TEXTURES or WALLS
+            lay (str): the layer the row is in
+            y (int): the row
+
+        Returns:
+            array | bytearray: the row
+        """
+        level = self.level
+        if kind == self.TEXTURES:
+            rows = level.layers[lay]
+        else:
+            rows = level.wall_masks[lay]
+        if (kind, lay, y) not in self.copied:
+            rows[y] = rows[y][:]
+            self.copied.add((kind, lay, y))
+        return rows[y]
+
+    def bounds(
+        self, lay: str, left: int, top: int, right: int, bottom: int
+            ) -> tuple[int, int, int, int]:
+        """clips a rectangle of tiles to a layer
+
+        Args:
+            lay (str): the layer
+            left (int): the first column
+            top (int): the first row
+            right (int): the column after the last
+            bottom (int): the row after the last
+
+        Returns:
+            tuple: the clipped left, top, right and bottom
+        """
+        width, height = self.level.sizes[lay]
+        return (
+            max(left, 0), max(top, 0), min(right, width), min(bottom, height)
+            )
+
+    def texture_number(self, key: str) -> int:
+        """gets the number of a texture key in the level's texture grid
+
+        Args:
+            key (str): the texture key
+
+        Raises:
+            KeyError: if the level has no texture with that key
+
+        Returns:
+            int: the number standing for the key
+        """
+        level = self.level
+        if key not in level.tile_key:
+            raise KeyError(f"the level has no texture called {key!r}")
+        numbers = level.file.texture_numbers
+        if key not in numbers:
+            numbers[key] = len(level.texture_keys)
+            level.texture_keys.append(key)
+        return numbers[key]
+
+    def paint_tiles(
+        self, lay: str, left: int, top: int, right: int, bottom: int,
+        key: str
+            ):
+        """gives a rectangle of tiles a texture
+
+        Args:
+            lay (str): the layer to paint on
+            left (int): the first column
+            top (int): the first row
+            right (int): the column after the last
+            bottom (int): the row after the last
+            key (str): the texture key to paint
+        """
+        number = self.texture_number(key)
+        left, top, right, bottom = self.bounds(lay, left, top, right, bottom)
+        if left >= right:
+            return
+        span = array("H", [number]) * (right - left)
+        rows = self.level.layers[lay]
+        for y in range(top, bottom):
+            old = rows[y]
+            if old[left:right] == span:
+                continue
+            self.dirty.update(
+                (lay, x, y) for x in range(left, right) if old[x] != number
+                )
+            self.row(self.TEXTURES, lay, y)[left:right] = span
+
+    def paint_walls(
+        self, lay: str, left: int, top: int, right: int, bottom: int,
+        wall: bool
+            ):
+        """adds or removes walls over a rectangle of tiles
+
+        Args:
+            lay (str): the layer to paint on
+            left (int): the first column
+            top (int): the first row
+            right (int): the column after the last
+            bottom (int): the row after the last
+            wall (bool): whether the tiles become walls
+        """
+        left, top, right, bottom = self.bounds(lay, left, top, right, bottom)
+        if left >= right:
+            return
+        value = int(wall)
+        span = bytes([value]) * (right - left)
+        masks = self.level.wall_masks[lay]
+        for y in range(top, bottom):
+            old = masks[y]
+            if old[left:right] == span:
+                continue
+            self.dirty.update(
+                (lay, x, y) for x in range(left, right) if old[x] != value
+                )
+            self.row(self.WALLS, lay, y)[left:right] = span
+
+    def set_function(self, lay: str, x: int, y: int, data: dict | None):
+        """makes a tile functional or plain again
+
+        Args:
+            lay (str): the layer of the tile
+            x (int): the x coordinate of the tile
+            y (int): the y coordinate of the tile
+            data (dict | None): the data of the functional tile in the level
+            file format, None to make the tile plain
+        """
+        level = self.level
+        cell = (lay, x, y)
+        if level.function_cells.get(cell) == data:
+            return
+        if not self.functions_copied:
+            level.function_cells = dict(level.function_cells)
+            self.functions_copied = True
+        if data is None:
+            del level.function_cells[cell]
+        else:
+            level.function_cells[cell] = data
+        self.dirty.add(cell)
+
+    def set_start(self, lay: str, x: int, y: int):
+        """moves the start of the level
+
+        Args:
+            lay (str): the layer of the start
+            x (int): the x coordinate of the start
+            y (int): the y coordinate of the start
+        """
+        self.level.start = self.level.coordinate(f"{lay},{x}x,{y}y")
+
+    def set_end(self, lay: str, x: int, y: int):
+        """moves the end of the level
+
+        Args:
+            lay (str): the layer of the end
+            x (int): the x coordinate of the end
+            y (int): the y coordinate of the end
+        """
+        level = self.level
+        if level.end_cell != (lay, x, y):
+            self.dirty.update((level.end_cell, (lay, x, y)))
+            level.end_cell = (lay, x, y)
+
+    def commit(self) -> set[tuple[str, int, int]]:
+        """finishes the current stroke, the level is drawn again where it
+        changed and a new version is added to the history
+
+        Returns:
+            set: the (layer, x, y) of every tile the stroke changed
+        """
+        level = self.level
+        current = self.versions[self.position]
+        if (not self.copied and not self.functions_copied
+                and level.start is current.start
+                and level.end_cell == current.end):
+            return self.apply()
+        layers, walls = dict(current.layers), dict(current.walls)
+        touched = {}
+        for kind, lay, y in self.copied:
+            touched.setdefault((kind, lay), set()).add(y // self.block)
+        for (kind, lay), block_numbers in touched.items():
+            versions, rows = (
+                (layers, level.layers) if kind == self.TEXTURES
+                else (walls, level.wall_masks)
+                )
+            blocks = list(versions[lay])
+            for number in block_numbers:
+                top = number * self.block
+                blocks[number] = tuple(rows[lay][top:top + self.block])
+            versions[lay] = tuple(blocks)
+        del self.versions[self.position + 1:]
+        self.versions.append(EditorVersion(
+            layers, walls, level.function_cells, level.start, level.end_cell
+            ))
+        if len(self.versions) > self.history_size:
+            del self.versions[0]
+        self.position = len(self.versions) - 1
+        self.copied = set()
+        self.functions_copied = False
+        return self.apply()
+
+    def apply(self) -> set[tuple[str, int, int]]:
+        """rebuilds and draws the tiles that have changed
+
+        Returns:
+            set: the (layer, x, y) of the tiles
+        """
+        dirty, self.dirty = self.dirty, set()
+        level = self.level
+        for cell in dirty:
+            level.rebuild_tile(*cell)
+        layers = {cell[0] for cell in dirty}
+        self.game.paths.invalidate(layers)
+        if self.game.fog is not None:
+            self.game.fog.invalidate(layers)
+        self.game.repaint_cells(dirty)
+        return dirty
+
+    def undo(self) -> set[tuple[str, int, int]]:
+        """goes back a version
+
+        Returns:
+            set: the (layer, x, y) of every tile that changed
+        """
+        self.commit()
+        if self.position == 0:
+            return set()
+        return self.restore(self.position - 1)
+
+    def redo(self) -> set[tuple[str, int, int]]:
+        """goes forward a version that was undone
+
+        Returns:
+            set: the (layer, x, y) of every tile that changed
+        """
+        self.commit()
+        if self.position == len(self.versions) - 1:
+            return set()
+        return self.restore(self.position + 1)
+
+    def restore(self, position: int) -> set[tuple[str, int, int]]:
+        """puts the level back to a version of the history, only the blocks
+        that aren't shared with the current version are compared
+
+        Args:
+            position (int): the position of the version in the history
+
+        Returns:
+            set: the (layer, x, y) of every tile that changed
+        """
+        level = self.level
+        current = self.versions[self.position]
+        target = self.versions[position]
+        for old_layers, new_layers, live in (
+                (current.layers, target.layers, level.layers),
+                (current.walls, target.walls, level.wall_masks)):
+            for lay, new_blocks in new_layers.items():
+                old_blocks = old_layers[lay]
+                if old_blocks is new_blocks:
+                    continue
+                rows = live[lay]
+                for number, (old_block, new_block) in enumerate(
+                        zip(old_blocks, new_blocks)):
+                    if old_block is new_block:
+                        continue
+                    top = number * self.block
+                    for y, (old, new) in enumerate(
+                            zip(old_block, new_block), top):
+                        if old is new:
+                            continue
+                        self.dirty.update(
+                            (lay, x, y) for x in range(len(new))
+                            if old[x] != new[x]
+                            )
+                        rows[y] = new
+        if current.functions is not target.functions:
+            self.dirty.update(
+                cell for cell in current.functions.keys()
+                | target.functions.keys()
+                if current.functions.get(cell) != target.functions.get(cell)
+                )
+            level.function_cells = target.functions
+        if current.end != target.end:
+            self.dirty.update((current.end, target.end))
+            level.end_cell = target.end
+        level.start = target.start
+        self.position = position
+        return self.apply()
+
+    def click(self, x: int, y: int) -> set[tuple[str, int, int]]:
+        """uses the current tool on a tile of the player's layer, tiles,
+        walls, floors and erasing cover the brush around the tile or a
+        rectangle between two clicks
+
+        Args:
+            x (int): the x coordinate of the tile
+            y (int): the y coordinate of the tile
+
+        Returns:
+            set: the (layer, x, y) of every tile that changed, nothing
+            changes when the tile isn't on the layer
+        """
+        lay = self.game.player.layer
+        width, height = self.level.sizes[lay]
+        if not (0 <= x < width and 0 <= y < height):
+            # an empty display next to a layer smaller than the grid
+            return set()
+        if self.rectangle:
+            if self.corner is None:
+                self.corner = (x, y)
+                return set()
+            (c_x, c_y), self.corner = self.corner, None
+            area = (min(x, c_x), min(y, c_y), max(x, c_x) + 1, max(y, c_y) + 1)
+        else:
+            half = self.brush // 2
+            area = (x - half, y - half, x - half + self.brush,
+                    y - half + self.brush)
+        lock = {"has_lock": bool(self.lock_id), "lock_id": self.lock_id}
+        match self.tool:
+            case "tile":
+                self.paint_tiles(lay, *area, self.key)
+            case "wall" | "floor":
+                self.paint_walls(lay, *area, self.tool == "wall")
+            case "door":
+                try:
+                    goes_to = self.level.coordinate(self.goes_to)
+                    width, height = self.level.sizes[goes_to.layer]
+                    inside = goes_to.x < width and goes_to.y < height
+                except (ValueError, TypeError, KeyError):
+                    # a bad number is a TypeError, a missing layer a KeyError
+                    inside = False
+                if not inside:
+                    self.game.show_message(
+                        "Editor", "a door needs somewhere to go like 1,2x,3y"
+                        )
+                    return set()
+                self.set_function(lay, x, y, {
+                    "type": "door", **lock, "goes_to": self.goes_to
+                    })
+            case "through-door":
+                self.set_function(lay, x, y, {"type": "through-door", **lock})
+            case "code":
+                self.set_function(
+                    lay, x, y, {"type": "code", "lock_id": self.lock_id}
+                    )
+            case "dialog":
+                self.set_function(
+                    lay, x, y, {"type": "dialog", "text": self.text}
+                    )
+            case "erase":
+                left, top, right, bottom = self.bounds(lay, *area)
+                for cell in list(self.level.function_cells):
+                    if (cell[0] == lay and left <= cell[1] < right
+                            and top <= cell[2] < bottom):
+                        self.set_function(*cell, None)
+            case "start":
+                self.set_start(lay, x, y)
+            case "end":
+                self.set_end(lay, x, y)
+        return self.commit()
+
+    def save(self):
+        """saves the level being edited back to its file
+        """
+        self.commit()
+        self.level.save()
+        if self.game.reloader is not None:
+            self.game.reloader.ignore_save()
+
+    def memory_report(self) -> MemoryReport:
+        """works out what the history takes up on top of the level, rows
+        still used by the level are already counted as its tile storage
+
+        Returns:
+            MemoryReport: the blocks of every version and the rows only the
+            history holds
+        """
+        level = self.level
+        live = {
+            id(row) for grid in (level.layers, level.wall_masks)
+            for rows in grid.values() for row in rows
+            }
+        blocks = {}
+        rows = {}
+        for version in self.versions:
+            for grid in (version.layers, version.walls):
+                for layer_blocks in grid.values():
+                    blocks[id(layer_blocks)] = layer_blocks
+                    for block in layer_blocks:
+                        blocks[id(block)] = block
+                        for row in block:
+                            if id(row) not in live:
+                                rows[id(row)] = row
+        report = MemoryReport()
+        report.add_objects("editor", blocks.values())
+        report.add_objects("editor", rows.values())
+        return report
+
+
+class EditorPanel(QWidget):
+    def __init__(self, game: Game):
+        """the tools of the level editor, shown next to the displays while
+        the level is being edited
+
+        Args:
+            game (Game): the game whose level is edited
+        """
+        super(EditorPanel, self).__init__()
+        self.game = game
+        self.editor = None
+        self.setLayout(QVBoxLayout())
+        self.setFixedWidth(220)
+
+        self.layer = QComboBox()
+        self.layer.activated.connect(
+            lambda index: self.game.show_layer(self.layer.itemText(index))
+            )
+        self.tool = QComboBox()
+        self.tool.addItems(LevelEditor.tools)
+        self.tool.currentTextChanged.connect(
+            lambda tool: setattr(self.editor, "tool", tool)
+            )
+        self.key = QComboBox()
+        self.key.currentTextChanged.connect(
+            lambda key: setattr(self.editor, "key", key or None)
+            )
+        self.brush = QSpinBox()
+        self.brush.setRange(1, 128)
+        self.brush.valueChanged.connect(
+            lambda brush: setattr(self.editor, "brush", brush)
+            )
+        self.rectangle = QCheckBox("rectangle between two clicks")
+        self.rectangle.toggled.connect(self.on_rectangle)
+        self.goes_to = QLineEdit()
+        self.goes_to.setPlaceholderText("door goes to e.g. 1,2x,3y")
+        self.goes_to.textChanged.connect(
+            lambda text: setattr(self.editor, "goes_to", text)
+            )
+        self.lock_id = QLineEdit()
+        self.lock_id.setPlaceholderText("lock id")
+        self.lock_id.textChanged.connect(
+            lambda text: setattr(self.editor, "lock_id", text)
+            )
+        self.text = QLineEdit()
+        self.text.setPlaceholderText("dialog text")
+        self.text.textChanged.connect(
+            lambda text: setattr(self.editor, "text", text)
+            )
+        for label, widget in (
+                ("layer", self.layer), ("tool", self.tool),
+                ("texture", self.key), ("brush", self.brush),
+                (None, self.rectangle), (None, self.goes_to),
+                (None, self.lock_id), (None, self.text)):
+            if label is not None:
+                self.layout().addWidget(QLabel(label))
+            self.layout().addWidget(widget)
+        for text, action in (
+                ("Undo", lambda: self.editor.undo()),
+                ("Redo", lambda: self.editor.redo()),
+                ("Save", lambda: self.editor.save())):
+            button = QPushButton(text)
+            button.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+            button.clicked.connect(action)
+            self.layout().addWidget(button)
+        self.layout().addStretch()
+        self.hide()
+
+    def on_rectangle(self, rectangle: bool):
+        """switches between painting with the brush and rectangles
+
+        Args:
+            rectangle (bool): whether to paint rectangles
+        """
+        self.editor.rectangle = rectangle
+        self.editor.corner = None
+
+    def toggle(self):
+        """starts or stops editing the level
+        """
+        if self.editor is None:
+            self.editor = self.game.editor = LevelEditor(self.game)
+            self.editor.on_reset = self.refresh
+            self.refresh()
+            self.show()
+        else:
+            self.editor.commit()
+            self.editor = self.game.editor = None
+            self.hide()
+
+    def refresh(self):
+        """fills in the layers and textures of the level being edited
+        """
+        editor = self.editor
+        level = editor.level
+        # clearing the lists changes the editor's settings so they are put
+        # back after
+        key, tool = editor.key, editor.tool
+        self.layer.clear()
+        self.layer.addItems(list(level.layers))
+        self.layer.setCurrentText(self.game.player.layer)
+        self.key.clear()
+        self.key.addItems(sorted(level.tile_key))
+        if key is not None:
+            self.key.setCurrentText(key)
+        self.tool.setCurrentText(tool)
+        self.brush.setValue(editor.brush)
+        self.rectangle.setChecked(editor.rectangle)
 
 
 class GameWindow(QMainWindow):
-    def __init__(self, demo_mode: bool = False):
+    def __init__(self, demo_mode: bool = False, seed: int = None):
         """the constructor class for the game_window.
 
         Args:
-            demo_mode (bool): _description_
+            demo_mode (bool): whether to play the demo
+            seed (int, optional): the seed for the game. Defaults to a random
+            seed.
         """
         super(GameWindow, self).__init__()
         self.setCentralWidget(QTabWidget())
@@ -790,13 +5290,26 @@ class GameWindow(QMainWindow):
         self.centralWidget().addTab(menu_widget, "Menu")
 
         # creating the game to run in the window
-        self.game = Game(self, demo_mode)
+        self.game = Game(self, demo_mode, seed)
 
         # creating the pause key and binding it
         pause_key = QShortcut(self)
         pause_key.setKey("esc")
         pause_key.activated.connect(self.pause)
 
+        # creating the keys of the level editor
+        edit_key = QShortcut(self)
+        edit_key.setKey("F2")
+        edit_key.activated.connect(lambda: self.editor_panel.toggle())
+        for key, action in (
+                ("Ctrl+Z", LevelEditor.undo), ("Ctrl+Y", LevelEditor.redo),
+                ("Ctrl+S", LevelEditor.save)):
+            shortcut = QShortcut(self)
+            shortcut.setKey(key)
+            shortcut.activated.connect(
+                lambda action=action: self.use_editor(action)
+                )
+
         # creating the layout for the displays
         self.game_display_layout = QGridLayout()
         # making it so that there are no gaps between the tile displays
@@ -809,7 +5322,15 @@ class GameWindow(QMainWindow):
         game_tab.layout().addWidget(QWidget())  # 1*
         game_display_layout_widget = QWidget()
         game_display_layout_widget.setLayout(self.game_display_layout)
+        # the messages and keypad are drawn on top of the displays
+        self.game.overlay = Overlay(game_display_layout_widget)
         game_tab.layout().addWidget(game_display_layout_widget)
+        # the minimap sits to the right of the displays
+        self.game.minimap = Minimap(self.game)
+        game_tab.layout().addWidget(self.game.minimap)
+        # the level editor's tools, hidden until F2 is pressed
+        self.editor_panel = EditorPanel(self.game)
+        game_tab.layout().addWidget(self.editor_panel)
         game_tab.layout().addWidget(QWidget())  # 1*
         # 1*:
         # spacing widgets so that the tile displays dont get pulled appart
@@ -817,6 +5338,14 @@ class GameWindow(QMainWindow):
 
         # sticking the game tab into the window
         self.centralWidget().addTab(game_tab, "Game")
+        # tiles are only animated while the game can be seen
+        self.centralWidget().currentChanged.connect(
+            lambda index: self.game.set_animating(index == 1)
+            )
+
+        # the list of levels to pick from
+        self.level_select = LevelSelect(self.game)
+        self.centralWidget().addTab(self.level_select, "Levels")
 
         # setting up graphical changes required for the winodw being resized
         self.screen().geometryChanged.connect(self.on_window_size_changed)
@@ -828,6 +5357,16 @@ class GameWindow(QMainWindow):
         # starting the game
         self.game.start()
 
+    def use_editor(self, action: "function"):
+        """runs one of the level editor's actions if the level is being
+        edited
+
+        Args:
+            action (function): the action, called with the editor
+        """
+        if self.game.editor is not None:
+            action(self.game.editor)
+
     def pause(self):
         """method to toggle the pause state of the game
         """
@@ -851,6 +5390,11 @@ class GameWindow(QMainWindow):
                 button.setFlat(True)
                 button.setFixedSize(self.displays_size)
                 button.setIconSize(self.displays_size)
+                # clicking a display walks the player to its tile
+                button.clicked.connect(
+                    lambda checked=False, column=column, row=row:
+                    self.game.click_display(column, row)
+                    )
                 # adding the display to the grid
                 grid.addWidget(button, row, column)
                 # allowing the game to acces the display
@@ -884,7 +5428,105 @@ class GameWindow(QMainWindow):
 
 
 if __name__ == "__main__":
-    # running the game
-    window = GameWindow(True)
+    parser = argparse.ArgumentParser(description="Clavis mortis")
+    parser.add_argument("--replay", help="a recording to play back")
+    parser.add_argument(
+        "--campaign", action="store_true",
+        help=(
+            "play the levels of the campaign one after another instead of "
+            "just the demo"
+            )
+        )
+    parser.add_argument(
+        "--headless", action="store_true",
+        help="play the recording back as fast as possible without a window"
+        )
+    parser.add_argument(
+        "--fog", action="store_true",
+        help="hide the parts of levels the player hasn't seen"
+        )
+    parser.add_argument(
+        "--edit", action="store_true",
+        help="start with the level editor open, F2 opens and closes it"
+        )
+    parser.add_argument(
+        "--watch", action="store_true",
+        help="reload the level and its textures when their files change"
+        )
+    parser.add_argument(
+        "--memory", metavar="LEVEL_ID",
+        help=(
+            "print how much memory each part of a level takes up, this only "
+            "covers the level's data as there is no window to count widgets of"
+            )
+        )
+    parser.add_argument(
+        "--budget", action="append", default=[], metavar="NAME=MB",
+        help=(
+            "the most memory a part of the game can take up, levels for all "
+            "the loaded levels, level tiles for the tiles of a single level "
+            "or a cache such as fog icons or caches"
+            )
+        )
+    args = parser.parse_args()
+
+    for budget in args.budget:
+        name, _, megabytes = budget.partition("=")
+        if name not in BUDGETS:
+            parser.error(
+                f"there is no budget called {name}, the budgets are "
+                + ", ".join(BUDGETS)
+                )
+        try:
+            BUDGETS[name] = int(float(megabytes) * 2**20)
+        except ValueError:
+            parser.error(f"budgets are given as NAME=MB, not {budget}")
+
+    if args.memory is not None:
+        try:
+            level_file = LevelFile(Level.get_path(args.memory))
+        except (KeyError, ValueError, OSError):
+            parser.error(f"there is no level called {args.memory}")
+        report = Level(None, level_file.path, level_file).memory_report()
+        print(report.table())
+        # estimated the same way as when the game decides whether to load it
+        print(f"{'level tiles':<16}"
+              f"{level_file.memory_estimate() / 1024:>12.1f}")
+        over = report.over({
+            subsystem: budget for subsystem, budget in BUDGETS.items()
+            if subsystem not in ("levels", "level tiles")
+            })
+        tile_limit = BUDGETS["level tiles"]
+        if (tile_limit is not None
+                and level_file.memory_estimate() > tile_limit):
+            over.append("level tiles")
+        for subsystem in over:
+            print(f"{subsystem} is over its budget of "
+                  f"{BUDGETS[subsystem] / 1024:.1f}KiB")
+        sys.exit(1 if over else 0)
+
+    if args.replay is None:
+        # running the game
+        window = GameWindow(not args.campaign)
+    else:
+        replay = Replay(Recording.load(args.replay))
+        if args.headless:
+            started = QElapsedTimer()
+            started.start()
+            replay.run_headless()
+            print(
+                f"replayed {len(replay.recording)} inputs "
+                f"in {started.elapsed()}ms"
+                )
+            sys.exit()
+        window = GameWindow(replay.recording.demo_mode, replay.recording.seed)
+        window.pause()
+        replay.play(window.game)
+    if args.fog:
+        window.game.enable_fog()
+    if args.watch:
+        reloader = HotReloader(window.game)
+    if args.edit:
+        window.editor_panel.toggle()
     window.show()
     app.exec()
@@ -0,0 +1,33 @@
+import os
+
+import pytest
+
+from level_generator import StandInGame
+
+# the game builds Qt widgets and pixmaps as soon as it is imported so the
+# tests need a platform that works without a screen
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+@pytest.fixture
+def stand_in_game():
+    return StandInGame()
+
+
+@pytest.fixture
+def headless_game():
+    """makes headless games playing a level, the level is built from its
+    file first when a path is given"""
+    import clavis_mortis
+
+    def make(level_id: str = "cm:demo", path: str = None, seed: int = 0):
+        game = clavis_mortis.Game(
+            clavis_mortis.QMainWindow(), True, seed, headless=True
+            )
+        if path is not None:
+            game.levels.build(level_id, clavis_mortis.LevelFile(path))
+        # the recording starts with the level being played
+        game.recording = None
+        game.load_level(level_id)
+        return game
+    return make
@@ -0,0 +1,554 @@
+#!/usr/bin python3
+# level_generator.py
+# MR-Spagetty
+
+import argparse
+import json
+import random
+import sys
+import time
+
+# the texture keys used by generated levels, these are the same keys that the
+# demo level uses so generated levels look like they belong in the game
+TILE_KEY = {
+    "ground.p": "cm:inside.ground.planks",
+    "ground.c": "cm:other.ground.concrete",
+    "ground.d": "cm:outside.ground.dirt",
+    "ground.g": "cm:outside.ground.grass",
+
+    "door.H": "cm:other.feature.horizontal_door",
+    "door.V": "cm:other.feature.vertical_door",
+    "bookshelf": "cm:other.feature.bookshelf",
+
+    "border.V": "cm:outside.wall.vertical",
+    "border.H": "cm:outside.wall.horizontal",
+    "border.NE": "cm:outside.wall.north-east",
+    "border.SE": "cm:outside.wall.south-east",
+    "border.SW": "cm:outside.wall.south-west",
+    "border.NW": "cm:outside.wall.north-west",
+
+    "wall.plain.H": "cm:inside.wall.horizontal.plain"
+}
+
+GROUNDS = ("ground.g", "ground.d", "ground.p", "ground.c")
+
+DIALOGS = (
+    "Not all bookshelves have useful information.\n"
+    "Some are just for decoration",
+    "A dusty book about locks.\nJohn has clearly never read it",
+    "A shopping list, the only item on it is \"a better memory\""
+)
+
+# the smallest layer that still has room for an interior wall row and a row
+# of bookshelves
+MIN_SIZE = 8
+
+
+class LayerPlan:
+    def __init__(self, layer_id: str, width: int, height: int, ground: str):
+        """the layout of a single generated layer without its texture grid,
+        the grid is only built row by row when the level is written out
+
+        Args:
+            layer_id (str): the id of the layer
+            width (int): the number of columns in the layer
+            height (int): the number of rows in the layer
+            ground (str): the texture key of the layer's floor
+        """
+        self.layer_id = layer_id
+        self.width = width
+        self.height = height
+        self.ground = ground
+        # y: [(start x, end x), ...] of the interior walls on that row
+        self.wall_rows = {}
+        # y: {x: texture key} for every cell that isn't floor or wall
+        self.features = {}
+        # cells already claimed by a door, bookshelf or the end
+        self.used = set()
+
+    def coord(self, x: int, y: int) -> str:
+        """formats a cell of this layer as a level file coordinate
+
+        Args:
+            x (int): the x coordinate of the cell
+            y (int): the y coordinate of the cell
+
+        Returns:
+            str: the coordinate in the form "<layer>,<x>x,<y>y"
+        """
+        return f"{self.layer_id},{x}x,{y}y"
+
+    def claim(self, x: int, y: int, texture_key: str):
+        """marks a cell as used and gives it a feature texture
+
+        Args:
+            x (int): the x coordinate of the cell
+            y (int): the y coordinate of the cell
+            texture_key (str): the texture the cell will show
+        """
+        self.used.add((x, y))
+        self.features.setdefault(y, {})[x] = texture_key
+
+    def rows(self, rng: random.Random):
+        """generates the texture keys of the layer one row at a time
+
+        Args:
+            rng (random.Random): the generator used to scatter other floor
+            textures around the layer
+
+        Yields:
+            list: the texture keys of a row
+        """
+        width, height = self.width, self.height
+        edge = "border.H"
+        for y in range(height):
+            if y == 0:
+                row = ["border.SE"] + [edge] * (width - 2) + ["border.SW"]
+            elif y == height - 1:
+                row = ["border.NE"] + [edge] * (width - 2) + ["border.NW"]
+            else:
+                row = [self.ground] * width
+                row[0] = row[-1] = "border.V"
+                # scattering a few patches of other floor textures about
+                for x in rng.sample(range(1, width - 1), width // 16):
+                    row[x] = rng.choice(GROUNDS)
+                for start, end in self.wall_rows.get(y, ()):
+                    row[start:end + 1] = ["wall.plain.H"] * (end - start + 1)
+            for x, texture_key in self.features.get(y, {}).items():
+                row[x] = texture_key
+            yield row
+
+    def walls(self):
+        """generates the walls of the layer in the level file format
+
+        Yields:
+            str: a wall in the form "<start coord>:<end coord>"
+        """
+        right, bottom = self.width - 1, self.height - 1
+        yield f"{self.coord(0, 0)}:{self.coord(0, bottom)}"
+        yield f"{self.coord(0, 0)}:{self.coord(right, 0)}"
+        yield f"{self.coord(0, bottom)}:{self.coord(right, bottom)}"
+        yield f"{self.coord(right, 0)}:{self.coord(right, bottom)}"
+        for y, spans in self.wall_rows.items():
+            for start, end in spans:
+                yield f"{self.coord(start, y)}:{self.coord(end, y)}"
+
+
+class LevelGenerator:
+    def __init__(
+        self, seed: int = 0, width: int = 16, height: int = 16,
+        layers: int = 3, door_density: float = 0.05, locks: int = 1,
+        dialogs: int = 1, wall_chance: float = 0.6, guards: int = 0
+            ):
+        """generates random levels that can always be completed.
+
+        Every layer is surrounded by a border, interior walls only go on rows
+        where y is a multiple of 4 and always leave at least one gap, and
+        bookshelves only go on every other cell of the rows between them, so
+        every floor cell of a layer can reach every other one. The layers are
+        chained together by doors on their north and south borders, the
+        first layer holds the start and the last one holds the end.
+
+        Args:
+            seed (int, optional): the seed for the level. Defaults to 0.
+            width (int, optional): the number of columns in each layer.
+            Defaults to 16.
+            height (int, optional): the number of rows in each layer.
+            Defaults to 16.
+            layers (int, optional): the number of layers. Defaults to 3.
+            door_density (float, optional): the fraction of the east and west
+            border cells that get extra doors between random layers.
+            Defaults to 0.05.
+            locks (int, optional): the number of locked doors, each comes with
+            a bookshelf holding its code. Defaults to 1.
+            dialogs (int, optional): the number of dialog bookshelves on each
+            layer. Defaults to 1.
+            wall_chance (float, optional): the chance of each possible
+            interior wall row having walls. Defaults to 0.6.
+            guards (int, optional): the number of guards wandering the level,
+            they start on floor rows that never have walls or bookshelves.
+            Defaults to 0.
+
+        Raises:
+            ValueError: if the layers are too small or there are no layers
+        """
+        if width < MIN_SIZE or height < MIN_SIZE:
+            raise ValueError(
+                f"layers must be at least {MIN_SIZE}x{MIN_SIZE} tiles"
+                )
+        if layers < 1:
+            raise ValueError("a level needs at least one layer")
+        self.seed = seed
+        self.width = width
+        self.height = height
+        self.layer_count = layers
+        self.door_density = door_density
+        self.lock_count = locks
+        self.dialog_count = dialogs
+        self.wall_chance = wall_chance
+        self.guard_count = guards
+
+        self.rng = random.Random(seed)
+        self.plans = []
+        self.functions = {}
+        self.start = None
+        self.end = None
+        self.entities = []
+        self.plan()
+
+    def free_x(self, plan: LayerPlan, y: int) -> int:
+        """picks a random unused column on a border row
+
+        Args:
+            plan (LayerPlan): the layer to pick from
+            y (int): the row to pick from
+
+        Returns:
+            int: the column that was picked
+        """
+        while True:
+            x = self.rng.randint(1, plan.width - 2)
+            if (x, y) not in plan.used:
+                return x
+
+    def free_shelf(self, plan: LayerPlan) -> tuple[int, int] | None:
+        """picks a random unused spot for a bookshelf, bookshelves only go
+        on odd columns of rows 2, 6, 10... so they can never cut a layer off
+
+        Args:
+            plan (LayerPlan): the layer to pick from
+
+        Returns:
+            tuple | None: the x and y of the spot or None if the layer is full
+        """
+        rows = range(2, plan.height - 2, 4)
+        columns = range(1, plan.width - 2, 2)
+        for _ in range(64):
+            spot = self.rng.choice(columns), self.rng.choice(rows)
+            if spot not in plan.used:
+                return spot
+        # falling back to a search when the layer is almost full
+        free = [
+            (x, y) for y in rows for x in columns if (x, y) not in plan.used
+            ]
+        return self.rng.choice(free) if free else None
+
+    def plan_walls(self, plan: LayerPlan):
+        """adds the interior walls to a layer, each wall row has at least one
+        gap in it so it can never cut the layer in two
+
+        Args:
+            plan (LayerPlan): the layer to add the walls to
+        """
+        for y in range(4, plan.height - 2, 4):
+            if self.rng.random() >= self.wall_chance:
+                continue
+            gaps = sorted(self.rng.sample(
+                range(1, plan.width - 1),
+                self.rng.randint(1, max(1, plan.width // 16))
+                ))
+            spans = []
+            start = 1
+            for gap in gaps + [plan.width - 1]:
+                if gap > start:
+                    spans.append((start, gap - 1))
+                start = gap + 1
+            plan.wall_rows[y] = spans
+
+    def add_door(
+        self, plan: LayerPlan, x: int, y: int, texture_key: str,
+        goes_to: str, lock_id: str = ""
+            ):
+        """adds a door to a layer
+
+        Args:
+            plan (LayerPlan): the layer the door is on
+            x (int): the x coordinate of the door
+            y (int): the y coordinate of the door
+            texture_key (str): the texture the door will show
+            goes_to (str): the coordinate the door takes the player to
+            lock_id (str, optional): the id of the lock on the door.
+            Defaults to "".
+        """
+        plan.claim(x, y, texture_key)
+        self.functions[plan.coord(x, y)] = {
+            "type": "door",
+            "has_lock": bool(lock_id),
+            "lock_id": lock_id,
+            "goes_to": goes_to
+        }
+
+    def plan(self):
+        """works out the layout of every layer and all of the functional
+        tiles of the level
+        """
+        rng = self.rng
+        for number in range(1, self.layer_count + 1):
+            plan = LayerPlan(
+                str(number), self.width, self.height, rng.choice(GROUNDS)
+                )
+            self.plan_walls(plan)
+            self.plans.append(plan)
+
+        # chaining the layers together with doors on their north and south
+        # borders, the forward doors are the ones that can get locked
+        forward_doors = []
+        for plan, next_plan in zip(self.plans, self.plans[1:]):
+            forward_x = self.free_x(plan, 0)
+            back_x = self.free_x(next_plan, next_plan.height - 1)
+            forward_doors.append((plan, forward_x, back_x, next_plan))
+            self.add_door(
+                next_plan, back_x, next_plan.height - 1, "door.H",
+                plan.coord(forward_x, 1)
+                )
+
+        locked = set(rng.sample(
+            range(len(forward_doors)), min(self.lock_count, len(forward_doors))
+            ))
+        for index, (plan, forward_x, back_x, next_plan) in enumerate(
+                forward_doors):
+            lock_id = ""
+            if index in locked:
+                # the code for a lock is always on the same layer as the
+                # door it opens so it can be found before the door
+                lock_id = f"lock{index + 1}"
+                spot = self.free_shelf(plan)
+                if spot is None:
+                    lock_id = ""
+                else:
+                    plan.claim(*spot, "bookshelf")
+                    self.functions[plan.coord(*spot)] = {
+                        "type": "code", "lock_id": lock_id
+                        }
+            self.add_door(
+                plan, forward_x, 0, "door.H",
+                next_plan.coord(back_x, next_plan.height - 2), lock_id
+                )
+
+        # extra doors between random layers, they are never needed to finish
+        # the level so they can go anywhere
+        rows = [y for y in range(1, self.height - 1) if y % 4 in (1, 3)]
+        pairs = int(self.door_density * len(rows) * self.layer_count)
+        east_rows = {
+            plan.layer_id: rng.sample(rows, len(rows)) for plan in self.plans
+            }
+        west_rows = {
+            plan.layer_id: rng.sample(rows, len(rows)) for plan in self.plans
+            }
+        for _ in range(pairs):
+            east, west = rng.choice(self.plans), rng.choice(self.plans)
+            if not east_rows[east.layer_id] or not west_rows[west.layer_id]:
+                continue
+            east_x = east.width - 1
+            east_y = east_rows[east.layer_id].pop()
+            west_y = west_rows[west.layer_id].pop()
+            self.add_door(
+                east, east_x, east_y, "door.V", west.coord(1, west_y)
+                )
+            self.add_door(
+                west, 0, west_y, "door.V", east.coord(east_x - 1, east_y)
+                )
+
+        for plan in self.plans:
+            for _ in range(self.dialog_count):
+                spot = self.free_shelf(plan)
+                if spot is None:
+                    break
+                plan.claim(*spot, "bookshelf")
+                self.functions[plan.coord(*spot)] = {
+                    "type": "dialog", "text": rng.choice(DIALOGS)
+                    }
+
+        first, last = self.plans[0], self.plans[-1]
+        self.start = first.coord(rng.randint(1, first.width - 2), 1)
+        end_x = self.free_x(last, 0)
+        last.claim(end_x, 0, "door.H")
+        self.end = last.coord(end_x, 0)
+
+        # the guards only go on the same rows as the extra doors, between the
+        # wall and bookshelf rows, so they never start inside anything
+        taken = {self.start}
+        for _ in range(self.guard_count):
+            plan = rng.choice(self.plans)
+            spot = plan.coord(
+                rng.randint(1, plan.width - 2), rng.choice(rows)
+                )
+            if spot not in taken:
+                taken.add(spot)
+                self.entities.append({"kind": "guard", "at": spot})
+
+    def write(self, stream):
+        """writes the level to a text stream, the texture grid of each layer
+        is built and written a row at a time so the whole level is never held
+        in memory
+
+        Args:
+            stream (TextIO): the stream to write the level to
+        """
+        write = stream.write
+        write('{"tile_key": ')
+        write(json.dumps(TILE_KEY))
+        write(', "level": {"layers": {')
+        for index, plan in enumerate(self.plans):
+            write(", " if index else "")
+            write(json.dumps(plan.layer_id))
+            write(": [")
+            # the texture keys never need escaping so the rows can be joined
+            # straight into json
+            write(",".join(
+                '["' + '","'.join(row) + '"]' for row in plan.rows(self.rng)
+                ))
+            write("]")
+        write('}, "walls": [')
+        write(",".join(
+            f'"{wall}"' for plan in self.plans for wall in plan.walls()
+            ))
+        write('], "functions": {')
+        write(", ".join(
+            f"{json.dumps(location)}: {json.dumps(function)}"
+            for location, function in self.functions.items()
+            ))
+        write("}, ")
+        if self.entities:
+            write('"entities": ')
+            write(json.dumps(self.entities))
+            write(", ")
+        write(f'"start": "{self.start}", "end": "{self.end}"')
+        write("}}")
+
+    def save(self, path: str):
+        """writes the level to a file
+
+        Args:
+            path (str): the path of the file to write the level to
+        """
+        with open(path, "w") as level_file:
+            self.write(level_file)
+
+
+class StandInGame:
+    def __init__(self):
+        """just enough of a Game for a Level to be built without a window,
+        used by the tests and the benchmark
+        """
+        self.start = None
+
+    def create_player(self, location: "clavis_mortis.Coordinate"):
+        self.start = location
+
+
+def parse_coord(value: str) -> tuple[str, int, int]:
+    """splits a level file coordinate into its parts without any of the
+    range checks of clavis_mortis.Coordinate
+
+    Args:
+        value (str): the coordinate in the form "<layer>,<x>x,<y>y"
+
+    Returns:
+        tuple: the layer, x and y of the coordinate
+    """
+    layer, x, y = value.split(",")
+    return layer, int(x[:-1]), int(y[:-1])
+
+
+def is_solvable(data: dict) -> bool:
+    """checks that the end of a level can be reached from the start by
+    exploring the level the same way the player would, locked doors only
+    open once the bookshelf with their code has been found
+
+    Args:
+        data (dict): the parsed level file
+
+    Returns:
+        bool: whether the end can be reached
+    """
+    level = data["level"]
+    layers = level["layers"]
+    walls = set()
+    for wall in level["walls"]:
+        start, end = wall.split(":")
+        layer, s_x, s_y = parse_coord(start)
+        _, e_x, e_y = parse_coord(end)
+        for y in range(min(s_y, e_y), max(s_y, e_y) + 1):
+            for x in range(min(s_x, e_x), max(s_x, e_x) + 1):
+                walls.add((layer, x, y))
+    functions = {
+        parse_coord(location): function
+        for location, function in level["functions"].items()
+        }
+    start, end = parse_coord(level["start"]), parse_coord(level["end"])
+
+    def open_floor(cell):
+        layer, x, y = cell
+        return (
+            layer in layers
+            and 0 <= y < len(layers[layer]) and 0 <= x < len(layers[layer][y])
+            and cell not in walls and cell not in functions
+            )
+
+    known_codes = set()
+    while True:
+        found_code = False
+        seen = {start}
+        queue = [start]
+        for layer, x, y in queue:
+            for d_x, d_y in ((0, -1), (1, 0), (0, 1), (-1, 0)):
+                cell = (layer, x + d_x, y + d_y)
+                if cell == end:
+                    return True
+                function = functions.get(cell)
+                if function is None:
+                    targets = [cell] if open_floor(cell) else []
+                else:
+                    targets = []
+                    lock_id = function.get("lock_id")
+                    locked = function.get("locked", False) or (
+                        bool(lock_id) and lock_id not in known_codes
+                        )
+                    match function["type"]:
+                        case "code" if lock_id not in known_codes:
+                            known_codes.add(lock_id)
+                            found_code = True
+                        case "door" if not locked:
+                            targets = [parse_coord(function["goes_to"])]
+                        case "through-door" if not locked:
+                            targets = [(layer, x + 2 * d_x, y + 2 * d_y)]
+                for target in targets:
+                    if target not in seen:
+                        seen.add(target)
+                        queue.append(target)
+        if not found_code:
+            return False
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="generates a random level that can always be completed"
+        )
+    parser.add_argument("output", help="the file to write the level to")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--width", type=int, default=16)
+    parser.add_argument("--height", type=int, default=16)
+    parser.add_argument("--layers", type=int, default=3)
+    parser.add_argument("--door-density", type=float, default=0.05)
+    parser.add_argument("--locks", type=int, default=1)
+    parser.add_argument("--dialogs", type=int, default=1)
+    parser.add_argument("--guards", type=int, default=0)
+    parser.add_argument(
+        "--verify", action="store_true",
+        help="load the level back and check it can be completed"
+        )
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    generator = LevelGenerator(
+        args.seed, args.width, args.height, args.layers,
+        args.door_density, args.locks, args.dialogs, guards=args.guards
+        )
+    generator.save(args.output)
+    print(f"wrote {args.output} in {time.perf_counter() - started:.2f}s")
+    if args.verify:
+        with open(args.output) as level_file:
+            if not is_solvable(json.load(level_file)):
+                sys.exit("the generated level can not be completed")
+        print("the level can be completed")
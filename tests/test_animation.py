@@ -0,0 +1,81 @@
+try:
+    import clavis_mortis
+except:
+    print('failed to import for testing')
+import json
+
+
+def animated_mod(tmp_path, monkeypatch):
+    """makes a mod with a two frame texture that changes every 100ms"""
+    monkeypatch.setattr(clavis_mortis, "path_to_exe", str(tmp_path))
+    folder = tmp_path / "mods" / "anim" / "tiles"
+    (folder / "ground").mkdir(parents=True)
+    for name, colour in (("a.png", 0xFFFF0000), ("b.png", 0xFF0000FF)):
+        image = clavis_mortis.QImage(8, 8, clavis_mortis.QImage.Format_ARGB32)
+        image.fill(colour)
+        image.save(str(folder / "ground" / name))
+    (folder / "tiles.json").write_text(json.dumps({
+        "ground": {"glow": {"frames": ["a.png", "b.png"], "ms": 100}}
+        }))
+
+
+def glowing_window(tmp_path) -> "clavis_mortis.GameWindow":
+    """plays the demo level with two glowing tiles on layer 1"""
+    with open(clavis_mortis.Level.get_path("cm:demo")) as level_file:
+        data = json.load(level_file)
+    data["tile_key"]["ground.glow"] = "anim:ground.glow"
+    data["level"]["layers"]["1"][3][3] = "ground.glow"
+    data["level"]["layers"]["1"][5][8] = "ground.glow"
+    path = tmp_path / "glow.json"
+    path.write_text(json.dumps(data))
+    window = clavis_mortis.GameWindow(True, 0)
+    window.game.levels.build("test:glow", clavis_mortis.LevelFile(path))
+    window.game.load_level("test:glow")
+    return window
+
+
+def test_frames(tmp_path, monkeypatch):
+    """checking that the frames of an animated texture are read from its
+    tiles.json and that a still texture has one frame
+    """
+    animated_mod(tmp_path, monkeypatch)
+    paths, frame_time = clavis_mortis.Texture.get_frames("anim:ground.glow")
+    assert [path[-5:] for path in paths] == ["a.png", "b.png"]
+    assert frame_time == 100
+    paths, frame_time = clavis_mortis.Texture.get_frames("cm:player")
+    assert len(paths) == 1
+    assert frame_time == clavis_mortis.FRAME_TIME
+
+
+def test_only_changed_frames_drawn(tmp_path, monkeypatch):
+    """checking that a step of the animation clock only draws the tiles
+    whose frame changed
+    """
+    animated_mod(tmp_path, monkeypatch)
+    game = glowing_window(tmp_path).game
+    drawn = []
+    game.draw_cells = drawn.append
+    # 0ms to 50ms is still the first frame
+    game.animate()
+    assert drawn == []
+    game.animate()
+    assert drawn == [{("1", 3, 3), ("1", 8, 5)}]
+    frame = game.level.map["1"][3][3].animation.frames[1]
+    assert game.tile_texture("1", 3, 3).cacheKey() == frame.cacheKey()
+
+
+def test_paused_animation_stops(tmp_path, monkeypatch):
+    """checking that the animation clock only runs while the game tab is
+    open and the level has something to animate
+    """
+    animated_mod(tmp_path, monkeypatch)
+    window = glowing_window(tmp_path)
+    game = window.game
+    assert not game.animation_timer.isActive()
+    window.pause()
+    assert game.animation_timer.isActive()
+    window.pause()
+    assert not game.animation_timer.isActive()
+    window.pause()
+    game.load_level("cm:demo")
+    assert not game.animation_timer.isActive()
@@ -0,0 +1,187 @@
+try:
+    import clavis_mortis
+except:
+    print('failed to import for testing')
+import json
+from level_generator import LevelGenerator
+
+
+def editing(game: "clavis_mortis.Game") -> "clavis_mortis.LevelEditor":
+    """opens the editor on the level a game is playing"""
+    game.editor = clavis_mortis.LevelEditor(game)
+    return game.editor
+
+
+def demo_copy(tmp_path) -> str:
+    """copies the demo level somewhere it can be saved over"""
+    path = tmp_path / "demo.json"
+    path.write_text(
+        open(clavis_mortis.Level.get_path("cm:demo")).read()
+        )
+    return str(path)
+
+
+def test_undo_redo(tmp_path, headless_game):
+    """checking that undoing and redoing a brush puts the tiles back and
+    only the tiles that changed are drawn again
+    """
+    editor = editing(headless_game("test:demo", demo_copy(tmp_path)))
+    level = editor.level
+    before = level.map["1"][3][3]
+    editor.tool, editor.key, editor.brush = "tile", "ground.d", 3
+    changed = editor.click(3, 3)
+    # 2,2 was already dirt
+    assert len(changed) == 8
+    assert level.map["1"][3][3] is level.map["1"][1][1]
+    assert editor.undo() == changed
+    assert level.map["1"][3][3] is before
+    assert editor.redo() == changed
+    assert level.map["1"][4][4] is level.map["1"][1][1]
+    assert editor.redo() == set()
+
+
+def test_history_shares_rows(headless_game):
+    """checking that a version of the history only holds the rows that
+    were edited and shares the rest with the version before it
+    """
+    editor = editing(headless_game())
+    editor.tool = "wall"
+    editor.click(5, 8)
+    first, second = editor.versions
+    assert first.layers is not second.layers
+    assert first.layers["1"] is second.layers["1"]
+    changed = [
+        (old, new) for old, new in zip(first.walls["1"], second.walls["1"])
+        if old is not new
+        ]
+    assert len(changed) == 1
+    old, new = changed[0]
+    assert sum(a is not b for a, b in zip(old, new)) == 1
+
+
+def test_big_brush(tmp_path, headless_game):
+    """checking that a rectangle over thousands of tiles only draws the
+    tiles it changed and keeps history small
+    """
+    path = str(tmp_path / "big.json")
+    LevelGenerator(3, 512, 512, 1, locks=0).save(path)
+    editor = editing(headless_game("test:big", path))
+    drawn = []
+    editor.game.repaint_cells = drawn.append
+    editor.tool, editor.rectangle = "floor", True
+    editor.click(10, 10)
+    changed = editor.click(209, 109)
+    assert drawn == [changed]
+    assert changed
+    assert all(
+        10 <= x < 210 and 10 <= y < 110 and
+        not editor.level.wall_masks["1"][y][x]
+        for _, x, y in changed
+        )
+    first, second = editor.versions
+    assert sum(
+        old is not new for old, new in zip(first.walls["1"], second.walls["1"])
+        ) == 4
+
+
+def test_save(tmp_path, headless_game):
+    """checking that the edits are saved in the level file format
+    """
+    path = demo_copy(tmp_path)
+    editor = editing(headless_game("test:demo", path))
+    editor.tool, editor.goes_to, editor.lock_id = "door", "2,3x,3y", "new"
+    editor.click(4, 4)
+    editor.tool = "end"
+    editor.click(9, 9)
+    editor.tool, editor.rectangle = "wall", True
+    editor.click(2, 12)
+    editor.click(6, 13)
+    editor.save()
+    level = clavis_mortis.Level(None, path)
+    assert level.map["1"][4][4].function == "door"
+    assert level.map["1"][4][4].lock.id == "new"
+    assert level.map["1"][9][9].function == "end"
+    assert level.map["1"][13][4].function == "wall"
+    assert level.map["1"][14][4].function is None
+    data = json.load(open(path))
+    assert "1,2x,12y:1,6x,13y" in data["level"]["walls"]
+
+
+def test_window_editing():
+    """checking that F2's panel paints on the level instead of walking
+    """
+    window = clavis_mortis.GameWindow(True, 0)
+    window.pause()
+    window.editor_panel.toggle()
+    game = window.game
+    assert game.editor is not None
+    window.editor_panel.tool.setCurrentText("wall")
+    game.click_display(4, 4)
+    assert game.level.map["1"][4][4].function == "wall"
+    assert (game.player.x, game.player.y) == (1, 1)
+    game.move_player(game.UP)
+    game.move_player(game.UP)
+    assert (game.player.x, game.player.y) == (1, 0)
+    window.use_editor(clavis_mortis.LevelEditor.undo)
+    assert game.level.map["1"][4][4].function is None
+    window.editor_panel.toggle()
+    assert game.editor is None
+
+
+def test_bad_door(headless_game):
+    """checking that a door can't be made to go to a malformed coordinate or
+    a layer that doesn't exist
+    """
+    editor = editing(headless_game())
+    shown = []
+    editor.game.show_message = (
+        lambda title, text, on_close=None: shown.append(title)
+        )
+    editor.tool = "door"
+    for goes_to in ("1,ax,2y", "zz,2x,3y", ""):
+        editor.goes_to = goes_to
+        assert editor.click(4, 4) == set()
+    assert shown == ["Editor"] * 3
+    assert editor.level.map["1"][4][4].function is None
+
+
+def test_click_off_layer(tmp_path, headless_game):
+    """checking that clicking an empty display next to a layer smaller than
+    the display grid does nothing with any tool
+    """
+    path = str(tmp_path / "small.json")
+    LevelGenerator(3, 10, 10, 1, locks=0).save(path)
+    editor = editing(headless_game("test:small", path))
+    level = editor.level
+    start, end = level.start(), level.end_cell
+    functions = dict(level.function_cells)
+    editor.goes_to = "1,2x,2y"
+    for tool in editor.tools:
+        editor.tool = tool
+        assert editor.click(12, 12) == set()
+    assert (level.start(), level.end_cell) == (start, end)
+    assert level.function_cells == functions
+    assert len(editor.versions) == 1
+
+
+def test_save_keeps_history(tmp_path, headless_game):
+    """checking that saving with the level being watched doesn't reload it
+    and start the history over but changes made elsewhere still are
+    """
+    path = demo_copy(tmp_path)
+    game = headless_game("test:demo", path)
+    reloader = clavis_mortis.HotReloader(game)
+    editor = editing(game)
+    editor.tool, editor.key = "tile", "ground.d"
+    editor.click(3, 3)
+    editor.save()
+    reloader.on_changed(path)
+    assert not reloader.level_changed
+    assert not reloader.timer.isActive()
+    assert reloader.level_path in reloader.watcher.files()
+    assert len(editor.versions) == 2
+    # the same file written again by something other than the editor
+    with open(path, "a") as level_file:
+        level_file.write(" ")
+    reloader.on_changed(path)
+    assert reloader.level_changed
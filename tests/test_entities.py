@@ -0,0 +1,106 @@
+try:
+    import clavis_mortis
+except:
+    print('failed to import for testing')
+import json
+import random
+from level_generator import LevelGenerator
+
+
+def demo_with_guards(
+    headless_game, tmp_path, *spots: str
+        ) -> "clavis_mortis.Game":
+    """plays the demo level with a guard on each of the spots"""
+    with open(clavis_mortis.Level.get_path("cm:demo")) as level_file:
+        data = json.load(level_file)
+    data["level"]["entities"] = [
+        {"kind": "guard", "at": spot} for spot in spots
+        ]
+    path = tmp_path / "guards.json"
+    path.write_text(json.dumps(data))
+    return headless_game("test:guards", path)
+
+
+def test_collisions(tmp_path, headless_game):
+    """checking that the player and the guards can't walk into each other
+    """
+    game = demo_with_guards(headless_game, tmp_path, "1,2x,1y")
+    entities = game.entities
+    assert entities.at("1", 2, 1) == 0
+    game.step(game.RIGHT)
+    assert (game.player.x, game.player.y) == (1, 1)
+    # facing the player
+    entities.facing[0] = entities.headings.index("left")
+    game.advance(1)
+    assert (entities.xs[0], entities.ys[0]) == (2, 1)
+
+
+def test_guards_use_tiles(tmp_path, headless_game):
+    """checking that guards go through doors like the player but don't end
+    the level or save the game
+    """
+    game = demo_with_guards(
+        headless_game, tmp_path, "1,7x,1y", "3,7x,1y"
+        )
+    entities = game.entities
+
+    def autosave():
+        raise AssertionError("guards shouldn't save the game")
+    game.autosave = autosave
+    entities.facing[0] = entities.facing[1] = entities.headings.index("up")
+    game.advance(2)
+    assert (entities.layers[0], entities.xs[0], entities.ys[0]) == (
+        "2", 7, 14
+        )
+    assert entities.at("2", 7, 14) == 0
+    assert entities.at("1", 7, 1) is None
+    assert (entities.layers[1], entities.xs[1], entities.ys[1]) == (
+        "3", 7, 1
+        )
+    assert game.level_id == "test:guards"
+
+
+def test_staggered_ticks(tmp_path, headless_game):
+    """checking that each tick only moves the guards whose turn it is
+    """
+    path = str(tmp_path / "crowd.json")
+    LevelGenerator(4, 64, 64, 2, guards=300).save(path)
+    game = headless_game("test:guards", path)
+    entities = game.entities
+    assert len(entities) > 200
+    for tick in range(3):
+        before = entities.cells()
+        positions = list(zip(entities.xs, entities.ys))
+        game.advance(tick + 1)
+        moved = {
+            index for index, position in enumerate(
+                zip(entities.xs, entities.ys)
+                ) if position != positions[index]
+            }
+        assert moved
+        assert moved <= set(range(tick, len(entities), entities.period))
+        # nobody shares a tile
+        assert len(entities.cells()) == len(before)
+
+
+def test_replay_with_guards(tmp_path, headless_game):
+    """checking that replaying a recording moves the guards the same way
+    they moved while it was recorded
+    """
+    path = str(tmp_path / "crowd.json")
+    LevelGenerator(5, 32, 32, 2, guards=100).save(path)
+    game = headless_game("test:guards", path)
+    ticks = iter(range(0, 10**6, 7))
+    game.current_tick = lambda: next(ticks)
+    walk = random.Random(5)
+    for _ in range(300):
+        game.move_player(walk.choice(list(game.DIRECTIONS.values())))
+
+    replayed = headless_game()
+    replayed.levels.build("test:guards", clavis_mortis.LevelFile(path))
+    clavis_mortis.Replay(game.recording).run_headless(replayed)
+    assert replayed.entity_tick == game.entity_tick
+    assert replayed.entities.cells() == game.entities.cells()
+    assert (replayed.player.layer, replayed.player.x, replayed.player.y) == (
+        game.player.layer, game.player.x, game.player.y
+        )
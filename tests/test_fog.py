@@ -0,0 +1,49 @@
+try:
+    import clavis_mortis
+except:
+    print('failed to import for testing')
+import json
+
+
+def walled_level(tmp_path, stand_in_game) -> "clavis_mortis.Level":
+    """loads the demo level with a wall down the middle of layer 1"""
+    with open(clavis_mortis.Level.get_path("cm:demo")) as level_file:
+        data = json.load(level_file)
+    data["level"]["walls"].append("1,5x,1y:1,5x,10y")
+    path = tmp_path / "walled.json"
+    path.write_text(json.dumps(data))
+    return clavis_mortis.Level(stand_in_game, path)
+
+
+def test_walls_block_sight(tmp_path, stand_in_game):
+    """checking that walls can be seen but not seen through and that tiles
+    further than the sight radius can't be seen
+    """
+    level = walled_level(tmp_path, stand_in_game)
+    fog = clavis_mortis.FogOfWar(8)
+    fog.update("test:walled", level, "1", 2, 5)
+    for x, y, state in (
+            (4, 5, fog.VISIBLE), (5, 5, fog.VISIBLE), (8, 5, fog.HIDDEN),
+            (2, 14, fog.HIDDEN), (2, 12, fog.VISIBLE)):
+        assert fog.state("test:walled", "1", x, y) == state
+
+
+def test_only_changes_returned(tmp_path, stand_in_game):
+    """checking that moving only returns the tiles that came into or went out
+    of sight and that tiles seen before stay explored
+    """
+    level = walled_level(tmp_path, stand_in_game)
+    fog = clavis_mortis.FogOfWar(8)
+    first = fog.update("test:walled", level, "1", 2, 5)
+    seen = set(fog.visible)
+    changed = fog.update("test:walled", level, "1", 2, 6)
+    assert changed
+    assert len(changed) < len(first)
+    assert {
+        index for _, x, y in changed for index in [y * 16 + x]
+        } == seen ^ fog.visible
+    assert fog.update("test:walled", level, "1", 2, 6) == set()
+    for index in seen - fog.visible:
+        assert fog.state(
+            "test:walled", "1", index % 16, index // 16
+            ) == fog.EXPLORED
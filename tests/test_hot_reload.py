@@ -0,0 +1,111 @@
+try:
+    import clavis_mortis
+except:
+    print('failed to import for testing')
+import json
+
+
+def load_demo(tmp_path, stand_in_game) -> tuple:
+    """copies the demo level somewhere it can be edited and loads it"""
+    with open(clavis_mortis.Level.get_path("cm:demo")) as level_file:
+        data = json.load(level_file)
+    path = tmp_path / "demo.json"
+    path.write_text(json.dumps(data))
+    return clavis_mortis.Level(stand_in_game, path), data, path
+
+
+def reload(level, data, path) -> set:
+    """saves the edited level and reloads it"""
+    path.write_text(json.dumps(data))
+    return level.reload(clavis_mortis.LevelFile(path))
+
+
+def test_tile_edit(tmp_path, stand_in_game):
+    """checking that changing a tile only rebuilds that tile
+    """
+    level, data, path = load_demo(tmp_path, stand_in_game)
+    untouched = level.map["1"][5][5]
+    data["level"]["layers"]["1"][4][6] = "ground.d"
+    assert reload(level, data, path) == {("1", 6, 4)}
+    assert level.map["1"][4][6] is level.map["1"][2][2]
+    assert level.map["1"][5][5] is untouched
+
+
+def test_wall_function_and_end_edits(tmp_path, stand_in_game):
+    """checking that adding a wall, moving a dialog and moving the end only
+    rebuild the tiles they affect
+    """
+    level, data, path = load_demo(tmp_path, stand_in_game)
+    data["level"]["walls"].append("2,3x,5y:2,6x,5y")
+    functions = data["level"]["functions"]
+    functions["3,13x,0y"] = functions.pop("3,12x,0y")
+    data["level"]["end"] = "3,8x,0y"
+    expected = {("2", x, 5) for x in range(3, 7)}
+    expected |= {("3", 12, 0), ("3", 13, 0), ("3", 7, 0), ("3", 8, 0)}
+    assert reload(level, data, path) == expected
+    assert level.map["2"][5][4].function == "wall"
+    assert level.map["3"][0][12].function == "wall"
+    assert level.map["3"][0][13].function == "dialog"
+    assert level.map["3"][0][8].function == "end"
+
+
+def test_locks_kept(tmp_path, stand_in_game):
+    """checking that reloading keeps the state and code of the locks
+    """
+    level, data, path = load_demo(tmp_path, stand_in_game)
+    lock = level.locks["part2"]
+    lock.increment_failures()
+    code = lock.code
+    data["level"]["layers"]["2"][3][3] = "ground.p"
+    reload(level, data, path)
+    assert level.locks["part2"] is lock
+    assert lock.code == code
+    assert level.map["2"][0][1].lock is lock
+
+
+def test_nothing_changed(tmp_path, stand_in_game):
+    """checking that reloading an unchanged level rebuilds nothing
+    """
+    level, data, path = load_demo(tmp_path, stand_in_game)
+    assert reload(level, data, path) == set()
+
+
+def test_bad_coordinate_keeps_watching(
+    tmp_path, stand_in_game, headless_game
+        ):
+    """checking that a save with a malformed coordinate is reported and the
+    level file is still watched afterwards
+    """
+    level, data, path = load_demo(tmp_path, stand_in_game)
+    game = headless_game("test:demo", path)
+    reloader = clavis_mortis.HotReloader(game)
+    shown = []
+    game.show_message = lambda title, text, on_close=None: shown.append(title)
+    data["level"]["end"] = "1,ax,0y"
+    path.write_text(json.dumps(data))
+    reloader.level_changed = True
+    reloader.reload()
+    assert shown == ["Couldn't reload"]
+    assert not reloader.level_changed
+    assert reloader.level_path in reloader.watcher.files()
+
+
+def test_failed_reload_changes_nothing(tmp_path, stand_in_game):
+    """checking that a reload that fails part of the way through leaves the
+    level as it was
+    """
+    level, data, path = load_demo(tmp_path, stand_in_game)
+    tile = level.map["1"][4][6]
+    tile_key = dict(level.tile_key)
+    data["tile_key"]["ground.new"] = "cm:player"
+    data["level"]["layers"]["1"][4][6] = "ground.new"
+    data["level"]["functions"]["9,2x,2y"] = {"type": "dialog", "text": ""}
+    try:
+        reload(level, data, path)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("the dialog's layer doesn't exist")
+    assert level.map["1"][4][6] is tile
+    assert level.tile_key == tile_key
+    assert "ground.new" not in level.textures
@@ -0,0 +1,67 @@
+try:
+    import clavis_mortis
+except:
+    print('failed to import for testing')
+import json
+
+
+def write_level(tmp_path, walls: list, size: int = None) -> str:
+    """writes a copy of the demo level with different walls and layer 1 cut
+    down to size by size tiles"""
+    with open(clavis_mortis.Level.get_path("cm:demo")) as level_file:
+        data = json.load(level_file)
+    data["level"]["walls"] = walls
+    if size is not None:
+        layers = data["level"]["layers"]
+        layers["1"] = [row[:size] for row in layers["1"][:size]]
+    path = tmp_path / "walls.json"
+    path.write_text(json.dumps(data))
+    return path
+
+
+def test_overlapping_walls(tmp_path, stand_in_game):
+    """checking that overlapping walls only make wall tiles where the walls
+    are and that every tile of a wall shares the same tile object
+    """
+    path = write_level(tmp_path, ["1,2x,2y:1,5x,5y", "1,4x,4y:1,8x,4y"])
+    level = clavis_mortis.Level(stand_in_game, path)
+    walls = {
+        (x, y) for y, row in enumerate(level.map["1"])
+        for x, tile in enumerate(row) if tile.function == "wall"
+        }
+    expected = {(x, y) for x in range(2, 6) for y in range(2, 6)}
+    expected |= {(x, 4) for x in range(4, 9)}
+    assert walls == expected
+    assert level.map["1"][4][6] is level.map["1"][4][7]
+
+
+def test_wall_outside_layer(tmp_path, stand_in_game):
+    """checking that a ValueError occurs when a wall goes off a layer that is
+    smaller than the other layers
+    """
+    # 10 is a coordinate of the level but not of layer 1
+    path = write_level(tmp_path, ["1,5x,3y:1,10x,3y"], 8)
+    correctly_errored = False
+    try:
+        clavis_mortis.Level(stand_in_game, path)
+    except Exception as err:
+        correctly_errored = (
+            type(err) is ValueError and "outside of its layer" in str(err)
+            )
+    assert correctly_errored
+
+
+def test_step_off_layer(tmp_path, headless_game):
+    """checking that stepping off the edge of a layer without a border is
+    treated like walking into a wall instead of wrapping around
+    """
+    game = headless_game("test:walls", write_level(tmp_path, []))
+    player = game.player
+    width, height = game.level.sizes[player.layer]
+    for direction, x, y in (
+            (game.LEFT, 0, 3), (game.UP, 3, 0),
+            (game.RIGHT, width - 1, 3), (game.DOWN, 3, height - 1)
+            ):
+        player.x, player.y = x, y
+        game.step(direction)
+        assert (player.x, player.y) == (x, y)
@@ -0,0 +1,67 @@
+try:
+    import clavis_mortis
+    import level_generator
+except:
+    print('failed to import for testing')
+import io
+import json
+
+
+def generate(**settings) -> dict:
+    """generates a level and parses it back"""
+    stream = io.StringIO()
+    level_generator.LevelGenerator(**settings).write(stream)
+    return json.loads(stream.getvalue())
+
+
+def test_same_seed_same_level():
+    """checking that a seed always generates the same level
+    """
+    assert generate(seed=3, layers=4) == generate(seed=3, layers=4)
+
+
+def test_layer_sizes():
+    """checking that the layers are the size that was asked for
+    """
+    data = generate(width=24, height=12, layers=2)
+    for layer in data["level"]["layers"].values():
+        assert len(layer) == 12
+        assert all(len(row) == 24 for row in layer)
+
+
+def test_levels_are_solvable():
+    """checking that generated levels can always be completed, even with lots
+    of locks and extra doors
+    """
+    for seed in range(20):
+        data = generate(
+            seed=seed, width=20, height=17, layers=5,
+            locks=4, door_density=0.5, dialogs=3
+            )
+        assert level_generator.is_solvable(data)
+
+
+def test_unsolvable_level_detected():
+    """checking that the solvability check notices when the code for a
+    locked door can't be found
+    """
+    data = generate(seed=1, layers=2, locks=1)
+    functions = data["level"]["functions"]
+    for location, function in list(functions.items()):
+        if function["type"] == "code":
+            del functions[location]
+    assert not level_generator.is_solvable(data)
+
+
+def test_generated_level_loads(tmp_path, stand_in_game):
+    """checking that a level bigger than the display grid can be loaded
+    """
+    path = tmp_path / "generated.json"
+    level_generator.LevelGenerator(
+        seed=7, width=40, height=33, layers=3, locks=2
+        ).save(path)
+    game = stand_in_game
+    level = clavis_mortis.Level(game, path)
+    assert level.sizes == {"1": (40, 33), "2": (40, 33), "3": (40, 33)}
+    assert game.start() == level.start()
+    assert level.map["3"][32][39].function == "wall"
@@ -0,0 +1,78 @@
+try:
+    import clavis_mortis
+    import level_generator
+except:
+    print('failed to import for testing')
+import json
+
+import pytest
+
+
+@pytest.fixture
+def level_paths(tmp_path, monkeypatch):
+    """generates a few levels and makes their ids resolve to them"""
+    paths = {}
+    for number in range(3):
+        path = tmp_path / f"level{number}.json"
+        level_generator.LevelGenerator(seed=number, layers=2).save(path)
+        paths[f"test:level{number}"] = path
+    manifest = tmp_path / "campaign.json"
+    manifest.write_text(json.dumps({"levels": list(paths)}))
+    monkeypatch.setattr(
+        clavis_mortis.Level, "get_path", lambda level_id: paths[level_id]
+        )
+    monkeypatch.setattr(
+        clavis_mortis.Level, "get_campaign_path",
+        lambda campaign_id: {"test:campaign": manifest}[campaign_id]
+        )
+    return paths
+
+
+def test_cache_hit(level_paths):
+    """checking that getting a loaded level gives back the same level
+    """
+    manager = clavis_mortis.LevelManager()
+    level = manager.get("test:level0")
+    manager.get("test:level1")
+    assert manager.get("test:level0") is level
+
+
+def test_least_recently_played_evicted(level_paths):
+    """checking that the least recently played level is the one unloaded
+    when the memory limit is reached
+    """
+    manager = clavis_mortis.LevelManager()
+    manager.memory_limit = 2 * manager.get("test:level0").memory_estimate()
+    manager.get("test:level1")
+    manager.get("test:level0")
+    manager.get("test:level2")
+    assert list(manager.levels) == ["test:level0", "test:level2"]
+
+
+def test_lock_state_kept(level_paths):
+    """checking that the state of a level's locks survives it being unloaded
+    """
+    manager = clavis_mortis.LevelManager(memory_limit=0)
+    lock = manager.get("test:level0").locks["lock1"]
+    lock.state, lock.fails = False, 2
+    code = lock.code
+    manager.get("test:level1")
+    assert "test:level0" not in manager.levels
+    lock = manager.get("test:level0").locks["lock1"]
+    assert (lock.state, lock.code, lock.fails) == (False, code, 2)
+
+
+def test_campaign_preload(level_paths):
+    """checking that the next level of a campaign is read in the background
+    and only built once it is played
+    """
+    manager = clavis_mortis.LevelManager("test:campaign")
+    assert manager.next_level("test:level0") == "test:level1"
+    assert manager.next_level("test:level2") is None
+    manager.get("test:level0")
+    manager.preload(manager.next_level("test:level0"))
+    level_file = manager.preloads["test:level1"].result()
+    assert "test:level1" not in manager.levels
+    level = manager.get("test:level1")
+    assert level.file is level_file
+    assert not manager.preloads
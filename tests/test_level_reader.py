@@ -0,0 +1,67 @@
+try:
+    import clavis_mortis
+except:
+    print('failed to import for testing')
+import json
+
+
+def read_demo(chunk_size: int) -> dict:
+    """rebuilds the demo level from the reader's pieces"""
+    data = {"level": {"layers": {}, "walls": [], "functions": {}}}
+    level = data["level"]
+    path = clavis_mortis.Level.get_path("cm:demo")
+    for kind, value in clavis_mortis.LevelReader(path, chunk_size):
+        match kind:
+            case "tile_key":
+                data["tile_key"] = value
+            case "row":
+                layer_id, row = value
+                level["layers"].setdefault(layer_id, []).append(row)
+            case "wall":
+                level["walls"].append(value)
+            case "function":
+                location, function = value
+                level["functions"][location] = function
+            case other:
+                level[kind] = value
+    return data
+
+
+def test_reader_matches_json():
+    """checking that the reader gives back exactly what is in the file
+    """
+    with open(clavis_mortis.Level.get_path("cm:demo")) as level_file:
+        assert read_demo(1 << 16) == json.load(level_file)
+
+
+def test_reader_tiny_chunks():
+    """checking that values split across chunks are read correctly
+    """
+    assert read_demo(7) == read_demo(1 << 16)
+
+
+def test_reader_invalid_file(tmp_path):
+    """checking that a ValueError occurs when the level file is cut short
+    """
+    path = tmp_path / "broken.json"
+    path.write_text('{"level": {"layers": {"1": [["a", "b"], ["a"')
+    correctly_errored = False
+    try:
+        list(clavis_mortis.LevelReader(path, 8))
+    except Exception as err:
+        correctly_errored = type(err) is ValueError
+    assert correctly_errored
+
+
+def test_texture_grid(stand_in_game):
+    """checking that the texture grid kept by a level matches the level file
+    """
+    path = clavis_mortis.Level.get_path("cm:demo")
+    level = clavis_mortis.Level(stand_in_game, path)
+    with open(path) as level_file:
+        layers = json.load(level_file)["level"]["layers"]
+    for layer_id, layer in layers.items():
+        assert [
+            [level.texture_keys[number] for number in row]
+            for row in level.layers[layer_id]
+            ] == layer
@@ -0,0 +1,161 @@
+try:
+    import clavis_mortis
+except:
+    print('failed to import for testing')
+import os
+import subprocess
+import sys
+from level_generator import LevelGenerator
+
+
+def test_level_report(stand_in_game):
+    """checking that a level is split into its subsystems and that shared
+    tiles are only counted once
+    """
+    level = clavis_mortis.Level(
+        stand_in_game, clavis_mortis.Level.get_path("cm:demo")
+        )
+    report = level.memory_report()
+    assert set(report.parts) == {
+        "tile storage", "locks", "icons", "texture pixels"
+        }
+    locks = [lock for lock in level.locks.values() if lock is not None]
+    assert report.parts["locks"][1] == 2 * len(locks)
+    tiles = len(level.shared_tiles) + len(level.function_cells)
+    assert report.parts["icons"][1] <= tiles + 1
+    assert report.bytes() == level.memory_estimate()
+
+
+def test_too_big_refused(tmp_path, headless_game):
+    """checking that a level bigger than the level budget isn't loaded and
+    the level being played stays loaded
+    """
+    path = str(tmp_path / "big.json")
+    LevelGenerator(1, 512, 512, 1, locks=0).save(path)
+    game = headless_game()
+    game.levels.tile_limit = 2**20
+    level_file = clavis_mortis.LevelFile(path)
+    try:
+        game.levels.build("test:big", level_file)
+    except MemoryError:
+        pass
+    else:
+        raise AssertionError("the level should have been too big")
+    assert "test:big" not in game.levels.levels
+    game.load_level("cm:demo")
+    assert game.levels.current == "cm:demo"
+
+
+def test_too_big_save(tmp_path, monkeypatch, headless_game):
+    """checking that loading a save of a level that is too big changes
+    nothing and tells the player
+    """
+    path = str(tmp_path / "big.json")
+    LevelGenerator(1, 512, 512, 1, locks=0).save(path)
+    demo_path = clavis_mortis.Level.get_path("cm:demo")
+    monkeypatch.setattr(
+        clavis_mortis.Level, "get_path",
+        lambda level_id: path if level_id == "test:big" else demo_path
+        )
+    monkeypatch.setattr(clavis_mortis, "path_to_exe", str(tmp_path))
+    game = headless_game()
+    game.levels.tile_limit = 2**20
+    lock = game.level.locks["part2"]
+    state = (lock.state, lock.code, lock.fails)
+    os.makedirs(tmp_path / "saves")
+    with open(game.save_path("big"), "wb") as save_file:
+        save_file.write(clavis_mortis.Snapshot(
+            "test:big", "1", 0, 0, ["1"],
+            {"cm:demo": {"part2": (False, "000000", 3)}}
+            ).to_bytes())
+    shown = []
+    game.show_message = lambda title, text, on_close=None: shown.append(title)
+    game.load_save("big")
+    assert shown == ["Level too big"]
+    assert game.level_id == "cm:demo"
+    assert (lock.state, lock.code, lock.fails) == state
+
+
+def test_budgets_evict_caches(headless_game):
+    """checking that going over a budget empties its cache and the game
+    keeps working
+    """
+    game = headless_game()
+    game.enable_fog()
+    game.fog.dim(game.level.map["1"][2][1].texture)
+    assert game.memory_report().bytes("fog icons") > 0
+    game.budgets["fog icons"] = 0
+    assert game.enforce_budgets() == ["fog icons"]
+    assert not game.fog.dimmed
+    game.step(game.LEFT)
+    assert game.enforce_budgets() == []
+
+
+def test_window_widgets():
+    """checking that every display of the window is counted as a widget
+    """
+    game = clavis_mortis.GameWindow(True, 0).game
+    displays = sum(len(row) for row in game.displays.values())
+    assert displays
+    assert game.memory_report().parts["widgets"][1] > displays
+
+
+def test_cli():
+    """checking that the memory of a level can be printed from the command
+    line and that going over a budget fails
+    """
+    script = os.path.join(os.path.dirname(clavis_mortis.__file__),
+                          "clavis_mortis.py")
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    result = subprocess.run(
+        [sys.executable, script, "--memory", "cm:demo"],
+        capture_output=True, text=True, env=env
+        )
+    assert result.returncode == 0
+    assert "tile storage" in result.stdout
+    assert result.stdout.splitlines()[-2].startswith("total")
+    result = subprocess.run(
+        [sys.executable, script, "--memory", "cm:demo", "--budget",
+         "level tiles=0.001"],
+        capture_output=True, text=True, env=env
+        )
+    assert result.returncode == 1
+    assert "level tiles is over its budget" in result.stdout
+    # the same estimate the game refuses to load a level with
+    estimate = clavis_mortis.LevelFile(
+        clavis_mortis.Level.get_path("cm:demo")
+        ).memory_estimate()
+    assert f"{estimate / 1024:.1f}" in result.stdout
+
+
+def test_cli_unknown_budget():
+    """checking that a budget that doesn't exist is refused instead of being
+    ignored
+    """
+    script = os.path.join(os.path.dirname(clavis_mortis.__file__),
+                          "clavis_mortis.py")
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    result = subprocess.run(
+        [sys.executable, script, "--memory", "cm:demo", "--budget",
+         "level tile=1"],
+        capture_output=True, text=True, env=env
+        )
+    assert result.returncode == 2
+    assert "there is no budget called level tile" in result.stderr
+
+
+def test_cli_unknown_level():
+    """checking that asking for the memory of a level that doesn't exist
+    gives an error instead of crashing
+    """
+    script = os.path.join(os.path.dirname(clavis_mortis.__file__),
+                          "clavis_mortis.py")
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    for level_id in ("cm:nope", "nope"):
+        result = subprocess.run(
+            [sys.executable, script, "--memory", level_id],
+            capture_output=True, text=True, env=env
+            )
+        assert result.returncode == 2
+        assert f"there is no level called {level_id}" in result.stderr
+        assert "Traceback" not in result.stderr
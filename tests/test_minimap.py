@@ -0,0 +1,63 @@
+try:
+    import clavis_mortis
+except:
+    print('failed to import for testing')
+from level_generator import LevelGenerator
+
+
+def test_big_layer(tmp_path, headless_game):
+    """checking that a big layer is shrunk to fit and that each pixel is the
+    colour of the tile it was picked from
+    """
+    path = str(tmp_path / "big.json")
+    LevelGenerator(2, 1024, 1024, 1, locks=0).save(path)
+    game = headless_game("test:big", path)
+    minimap = clavis_mortis.Minimap(game)
+    minimap.refresh()
+    image, step = minimap.layer_image("1")
+    assert step == 4
+    assert (image.width(), image.height()) == (256, 256)
+    for x, y in ((0, 0), (10, 37), (255, 255)):
+        assert image.pixel(x, y) == minimap.tile_colour("1", x * 4, y * 4)
+
+
+def test_lock_patched(headless_game):
+    """checking that a locked door is marked and is drawn again once it has
+    been unlocked
+    """
+    game = headless_game("cm:demo")
+    minimap = clavis_mortis.Minimap(game)
+    game.minimap = minimap
+    minimap.refresh()
+    image, _ = minimap.layer_image("2")
+    assert image.pixel(7, 0) == minimap.locked_colour
+    game.submit_code("part2", game.level.locks["part2"].code)
+    assert image.pixel(7, 0) == minimap.colour("door.H")
+
+
+def test_lock_in_block(tmp_path, headless_game):
+    """checking that a locked door shows on a shrunk layer even when it isn't
+    the tile its pixel was picked from and goes once it has been unlocked
+    """
+    path = str(tmp_path / "big.json")
+    LevelGenerator(3, 1024, 1024, 2, locks=4).save(path)
+    game = headless_game("test:big", path)
+    minimap = clavis_mortis.Minimap(game)
+    game.minimap = minimap
+    minimap.refresh()
+    doors = []
+    for layer_id, x, y in game.level.function_cells:
+        tile = game.level.map[layer_id][y][x]
+        if tile.function in ("door", "through-door") and tile.locked():
+            if x % 4 or y % 4:
+                doors.append((layer_id, x, y, tile.lock.id))
+    assert doors
+    for layer_id, x, y, lock in doors:
+        image, step = minimap.layer_image(layer_id)
+        assert step == 4
+        assert image.pixel(x // 4, y // 4) == minimap.locked_colour
+        game.submit_code(lock, game.level.locks[lock].code)
+        assert image.pixel(x // 4, y // 4) == minimap.block_colour(
+            layer_id, x // 4, y // 4, 4
+            )
+        assert image.pixel(x // 4, y // 4) != minimap.locked_colour
@@ -0,0 +1,51 @@
+try:
+    import clavis_mortis
+except:
+    print('failed to import for testing')
+
+
+def door_game() -> "clavis_mortis.Game":
+    """makes a demo game with the player next to the locked door on layer 2
+    """
+    window = clavis_mortis.GameWindow(True, 0)
+    window.pause()
+    game = window.game
+    game.player.teleport(game.level.coordinate("2,7x,1y"))
+    return game
+
+
+def test_code_entry():
+    """checking that the keypad doesn't block, takes a code from the keypad
+    and shows the result once the code has been submitted
+    """
+    game = door_game()
+    lock = game.level.locks["part2"]
+    game.step(game.UP)
+    assert game.overlay.is_open()
+    assert game.overlay.keypad.isVisibleTo(game.overlay)
+    for char in lock.code:
+        game.overlay.press(char)
+    game.overlay.confirm()
+    assert not lock.get_state()
+    assert game.overlay.title.text() == "Accepted"
+    game.overlay.confirm()
+    assert not game.overlay.is_open()
+
+
+def test_movement_waits():
+    """checking that the player can't move while a message is open and
+    that messages are shown one after another
+    """
+    game = door_game()
+    closed = []
+    game.show_message("first", "one", lambda: closed.append(1))
+    game.show_message("second", "two", lambda: closed.append(2))
+    game.move_player(game.DOWN)
+    assert (game.player.x, game.player.y) == (7, 1)
+    game.overlay.confirm()
+    assert closed == [1]
+    assert game.overlay.title.text() == "second"
+    game.overlay.confirm()
+    assert closed == [1, 2]
+    game.move_player(game.DOWN)
+    assert (game.player.x, game.player.y) == (7, 2)
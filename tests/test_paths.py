@@ -0,0 +1,72 @@
+try:
+    import clavis_mortis
+except:
+    print('failed to import for testing')
+import json
+
+
+def test_open_field(headless_game):
+    """checking that walking across an open layer takes the fewest steps
+    and that each step is recorded
+    """
+    game = headless_game("cm:demo")
+    assert (game.player.x, game.player.y) == (1, 1)
+    game.walk_to(10, 12)
+    assert (game.player.x, game.player.y) == (10, 12)
+    assert len(game.recording) == 9 + 11
+
+
+def test_walk_into_tile(headless_game):
+    """checking that walking to a tile that can't be walked on ends with a
+    step into it and that through doors are walked through
+    """
+    game = headless_game("cm:demo")
+    game.player.teleport(game.level.coordinate("3,5x,5y"))
+    game.walk_to(1, 1)
+    assert (game.player.x, game.player.y) == (1, 1)
+    game.walk_to(12, 0)
+    assert (game.player.x, game.player.y) == (12, 1)
+
+
+def test_unlocking_invalidates(tmp_path, headless_game):
+    """checking that distance fields are kept and that unlocking a through
+    door lets the player walk through it
+    """
+    with open(clavis_mortis.Level.get_path("cm:demo")) as level_file:
+        data = json.load(level_file)
+    data["level"]["functions"]["3,1x,2y"] = {
+        "type": "through-door", "lock_id": "part2"
+        }
+    path = tmp_path / "locked.json"
+    path.write_text(json.dumps(data))
+    game = headless_game("test:locked", str(path))
+    game.player.teleport(game.level.coordinate("3,5x,5y"))
+    paths = game.paths
+    assert paths.path(game.level, "3", (5, 5), (1, 1)) is None
+    field = paths.field("3", 1 * 16 + 1)
+    assert paths.field("3", 1 * 16 + 1) is field
+    game.submit_code("part2", game.level.locks["part2"].code)
+    assert ("3", 1 * 16 + 1) not in paths.fields
+    assert len(paths.path(game.level, "3", (5, 5), (1, 1))) == 4 + 2 + 1
+
+
+def test_walk_drawn_in_frames():
+    """checking that each frame of a walk only draws the tiles that changed
+    however many steps it took
+    """
+    window = clavis_mortis.GameWindow(True, 0)
+    window.pause()
+    game = window.game
+    drawn = []
+    for row in game.displays.values():
+        for display in row.values():
+            display.setIcon = drawn.append
+    game.walk_to(10, 12)
+    assert game.walk_timer.isActive()
+    game.walk_next()
+    assert len(drawn) == 2
+    drawn.clear()
+    game.walk_next(5)
+    assert len(drawn) == 2
+    assert drawn[-1] is clavis_mortis.Player.texture
+    game.stop_walking()
@@ -0,0 +1,112 @@
+try:
+    import clavis_mortis
+except:
+    print('failed to import for testing')
+import random
+from level_generator import LevelGenerator
+
+
+def play_demo(game):
+    """walks through the first two doors of the demo getting the code wrong
+    three times before getting it right"""
+    Game = clavis_mortis.Game
+    for direction in [Game.RIGHT] * 6 + [Game.UP] * 14:
+        game.move_player(direction)
+    for _ in range(3):
+        game.submit_code("part2", "wrong")
+    game.submit_code("part2", game.level.locks["part2"].code)
+    game.move_player(Game.UP)
+
+
+def test_recording_round_trip():
+    """checking that a recording is the same after being packed and unpacked
+    """
+    rng = random.Random(3)
+    rng.gauss(0, 1)
+    recording = clavis_mortis.Recording(
+        42, "cm:demo", True, {"cm:demo": {"part2": (False, "654321", 2)}},
+        {"cm:demo": rng.getstate(), "mod:other": random.Random(4).getstate()}
+        )
+    recording.record(0, "up")
+    recording.record(7, "code", ("part2", "123456"))
+    recording.record(70000, "left")
+    unpacked = clavis_mortis.Recording.from_bytes(recording.to_bytes())
+    assert list(unpacked) == list(recording)
+    assert (unpacked.seed, unpacked.level_id, unpacked.demo_mode) == (
+        42, "cm:demo", True
+        )
+    assert unpacked.locks == recording.locks
+    assert unpacked.rngs == recording.rngs
+
+
+def test_seeded_codes(headless_game):
+    """checking that the same seed always gives the same lock codes
+    """
+    codes = [
+        headless_game(seed=seed).level.locks["part2"].code
+        for seed in (1, 1, 2)
+        ]
+    assert codes[0] == codes[1] != codes[2]
+
+
+def test_replay_matches(headless_game):
+    """checking that replaying a recording ends in the same state as the
+    game that was recorded, including the code randomized by the failures
+    """
+    game = headless_game(seed=5)
+    play_demo(game)
+    assert (game.player.layer, game.player.x, game.player.y) == ("3", 7, 14)
+
+    recording = clavis_mortis.Recording.from_bytes(
+        game.recording.to_bytes()
+        )
+    replayed = clavis_mortis.Replay(recording).run_headless()
+    assert replayed.snapshot().to_bytes() == game.snapshot().to_bytes()
+
+
+def test_replay_played_level(headless_game):
+    """checking that a recording started on a level that was already played
+    replays from the locks and codes the level had then
+    """
+    game = headless_game(seed=6)
+    # the third failure gives the lock a new code from the level's rng
+    for _ in range(4):
+        game.submit_code("part2", "wrong")
+    # starting over on the same level keeps its locks
+    game.recording = None
+    game.load_level("cm:demo")
+    assert game.level.locks["part2"].fails == 1
+    play_demo(game)
+
+    recording = clavis_mortis.Recording.from_bytes(
+        game.recording.to_bytes()
+        )
+    replayed = clavis_mortis.Replay(recording).run_headless()
+    assert replayed.snapshot().to_bytes() == game.snapshot().to_bytes()
+
+
+def test_level_switch(tmp_path, headless_game):
+    """checking that choosing another level from the level list starts a
+    recording of that level which replays the same as it was played
+    """
+    path = str(tmp_path / "other.json")
+    LevelGenerator(7, 24, 24, 1, locks=0).save(path)
+    window = clavis_mortis.GameWindow(True, 3)
+    window.pause()
+    game = window.game
+    game.levels.build("test:other", clavis_mortis.LevelFile(path))
+    game.move_player(game.RIGHT)
+    item = clavis_mortis.QListWidgetItem("other")
+    item.setData(clavis_mortis.Qt.ItemDataRole.UserRole, "test:other")
+    window.level_select.on_activated(item)
+    assert game.recording.level_id == "test:other"
+    for direction in [game.RIGHT] * 5 + [game.DOWN] * 3:
+        game.move_player(direction)
+
+    replayed = headless_game(seed=3)
+    replayed.levels.build("test:other", clavis_mortis.LevelFile(path))
+    clavis_mortis.Replay(game.recording).run_headless(replayed)
+    assert replayed.level_id == "test:other"
+    assert (replayed.player.layer, replayed.player.x, replayed.player.y) == (
+        game.player.layer, game.player.x, game.player.y
+        )
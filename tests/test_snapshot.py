@@ -0,0 +1,50 @@
+try:
+    import clavis_mortis
+except:
+    print('failed to import for testing')
+
+
+def test_bytes_round_trip():
+    """checking that a snapshot is the same after being packed and unpacked
+    """
+    snapshot = clavis_mortis.Snapshot(
+        "cm:demo", "2", 300, 7, ["1", "2"],
+        {"cm:demo": {"part2": (False, "123456", 2)}, "mod:other": {}}
+        )
+    unpacked = clavis_mortis.Snapshot.from_bytes(snapshot.to_bytes())
+    assert vars(unpacked) == vars(snapshot)
+
+
+def test_corrupted_snapshot(headless_game):
+    """checking that a ValueError occurs when a snapshot is cut short
+    """
+    data = headless_game().snapshot().to_bytes()
+    correctly_errored = False
+    try:
+        clavis_mortis.Snapshot.from_bytes(data[:-3])
+    except Exception as err:
+        correctly_errored = type(err) is ValueError
+    assert correctly_errored
+
+
+def test_restore(headless_game):
+    """checking that restoring a snapshot puts back the player and the locks
+    without reloading the level
+    """
+    game = headless_game()
+    level = game.level
+    game.player.teleport(level.coordinate("2,7x,14y"))
+    lock = level.locks["part2"]
+    lock.fails = 1
+    code = lock.code
+    snapshot = game.snapshot().to_bytes()
+
+    game.player.teleport(level.coordinate("3,5x,5y"))
+    lock.state, lock.fails = False, 0
+    lock.randomize_code()
+    game.restore(clavis_mortis.Snapshot.from_bytes(snapshot))
+
+    assert game.level is level
+    assert (game.player.layer, game.player.x, game.player.y) == ("2", 7, 14)
+    assert game.visited_layers == {"1", "2"}
+    assert (lock.state, lock.code, lock.fails) == (True, code, 1)
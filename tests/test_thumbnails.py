@@ -0,0 +1,52 @@
+try:
+    import clavis_mortis
+except:
+    print('failed to import for testing')
+from level_generator import LevelGenerator
+
+
+def test_level_ids():
+    """checking that the levels of the game are listed and the campaign
+    isn't one of them
+    """
+    level_ids = clavis_mortis.Level.level_ids()
+    assert "cm:demo" in level_ids
+    assert "cm:campaign" not in level_ids
+
+
+def test_demo_thumbnail(tmp_path):
+    """checking that a small level is drawn with its layers side by side and
+    that the second time it comes from the cache
+    """
+    thumbnails = clavis_mortis.Thumbnails(96, str(tmp_path))
+    path = thumbnails.render_cached(clavis_mortis.Level.get_path("cm:demo"))
+    image = clavis_mortis.QImage(path)
+    # 4 layers of 16x16 tiles drawn 6 pixels a tile
+    assert (image.width(), image.height()) == (4 * 96 + 3 * 2, 96)
+
+    def render(path):
+        raise AssertionError("the thumbnail should have been cached")
+    thumbnails.render = render
+    assert thumbnails.render_cached(
+        clavis_mortis.Level.get_path("cm:demo")
+        ) == path
+
+
+def test_big_level_thumbnail(tmp_path):
+    """checking that a level bigger than the thumbnail is shrunk
+    """
+    level_path = str(tmp_path / "big.json")
+    LevelGenerator(1, 64, 64, 2).save(level_path)
+    thumbnails = clavis_mortis.Thumbnails(32, str(tmp_path))
+    image = clavis_mortis.QImage(thumbnails.render_cached(level_path))
+    assert (image.width(), image.height()) == (2 * 32 + 2, 32)
+    assert image.pixel(5, 5) != 0
+
+
+def test_not_a_level(tmp_path):
+    """checking that a file that isn't a level gets no thumbnail
+    """
+    thumbnails = clavis_mortis.Thumbnails(96, str(tmp_path))
+    assert thumbnails.render_cached(
+        clavis_mortis.Level.get_campaign_path("cm:campaign")
+        ) is None